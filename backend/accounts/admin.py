@@ -1,8 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, PlatformMessage
-import csv
-from django.http import HttpResponse
+from skillswap.exports import stream_csv
+from .exports import USER_DETAIL_HEADER, user_detail_rows
+from .models import User, PlatformMessage, ExportJob, AvatarJob
+from skills.matching import match_index
+from .profile_cache import bump_profiles
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -25,25 +27,23 @@ class UserAdmin(BaseUserAdmin):
     )
 
     def ban_users(self, request, queryset):
+        user_ids = list(queryset.values_list('id', flat=True))
         updated = queryset.update(is_banned=True)
+        bump_profiles(user_ids)
+        match_index.sync_users(User.objects.filter(id__in=user_ids))
         self.message_user(request, f"{updated} user(s) banned.")
     ban_users.short_description = "Ban selected users"
 
     def unban_users(self, request, queryset):
+        user_ids = list(queryset.values_list('id', flat=True))
         updated = queryset.update(is_banned=False)
+        bump_profiles(user_ids)
+        match_index.sync_users(User.objects.filter(id__in=user_ids))
         self.message_user(request, f"{updated} user(s) unbanned.")
     unban_users.short_description = "Unban selected users"
 
     def export_users_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename=users.csv'
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Email', 'Full Name', 'Location', 'Rating', 'Completed Swaps', 'Is Banned', 'Is Admin', 'Created At'])
-        for user in queryset:
-            writer.writerow([
-                user.id, user.email, user.full_name, user.location, user.rating, user.completed_swaps, user.is_banned, user.is_admin, user.created_at
-            ])
-        return response
+        return stream_csv('users.csv', USER_DETAIL_HEADER, user_detail_rows(queryset))
     export_users_csv.short_description = "Export selected users as CSV"
 
 @admin.register(PlatformMessage)
@@ -51,3 +51,15 @@ class PlatformMessageAdmin(admin.ModelAdmin):
     list_display = ('title', 'is_active', 'created_at', 'expires_at')
     list_filter = ('is_active', 'created_at', 'expires_at')
     search_fields = ('title', 'body')
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'format', 'status', 'rows_written', 'total_rows', 'requested_by', 'created_at', 'finished_at')
+    list_filter = ('kind', 'format', 'status')
+    readonly_fields = ('total_rows', 'rows_written', 'last_id', 'checkpoint', 'error', 'started_at', 'finished_at')
+
+@admin.register(AvatarJob)
+class AvatarJobAdmin(admin.ModelAdmin):
+    list_display = ('user', 'status', 'source', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('source', 'error', 'started_at', 'finished_at')
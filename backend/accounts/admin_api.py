@@ -2,15 +2,28 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import HttpResponse
+from rest_framework.exceptions import ValidationError
+from django.http import FileResponse
 from django.contrib.auth import get_user_model
-from skills.models import UserSkill
-from skills.serializers import UserSkillSerializer
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from skills.models import Skill, UserSkill
+from skills.matching import match_index
+from skills.signals import user_skills_updated
 from swaps.models import SwapRequest, SwapSession, SwapRating
-from swaps.serializers import SwapRequestSerializer, SwapRatingSerializer
-from .models import PlatformMessage
-from .serializers import PlatformMessageSerializer
-import csv
+from swaps.serializers import SwapRatingSerializer
+from swaps.exports import SWAP_HEADER, RATING_HEADER, swap_rows, rating_rows
+from skillswap.exports import stream_csv, full_name
+from skillswap.pagination import AdminKeysetPagination
+from skillswap.query_budget import query_budget
+from collections import Counter
+from datetime import datetime, time, timedelta
+from .exports import USER_HEADER, user_rows
+from .models import PlatformMessage, ExportJob
+from .profile_cache import bump_profiles, profile_cache
+from .serializers import PlatformMessageSerializer, ExportJobSerializer
 
 # Custom permission for admin users only
 def is_admin(user):
@@ -20,14 +33,189 @@ class IsAdminUser(IsAuthenticated):
     def has_permission(self, request, view):
         return super().has_permission(request, view) and is_admin(request.user)
 
+# Admin list helpers: server-side filters, keyset pages and values() projections
+ADMIN_ORDERINGS = {
+    '-created_at': ('-created_at', '-id'),
+    'created_at': ('created_at', 'id'),
+}
+
+def admin_page(request, queryset, build_row):
+    ordering = ADMIN_ORDERINGS.get(request.query_params.get('ordering', '-created_at'))
+    if ordering is None:
+        raise ValidationError({'ordering': f"Use one of: {', '.join(ADMIN_ORDERINGS)}."})
+    paginator = AdminKeysetPagination()
+    paginator.keyset_ordering = ordering
+    page = paginator.paginate_queryset(queryset.order_by(*ordering), request)
+    return paginator.get_paginated_response([build_row(row) for row in page])
+
+def filter_created_range(params, queryset):
+    """Apply ``created_after``/``created_before`` (inclusive YYYY-MM-DD) as index-friendly bounds"""
+    for param, lookup, days in (('created_after', 'created_at__gte', 0), ('created_before', 'created_at__lt', 1)):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            day = parse_date(str(value))
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({param: 'Use YYYY-MM-DD.'})
+        bound = timezone.make_aware(datetime.combine(day + timedelta(days=days), time.min))
+        queryset = queryset.filter(**{lookup: bound})
+    return queryset
+
+# Filter parsers read from query params, or from the ``filter`` object of a bulk request
+def choice_param(params, name, choices):
+    value = params.get(name)
+    if value and value not in [choice for choice, _ in choices]:
+        raise ValidationError({name: f"Use one of: {', '.join(choice for choice, _ in choices)}."})
+    return value
+
+def int_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: 'Must be an integer.'})
+
+def bool_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    if value not in ('true', 'false', True, False):
+        raise ValidationError({name: 'Use true or false.'})
+    return value in ('true', True)
+
+def full_name_of(row, prefix):
+    return full_name(row[f'{prefix}__first_name'], row[f'{prefix}__last_name'])
+
+def filter_user_skills(params):
+    skills = UserSkill.objects.all()
+    status_filter = choice_param(params, 'status', UserSkill.STATUS_CHOICES)
+    if status_filter:
+        skills = skills.filter(status=status_filter)
+    category = choice_param(params, 'category', Skill._meta.get_field('category').choices)
+    if category:
+        skills = skills.filter(skill__category=category)
+    user_id = int_param(params, 'user')
+    if user_id is not None:
+        skills = skills.filter(user_id=user_id)
+    return filter_created_range(params, skills)
+
+def filter_users(params):
+    users = User.objects.all()
+    is_banned = bool_param(params, 'banned')
+    if is_banned is not None:
+        users = users.filter(is_banned=is_banned)
+    is_admin_filter = bool_param(params, 'admin')
+    if is_admin_filter is not None:
+        users = users.filter(is_admin=is_admin_filter)
+    return filter_created_range(params, users)
+
+# Bulk actions: ids or a filter in, one UPDATE per chunk, per-id outcomes out
+BULK_CHUNK_SIZE = 500
+BULK_MAX_ITEMS = 10000
+# Two queries (read, update) per chunk on top of the fixed per-request work
+BULK_QUERY_BUDGET = 16 + 2 * (BULK_MAX_ITEMS // BULK_CHUNK_SIZE)
+
+# Keys each bulk filter accepts, and those that narrow the selection; a filter
+# naming none of the latter would select every row
+USER_SKILL_FILTERS = ('status', 'category', 'user', 'created_after', 'created_before')
+USER_FILTERS = ('banned', 'admin', 'created_after', 'created_before')
+# banned/admin only restate what a ban already implies (admins are never banned)
+USER_BAN_CRITERIA = ('created_after', 'created_before')
+ADMIN_ACCOUNTS = Q(is_admin=True) | Q(is_staff=True) | Q(is_superuser=True)
+
+def bulk_target_ids(request, filter_queryset, filter_keys, criteria=None):
+    if not isinstance(request.data, dict):
+        raise ValidationError('Send an object with "ids" or "filter".')
+    ids = request.data.get('ids')
+    filters = request.data.get('filter')
+    if (ids is None) == (filters is None):
+        raise ValidationError('Provide either "ids" or "filter".')
+    if filters is not None:
+        if not isinstance(filters, dict):
+            raise ValidationError({'filter': 'Must be an object.'})
+        unknown = sorted(set(filters) - set(filter_keys))
+        if unknown:
+            raise ValidationError({'filter': f"Unknown keys: {', '.join(unknown)}."})
+        criteria = criteria or filter_keys
+        if all(filters.get(name) in (None, '') for name in criteria):
+            raise ValidationError({'filter': f"Give at least one of: {', '.join(criteria)}."})
+        ids = list(filter_queryset(filters).order_by('id').values_list('id', flat=True)[:BULK_MAX_ITEMS + 1])
+    elif not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        raise ValidationError({'ids': 'Must be a list of integers.'})
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > BULK_MAX_ITEMS:
+        raise ValidationError(f'At most {BULK_MAX_ITEMS} items per request; narrow the filter.')
+    return ids
+
+def bulk_update(model, ids, field, value, **extra):
+    """
+    Set ``field`` to ``value`` on ``ids`` with one UPDATE per chunk.
+
+    Returns ``(outcomes, updated_ids)`` where each outcome is ``updated``,
+    ``unchanged`` (already had the value) or ``not_found``.
+    """
+    outcomes = []
+    updated_ids = []
+    with transaction.atomic():
+        for start in range(0, len(ids), BULK_CHUNK_SIZE):
+            chunk = ids[start:start + BULK_CHUNK_SIZE]
+            current = dict(model.objects.filter(id__in=chunk).values_list('id', field))
+            changed = [i for i in chunk if i in current and current[i] != value]
+            if changed:
+                model.objects.filter(id__in=changed).update(**{field: value}, **extra)
+            changed_set = set(changed)
+            for i in chunk:
+                if i not in current:
+                    outcome = 'not_found'
+                elif i in changed_set:
+                    outcome = 'updated'
+                else:
+                    outcome = 'unchanged'
+                outcomes.append({'id': i, 'outcome': outcome})
+            updated_ids.extend(changed)
+    return outcomes, updated_ids
+
+def bulk_response(outcomes):
+    totals = Counter(o['outcome'] for o in outcomes)
+    return Response({
+        'updated': totals['updated'],
+        'unchanged': totals['unchanged'],
+        'not_found': totals['not_found'],
+        'protected': totals['protected'],
+        'results': outcomes,
+    })
+
 # 1. Skill Moderation
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_list_user_skills(request):
-    skills = UserSkill.objects.all().select_related('user', 'skill')
-    serializer = UserSkillSerializer(skills, many=True)
-    return Response(serializer.data)
+    skills = filter_user_skills(request.query_params).values(
+        'id', 'user_id', 'user__email', 'user__first_name', 'user__last_name',
+        'skill_id', 'skill__name', 'skill__category', 'skill_type', 'proficiency_level',
+        'status', 'rejection_reason', 'created_at',
+    )
+    return admin_page(request, skills, lambda row: {
+        'id': row['id'],
+        'user': row['user_id'],
+        'user_email': row['user__email'],
+        'user_full_name': full_name_of(row, 'user'),
+        'skill': row['skill_id'],
+        'skill_name': row['skill__name'],
+        'skill_category': row['skill__category'],
+        'skill_type': row['skill_type'],
+        'proficiency_level': row['proficiency_level'],
+        'status': row['status'],
+        'rejection_reason': row['rejection_reason'],
+        'created_at': row['created_at'],
+    })
 
+@query_budget(10)
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def admin_approve_skill(request, pk):
@@ -35,11 +223,12 @@ def admin_approve_skill(request, pk):
         skill = UserSkill.objects.get(pk=pk)
         skill.status = 'approved'
         skill.rejection_reason = ''
-        skill.save()
+        skill.save(update_fields=['status', 'rejection_reason'])
         return Response({'success': True, 'id': skill.id})
     except UserSkill.DoesNotExist:
         return Response({'error': 'Skill not found'}, status=404)
 
+@query_budget(10)
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def admin_reject_skill(request, pk):
@@ -48,61 +237,138 @@ def admin_reject_skill(request, pk):
         reason = request.data.get('rejection_reason', 'Rejected by admin.')
         skill.status = 'rejected'
         skill.rejection_reason = reason
-        skill.save()
+        skill.save(update_fields=['status', 'rejection_reason'])
         return Response({'success': True, 'id': skill.id})
     except UserSkill.DoesNotExist:
         return Response({'error': 'Skill not found'}, status=404)
 
+@query_budget(BULK_QUERY_BUDGET)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def admin_bulk_approve_skills(request):
+    ids = bulk_target_ids(request, filter_user_skills, USER_SKILL_FILTERS)
+    outcomes, updated_ids = bulk_update(UserSkill, ids, 'status', 'approved', rejection_reason='')
+    user_skills_updated.send(sender=UserSkill, queryset=UserSkill.objects.filter(id__in=updated_ids))
+    return bulk_response(outcomes)
+
+@query_budget(BULK_QUERY_BUDGET)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def admin_bulk_reject_skills(request):
+    ids = bulk_target_ids(request, filter_user_skills, USER_SKILL_FILTERS)
+    reason = request.data.get('rejection_reason', 'Rejected by admin.')
+    outcomes, updated_ids = bulk_update(UserSkill, ids, 'status', 'rejected', rejection_reason=reason)
+    user_skills_updated.send(sender=UserSkill, queryset=UserSkill.objects.filter(id__in=updated_ids))
+    return bulk_response(outcomes)
+
 # 2. User Management
 User = get_user_model()
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_list_users(request):
-    users = User.objects.all()
-    data = [
-        {
-            'id': u.id,
-            'email': u.email,
-            'full_name': u.full_name,
-            'is_banned': u.is_banned,
-            'is_admin': u.is_admin,
-            'created_at': u.created_at,
-        } for u in users
-    ]
-    return Response(data)
+    users = filter_users(request.query_params).values(
+        'id', 'email', 'first_name', 'last_name', 'is_banned', 'is_admin', 'created_at'
+    )
+    return admin_page(request, users, lambda row: {
+        'id': row['id'],
+        'email': row['email'],
+        'full_name': full_name(row['first_name'], row['last_name']),
+        'is_banned': row['is_banned'],
+        'is_admin': row['is_admin'],
+        'created_at': row['created_at'],
+    })
 
+@query_budget(6)
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def admin_ban_user(request, pk):
     try:
         user = User.objects.get(pk=pk)
         user.is_banned = True
-        user.save()
+        user.save(update_fields=['is_banned', 'updated_at'])
         return Response({'success': True, 'id': user.id})
     except User.DoesNotExist:
         return Response({'error': 'User not found'}, status=404)
 
+@query_budget(6)
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def admin_unban_user(request, pk):
     try:
         user = User.objects.get(pk=pk)
         user.is_banned = False
-        user.save()
+        user.save(update_fields=['is_banned', 'updated_at'])
         return Response({'success': True, 'id': user.id})
     except User.DoesNotExist:
         return Response({'error': 'User not found'}, status=404)
 
+@query_budget(BULK_QUERY_BUDGET)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def admin_bulk_ban_users(request):
+    ids = bulk_target_ids(request, filter_users, USER_FILTERS, USER_BAN_CRITERIA)
+    # Admins, the acting one included, are never banned in bulk
+    protected = set(User.objects.filter(Q(pk=request.user.pk) | ADMIN_ACCOUNTS).values_list('id', flat=True))
+    outcomes, updated_ids = bulk_update(
+        User, [i for i in ids if i not in protected], 'is_banned', True, updated_at=timezone.now()
+    )
+    outcomes = {o['id']: o for o in outcomes}
+    outcomes = [outcomes.get(i) or {'id': i, 'outcome': 'protected'} for i in ids]
+    bump_profiles(updated_ids)
+    match_index.sync_users(User.objects.filter(id__in=updated_ids))
+    return bulk_response(outcomes)
+
+@query_budget(BULK_QUERY_BUDGET)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def admin_bulk_unban_users(request):
+    ids = bulk_target_ids(request, filter_users, USER_FILTERS)
+    outcomes, updated_ids = bulk_update(User, ids, 'is_banned', False, updated_at=timezone.now())
+    bump_profiles(updated_ids)
+    match_index.sync_users(User.objects.filter(id__in=updated_ids))
+    return bulk_response(outcomes)
+
 # 3. Swap Monitoring
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_list_swaps(request):
-    swaps = SwapRequest.objects.all().select_related('from_user', 'to_user', 'skill_offered', 'skill_wanted')
-    serializer = SwapRequestSerializer(swaps, many=True)
-    return Response(serializer.data)
+    swaps = SwapRequest.objects.all()
+    status_filter = choice_param(request.query_params, 'status', SwapRequest.STATUS_CHOICES)
+    if status_filter:
+        swaps = swaps.filter(status=status_filter)
+    user_id = int_param(request.query_params, 'user')
+    if user_id is not None:
+        swaps = swaps.filter(Q(from_user_id=user_id) | Q(to_user_id=user_id))
+    swaps = filter_created_range(request.query_params, swaps).values(
+        'id', 'from_user_id', 'from_user__first_name', 'from_user__last_name',
+        'to_user_id', 'to_user__first_name', 'to_user__last_name',
+        'skill_offered_id', 'skill_offered__name', 'skill_wanted_id', 'skill_wanted__name',
+        'status', 'duration', 'preferred_time', 'created_at', 'updated_at',
+    )
+    return admin_page(request, swaps, lambda row: {
+        'id': row['id'],
+        'from_user': {'id': row['from_user_id'], 'full_name': full_name_of(row, 'from_user')},
+        'to_user': {'id': row['to_user_id'], 'full_name': full_name_of(row, 'to_user')},
+        'skill_offered': {'id': row['skill_offered_id'], 'name': row['skill_offered__name']},
+        'skill_wanted': {'id': row['skill_wanted_id'], 'name': row['skill_wanted__name']},
+        'status': row['status'],
+        'duration': row['duration'],
+        'preferred_time': row['preferred_time'],
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at'],
+    })
+
+@query_budget(3)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_profile_cache_stats(request):
+    return Response(profile_cache.stats())
 
 # 4. Platform Messages
+@query_budget(5)
 @api_view(['GET', 'POST'])
 @permission_classes([IsAdminUser])
 def admin_messages(request):
@@ -117,6 +383,7 @@ def admin_messages(request):
             return Response(serializer.data, status=201)
         return Response(serializer.errors, status=400)
 
+@query_budget(6)
 @api_view(['PATCH'])
 @permission_classes([IsAdminUser])
 def admin_update_message(request, pk):
@@ -131,42 +398,59 @@ def admin_update_message(request, pk):
     return Response(serializer.errors, status=400)
 
 # 5. Reports (CSV)
+# Streamed, so the queries run while the body is sent and no budget applies
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_export_users_csv(request):
-    users = User.objects.all()
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename=users.csv'
-    writer = csv.writer(response)
-    writer.writerow(['ID', 'Email', 'Full Name', 'Is Banned', 'Is Admin', 'Created At'])
-    for u in users:
-        writer.writerow([u.id, u.email, u.full_name, u.is_banned, u.is_admin, u.created_at])
-    return response
+    return stream_csv('users.csv', USER_HEADER, user_rows(User.objects.all()))
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_export_swaps_csv(request):
-    swaps = SwapRequest.objects.all().select_related('from_user', 'to_user', 'skill_offered', 'skill_wanted')
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename=swaps.csv'
-    writer = csv.writer(response)
-    writer.writerow(['ID', 'From User', 'To User', 'Skill Offered', 'Skill Wanted', 'Status', 'Duration', 'Preferred Time', 'Created At'])
-    for swap in swaps:
-        writer.writerow([
-            swap.id, swap.from_user.full_name, swap.to_user.full_name, swap.skill_offered.name, swap.skill_wanted.name, swap.status, swap.duration, swap.preferred_time, swap.created_at
-        ])
-    return response
+    return stream_csv('swaps.csv', SWAP_HEADER, swap_rows(SwapRequest.objects.all()))
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_export_ratings_csv(request):
-    ratings = SwapRating.objects.all().select_related('swap_session', 'from_user')
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename=ratings.csv'
-    writer = csv.writer(response)
-    writer.writerow(['ID', 'Swap Session', 'From User', 'Rating', 'Comment', 'Created At'])
-    for rating in ratings:
-        writer.writerow([
-            rating.id, str(rating.swap_session), rating.from_user.full_name, rating.rating, rating.comment, rating.created_at
-        ])
-    return response 
\ No newline at end of file
+    return stream_csv('ratings.csv', RATING_HEADER, rating_rows(SwapRating.objects.all()))
+
+# 6. Background export jobs
+RECENT_EXPORT_JOBS = 50
+
+@query_budget(5)
+@api_view(['GET', 'POST'])
+@permission_classes([IsAdminUser])
+def admin_export_jobs(request):
+    if request.method == 'GET':
+        jobs = ExportJob.objects.all()[:RECENT_EXPORT_JOBS]
+        serializer = ExportJobSerializer(jobs, many=True, context={'request': request})
+        return Response(serializer.data)
+    serializer = ExportJobSerializer(data=request.data, context={'request': request})
+    if serializer.is_valid():
+        serializer.save(requested_by=request.user)
+        return Response(serializer.data, status=201)
+    return Response(serializer.errors, status=400)
+
+@query_budget(4)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_export_job_detail(request, pk):
+    try:
+        job = ExportJob.objects.get(pk=pk)
+    except ExportJob.DoesNotExist:
+        return Response({'error': 'Export job not found'}, status=404)
+    return Response(ExportJobSerializer(job, context={'request': request}).data)
+
+@query_budget(4)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_download_export_job(request, pk):
+    try:
+        job = ExportJob.objects.get(pk=pk)
+    except ExportJob.DoesNotExist:
+        return Response({'error': 'Export job not found'}, status=404)
+    if job.status != 'done':
+        return Response({'error': 'Export is not finished yet'}, status=409)
+    if not job.file or not job.file.storage.exists(job.file.name):
+        return Response({'error': 'Export file is missing; run the export again'}, status=404)
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.file.name.rsplit('/', 1)[-1])
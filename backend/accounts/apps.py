@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AccountsConfig(AppConfig):
+    name = 'accounts'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        import skillswap.db  # noqa: F401
@@ -0,0 +1,195 @@
+"""
+Avatar uploads and their thumbnails.
+
+``upload_avatar`` only checks the upload's leading bytes, stores the
+original and queues an ``AvatarJob``; the ``process_avatar_jobs`` command
+does the image work. A job decodes the original once (JPEGs at the reduced
+scale closest to the largest thumbnail), crops it to a square and writes
+every rendition in ``THUMBNAIL_SIZES`` as WebP, or JPEG where Pillow lacks
+WebP support. Lists and nested profiles serve those renditions, so a page
+of cards costs a few kilobytes per user instead of the full upload.
+
+Each upload is stored under a new random name, so its URL never serves a
+previously cached image, and moves ``User.avatar_version`` in the same
+UPDATE. A job only writes its thumbnails while the user is still at the
+version it was queued with, so an upload or delete made meanwhile always
+wins.
+"""
+import io
+import secrets
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .models import AvatarJob, User
+from .profile_cache import bump_profiles
+
+MAX_AVATAR_BYTES = 5 * 1024 * 1024
+# Larger images are refused before decoding rather than expanded in memory
+MAX_AVATAR_PIXELS = 40_000_000
+
+# Detected type -> leading bytes; the client's content type and file name are ignored
+SIGNATURES = {
+    'jpeg': (b'\xff\xd8\xff',),
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'gif': (b'GIF87a', b'GIF89a'),
+}
+EXTENSIONS = {'jpeg': 'jpg', 'png': 'png', 'gif': 'gif'}
+
+# User field -> edge of the square rendition in pixels (2x the largest display size)
+THUMBNAIL_SIZES = {'avatar_small': 256, 'avatar_thumb': 128}
+THUMBNAIL_FIELDS = tuple(THUMBNAIL_SIZES)
+
+
+class AvatarError(Exception):
+    pass
+
+
+def sniff_image_type(upload):
+    """The image type of ``upload`` by its magic bytes, or None"""
+    upload.seek(0)
+    head = upload.read(8)
+    upload.seek(0)
+    for image_type, signatures in SIGNATURES.items():
+        if head.startswith(signatures):
+            return image_type
+    return None
+
+
+def replace_avatar(user, upload, image_type):
+    """Store ``upload`` as ``user``'s avatar, drop the old files and queue the thumbnails"""
+    delete_avatar_files(user)
+    field = User._meta.get_field('avatar')
+    name = field.generate_filename(user, f'{user.pk}-{secrets.token_urlsafe(8)}.{EXTENSIONS[image_type]}')
+    name = field.storage.save(name, upload, max_length=field.max_length)
+    with transaction.atomic():
+        set_avatar(user, name)
+        return AvatarJob.objects.create(user=user, source=name, version=user.avatar_version)
+
+
+def clear_avatar(user):
+    """Delete ``user``'s avatar and thumbnails; any job still queued for them becomes stale"""
+    delete_avatar_files(user)
+    set_avatar(user, None)
+
+
+def set_avatar(user, name):
+    """Point ``user`` at a new original, without thumbnails, and move the avatar version"""
+    User.objects.filter(pk=user.pk).update(
+        avatar=name, avatar_thumb=None, avatar_small=None,
+        avatar_version=F('avatar_version') + 1, updated_at=timezone.now(),
+    )
+    user.refresh_from_db(fields=['avatar', *THUMBNAIL_FIELDS, 'avatar_version', 'updated_at'])
+    # update() sends no post_save
+    bump_profiles([user.pk])
+
+
+def delete_avatar_files(user):
+    """Delete ``user``'s avatar and thumbnail files, leaving the fields cleared but unsaved"""
+    for name in ('avatar', *THUMBNAIL_FIELDS):
+        getattr(user, name).delete(save=False)
+
+
+def thumbnail_format():
+    return ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+
+
+def render_thumbnails(source):
+    """Encoded square renditions of the image in ``source``, by user field"""
+    try:
+        image = Image.open(source)
+        if image.width * image.height > MAX_AVATAR_PIXELS:
+            raise AvatarError(f'Image is too large ({image.width}x{image.height}).')
+        largest = max(THUMBNAIL_SIZES.values())
+        # JPEGs decode straight to a reduced scale no smaller than the largest thumbnail
+        image.draft('RGB', (largest, largest))
+        image.load()
+        image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError, ValueError) as exc:
+        raise AvatarError(f'Not a readable image: {exc}') from exc
+
+    image_format, _ = thumbnail_format()
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    if has_alpha and image_format == 'JPEG':
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+
+    renditions = {}
+    # Largest first; each smaller size is resampled from the previous one
+    for field, size in sorted(THUMBNAIL_SIZES.items(), key=lambda item: -item[1]):
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        if image_format == 'WEBP':
+            image.save(output, 'WEBP', quality=80, method=4)
+        else:
+            image.save(output, 'JPEG', quality=85, optimize=True, progressive=True)
+        renditions[field] = output.getvalue()
+    return renditions
+
+
+def current_user(job):
+    """The user, as long as their avatar is still the upload ``job`` was queued for"""
+    # The source check also covers jobs queued before avatar versions existed
+    return User.objects.filter(pk=job.user_id, avatar_version=job.version, avatar=job.source)
+
+
+def run_job(job):
+    """Write ``job``'s thumbnails and mark it done; undecodable uploads are removed"""
+    if not current_user(job).exists():
+        finish(job, 'done', 'Superseded by a later upload.')
+        return
+    storage = User._meta.get_field('avatar').storage
+    try:
+        with storage.open(job.source, 'rb') as source:
+            renditions = render_thumbnails(source)
+    except AvatarError as exc:
+        cleared = current_user(job).update(
+            avatar=None, avatar_version=F('avatar_version') + 1, updated_at=timezone.now()
+        )
+        if cleared:
+            storage.delete(job.source)
+            bump_profiles([job.user_id])
+        finish(job, 'failed', str(exc))
+        return
+
+    _, extension = thumbnail_format()
+    names = {}
+    for field, content in renditions.items():
+        model_field = User._meta.get_field(field)
+        name = model_field.generate_filename(None, f'{job.user_id}-{job.pk}-{THUMBNAIL_SIZES[field]}.{extension}')
+        names[field] = model_field.storage.save(name, ContentFile(content))
+
+    updated = current_user(job).update(**names, updated_at=timezone.now())
+    if not updated:
+        # Replaced while the thumbnails were rendering
+        for field, name in names.items():
+            User._meta.get_field(field).storage.delete(name)
+        finish(job, 'done', 'Superseded by a later upload.')
+        return
+    bump_profiles([job.user_id])
+    finish(job, 'done')
+
+
+def finish(job, status, error=''):
+    job.status = status
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+
+
+def queue_missing_thumbnails():
+    """Queue a job for every avatar without thumbnails or a pending job; returns how many"""
+    pending = AvatarJob.objects.filter(status__in=['queued', 'running']).values('user_id')
+    users = (
+        User.objects.exclude(Q(avatar='') | Q(avatar=None)).filter(Q(avatar_thumb='') | Q(avatar_thumb=None))
+        .exclude(pk__in=pending).values_list('pk', 'avatar', 'avatar_version')
+    )
+    jobs = AvatarJob.objects.bulk_create([
+        AvatarJob(user_id=pk, source=avatar, version=version) for pk, avatar, version in users.iterator()
+    ])
+    return len(jobs)
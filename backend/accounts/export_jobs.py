@@ -0,0 +1,171 @@
+"""
+Background export jobs.
+
+Admins enqueue an ``ExportJob`` through the admin API and the
+``process_export_jobs`` management command works through the queue. Rows are
+read in primary-key order, one chunk at a time. After each chunk the job
+records the last id written and a checkpoint into the output file, so a
+worker that dies part-way picks up from there rather than starting over.
+"""
+import csv
+import gzip
+import io
+import os
+import secrets
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from skills.exports import USER_SKILL_HEADER, user_skill_rows
+from skills.models import UserSkill
+from swaps.exports import SWAP_HEADER, RATING_HEADER, swap_rows, rating_rows
+from swaps.models import SwapRequest, SwapRating
+from .exports import USER_DETAIL_HEADER, user_detail_rows
+from .models import User, ExportJob
+
+JOB_CHUNK_SIZE = 5000
+
+# kind -> (model, header, row generator, supports status filter)
+EXPORT_KINDS = {
+    'users': (User, USER_DETAIL_HEADER, user_detail_rows, False),
+    'swaps': (SwapRequest, SWAP_HEADER, swap_rows, True),
+    'ratings': (SwapRating, RATING_HEADER, rating_rows, False),
+    'user_skills': (UserSkill, USER_SKILL_HEADER, user_skill_rows, True),
+}
+
+
+class ExportError(Exception):
+    pass
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def job_queryset(job):
+    model, _, _, has_status = EXPORT_KINDS[job.kind]
+    queryset = model.objects.order_by('id')
+    # Datetime bounds rather than __date, which casts the column and skips the created_at indexes
+    if job.date_from:
+        queryset = queryset.filter(created_at__gte=start_of_day(job.date_from))
+    if job.date_to:
+        queryset = queryset.filter(created_at__lt=start_of_day(job.date_to + timedelta(days=1)))
+    if job.status_filter and has_status:
+        queryset = queryset.filter(status=job.status_filter)
+    return queryset
+
+
+def output_path(job):
+    # Unguessable, so the file can't be fetched by name even if the private
+    # directory is ever exposed; downloads go through the admin-only view
+    extension = 'csv.gz' if job.format == 'csv' else 'parquet'
+    return os.path.join('exports', f'{job.kind}-{job.pk}-{secrets.token_urlsafe(16)}.{extension}')
+
+
+def run_job(job):
+    """Write ``job``'s remaining rows and mark it done, resuming from its checkpoint"""
+    _, header, rows, _ = EXPORT_KINDS[job.kind]
+    if job.started_at is None:
+        job.started_at = timezone.now()
+        job.save(update_fields=['started_at', 'updated_at'])
+    relative_path = job.file.name or output_path(job)
+    path = job.file.storage.path(relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if job.format == 'csv':
+        write_chunk = write_csv_chunk
+    else:
+        write_chunk = write_parquet_chunk
+        if pyarrow_modules() is None:
+            raise ExportError('Parquet exports require pyarrow to be installed.')
+
+    queryset = job_queryset(job)
+    if job.last_id is None:
+        job.total_rows = queryset.count()
+        job.rows_written = 0
+        job.checkpoint = write_csv_header(path, header) if job.format == 'csv' else 0
+        job.file.name = relative_path
+        job.save(update_fields=['total_rows', 'rows_written', 'checkpoint', 'file', 'updated_at'])
+
+    while True:
+        chunk_queryset = queryset
+        if job.last_id is not None:
+            chunk_queryset = queryset.filter(id__gt=job.last_id)
+        chunk = list(rows(chunk_queryset[:JOB_CHUNK_SIZE]))
+        if not chunk:
+            break
+        job.checkpoint = write_chunk(path, job.checkpoint, chunk)
+        job.last_id = chunk[-1][0]
+        job.rows_written += len(chunk)
+        job.save(update_fields=['last_id', 'rows_written', 'checkpoint', 'updated_at'])
+
+    if job.format == 'parquet':
+        finish_parquet(path, job.checkpoint, header)
+    job.status = 'done'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at', 'updated_at'])
+
+
+def write_csv_header(path, header):
+    return write_csv_chunk(path, 0, [header])
+
+
+def write_csv_chunk(path, checkpoint, chunk):
+    """
+    Append ``chunk`` as its own gzip member and return the new file size.
+
+    Concatenated gzip members decompress as a single stream, so truncating
+    back to the last checkpoint drops any half-written member from a crash.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(chunk)
+    with open(path, 'ab') as output:
+        output.truncate(checkpoint)
+        output.seek(checkpoint)
+        with gzip.GzipFile(fileobj=output, mode='wb') as member:
+            member.write(buffer.getvalue().encode('utf-8'))
+        return output.tell()
+
+
+def parquet_parts_dir(path):
+    return f'{path}.parts'
+
+
+def write_parquet_chunk(path, checkpoint, chunk):
+    """
+    Write ``chunk`` as the next numbered part file and return the part count.
+
+    Parquet files can't be appended to, so parts are combined once the job
+    finishes and any part past the checkpoint is simply overwritten.
+    """
+    pa, pq = pyarrow_modules()
+    parts_dir = parquet_parts_dir(path)
+    os.makedirs(parts_dir, exist_ok=True)
+    columns = [pa.array([None if value is None else str(value) for value in column], pa.string())
+               for column in zip(*chunk)]
+    table = pa.Table.from_arrays(columns, names=[f'c{i}' for i in range(len(columns))])
+    pq.write_table(table, os.path.join(parts_dir, f'part-{checkpoint:05d}.parquet'))
+    return checkpoint + 1
+
+
+def finish_parquet(path, checkpoint, header):
+    pa, pq = pyarrow_modules()
+    parts_dir = parquet_parts_dir(path)
+    schema = pa.schema([(name, pa.string()) for name in header])
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for part in range(checkpoint):
+            table = pq.read_table(os.path.join(parts_dir, f'part-{part:05d}.parquet'))
+            writer.write_table(table.rename_columns(header))
+    if os.path.isdir(parts_dir):
+        for name in os.listdir(parts_dir):
+            os.remove(os.path.join(parts_dir, name))
+        os.rmdir(parts_dir)
+
+
+def pyarrow_modules():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow, pyarrow.parquet
@@ -0,0 +1,23 @@
+from skillswap.exports import EXPORT_CHUNK_SIZE, full_name
+
+USER_HEADER = ['ID', 'Email', 'Full Name', 'Is Banned', 'Is Admin', 'Created At']
+USER_DETAIL_HEADER = [
+    'ID', 'Email', 'Full Name', 'Location', 'Rating', 'Completed Swaps', 'Is Banned', 'Is Admin', 'Created At'
+]
+
+
+def user_rows(queryset):
+    rows = queryset.values_list(
+        'id', 'email', 'first_name', 'last_name', 'is_banned', 'is_admin', 'created_at'
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for user_id, email, first_name, last_name, is_banned, is_admin, created_at in rows:
+        yield [user_id, email, full_name(first_name, last_name), is_banned, is_admin, created_at]
+
+
+def user_detail_rows(queryset):
+    rows = queryset.values_list(
+        'id', 'email', 'first_name', 'last_name', 'location', 'rating', 'completed_swaps',
+        'is_banned', 'is_admin', 'created_at',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for user_id, email, first_name, last_name, *rest in rows:
+        yield [user_id, email, full_name(first_name, last_name), *rest]
@@ -0,0 +1,242 @@
+import itertools
+import json
+import platform
+import random
+import resource
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from accounts.admin_api import is_admin
+from accounts.models import User
+
+SEARCH_TERMS = ['python', 'sarah', 'design', 'austin', 'guitar', 'zzzz']
+
+# (name, path, needs an admin); paths may use {term}
+ENDPOINTS = [
+    ('auth-check', '/api/auth/check/', False),
+    ('user-search', '/api/auth/users/?search={term}', False),
+    ('user-skills', '/api/skills/user-skills/', False),
+    ('swap-requests', '/api/swaps/requests/', False),
+    ('received-requests', '/api/swaps/requests/received/', False),
+    ('export-users', '/api/auth/admin/export/users/', True),
+    ('export-swaps', '/api/auth/admin/export/swaps/', True),
+    ('export-ratings', '/api/auth/admin/export/ratings/', True),
+]
+COMPARED = [('rps', 'requests/s', 1), ('p95_ms', 'p95', -1), ('queries_mean', 'queries', -1)]
+
+
+def percentile(ordered, share):
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)] if ordered else 0
+
+
+def reset_peak_rss():
+    """Reset the kernel's RSS high-water mark (Linux); returns whether it worked"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Since process start; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if platform.system() == 'Darwin' else 1024)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive the API in-process against the current (seeded) database and report throughput, '
+        'latency percentiles, query counts and peak RSS per endpoint'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Client threads per endpoint')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint')
+        parser.add_argument('--export-requests', type=int, default=3,
+                            help='Measured requests per export endpoint, which stream whole tables')
+        parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per thread first')
+        parser.add_argument('--endpoints', nargs='+', choices=[name for name, _, _ in ENDPOINTS],
+                            default=[name for name, _, _ in ENDPOINTS])
+        parser.add_argument('--seed', type=int, default=0, help='Chooses the users the clients log in as')
+        parser.add_argument('--output', help='Results file (default: api-benchmark-<commit>.json)')
+        parser.add_argument('--compare', help='Earlier results file to print changes against')
+
+    def handle(self, *args, **options):
+        users = self.pick_users(options['concurrency'], options['seed'])
+        admin = User.objects.filter(is_active=True, is_admin=True).order_by('id').first()
+        admin = admin or User.objects.filter(is_active=True, is_superuser=True).order_by('id').first()
+
+        results = {}
+        self.stdout.write(
+            f"{'endpoint':<18} {'reqs':>5} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'queries':>8} {'peak MB':>8}"
+        )
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name, path, needs_admin in ENDPOINTS:
+                if name not in options['endpoints']:
+                    continue
+                if needs_admin and (admin is None or not is_admin(admin)):
+                    self.stdout.write(f'{name:<18} skipped: no active admin user')
+                    continue
+                clients = self.clients([admin] * options['concurrency'] if needs_admin else users)
+                total = options['export_requests'] if name.startswith('export-') else options['requests']
+                result = self.run(path, clients, total, options['warmup'])
+                results[name] = result
+                self.stdout.write(
+                    f"{name:<18} {result['requests']:>5} {result['errors']:>6} {result['rps']:>8.1f} "
+                    f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                    f"{result['queries_mean']:>8.1f} {result['peak_rss_mb']:>8.1f}"
+                )
+
+        commit = git_commit()
+        report = {
+            'meta': {
+                'commit': commit,
+                'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'debug': settings.DEBUG,
+                'users': User.objects.count(),
+                'concurrency': options['concurrency'],
+                'warmup': options['warmup'],
+            },
+            'results': results,
+        }
+        output = options['output'] or f'api-benchmark-{commit}.json'
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2)
+        self.stdout.write(f'Results written to {output}')
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def pick_users(self, count, seed):
+        """``count`` distinct active users, drawn from the oldest accounts"""
+        ids = list(
+            User.objects.filter(is_active=True, is_banned=False).order_by('id').values_list('id', flat=True)
+            [:max(count * 50, 1_000)]
+        )
+        if len(ids) < count:
+            raise CommandError(
+                f'Need {count} active users; seed the database first, e.g. '
+                f'"python manage.py generate_data --users 10000".'
+            )
+        chosen = random.Random(seed).sample(ids, count)
+        return list(User.objects.filter(id__in=chosen).order_by('id'))
+
+    @staticmethod
+    def clients(users):
+        clients = []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            clients.append(client)
+        return clients
+
+    def run(self, path, clients, total, warmup):
+        """Share ``total`` requests between one thread per client"""
+        tickets = itertools.count()
+        started = threading.Barrier(len(clients) + 1)
+        samples = [[] for _ in clients]
+
+        def worker(client, out):
+            queries = [0]
+
+            def count_queries(execute, sql, params, many, context):
+                queries[0] += 1
+                return execute(sql, params, many, context)
+
+            try:
+                with connection.execute_wrapper(count_queries):
+                    for number in range(warmup):
+                        self.request(client, path, number)
+                    started.wait()
+                    while (number := next(tickets)) < total:
+                        queries[0] = 0
+                        start = time.perf_counter()
+                        status = self.request(client, path, number)
+                        out.append(((time.perf_counter() - start) * 1000, queries[0], status))
+            except BaseException:
+                started.abort()
+                raise
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(client, out)) for client, out in zip(clients, samples)]
+        reset_peak_rss()
+        for thread in threads:
+            thread.start()
+        started.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        rows = [row for out in samples for row in out]
+        latencies = sorted(row[0] for row in rows)
+        queries = [row[1] for row in rows]
+        return {
+            'path': path,
+            'requests': len(rows),
+            'errors': sum(1 for row in rows if row[2] >= 400),
+            'seconds': round(elapsed, 3),
+            'rps': round(len(rows) / elapsed, 2) if elapsed else 0,
+            'p50_ms': round(percentile(latencies, 0.5), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'max_ms': round(latencies[-1], 2) if latencies else 0,
+            'queries_mean': round(sum(queries) / len(queries), 2) if queries else 0,
+            'queries_max': max(queries, default=0),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        }
+
+    @staticmethod
+    def request(client, path, number):
+        response = client.get(path.format(term=SEARCH_TERMS[number % len(SEARCH_TERMS)]))
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+    def compare(self, path, results):
+        with open(path) as file:
+            previous = json.load(file)
+        self.stdout.write(f"\nAgainst {path} ({previous['meta']['commit']}):")
+        for name, result in results.items():
+            before = previous['results'].get(name)
+            if before is None:
+                continue
+            changes = []
+            for key, label, better in COMPARED:
+                if before[key]:
+                    change = (result[key] - before[key]) / before[key] * 100
+                    flag = ' worse' if change * better < -5 else ''
+                    changes.append(f'{label} {change:+.1f}%{flag}')
+            self.stdout.write(f"{name:<18} {', '.join(changes)}")
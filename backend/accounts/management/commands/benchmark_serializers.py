@@ -0,0 +1,170 @@
+import statistics
+import time
+import tracemalloc
+from itertools import cycle, islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from accounts.projections import user_list_projection, user_profile_projection
+from accounts.profile_cache import profile_cache
+from accounts.search import get_search_backend
+from accounts.serializers import UserListSerializer, UserProfileSerializer
+from skills.models import Skill, UserSkill
+from skills.projections import skill_projection
+from skills.serializers import SkillSerializer, UserSkillSerializer
+from swaps.models import SwapRequest
+from swaps.projections import swap_request_projection
+from swaps.serializers import SwapRequestSerializer
+from skillswap.projections import Projection
+
+SWAP_RELATED = ('from_user', 'to_user', 'skill_offered', 'skill_wanted')
+user_skill_projection = Projection(UserSkillSerializer)
+
+
+def serialize(serializer_class, instances):
+    return serializer_class(instances, many=True).data
+
+
+def forget_skills(users):
+    for user in users:
+        user.__dict__.pop('prefetched_skills', None)
+
+
+def project(projection, queryset):
+    return projection.build(queryset.values(*projection.columns))
+
+
+class Command(BaseCommand):
+    help = (
+        'Time DRF serializers against .values() projections over preloaded rows, compare list endpoints, '
+        'and time query construction, with tracemalloc peaks'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--compiles', type=int, default=1_000, help='Compilations per query shape')
+
+    def handle(self, *args, **options):
+        if not SwapRequest.objects.exists():
+            raise CommandError('No swap requests; seed the database first with generate_data.')
+        self.repeat = options['repeat']
+        for size in options['sizes']:
+            self.serializers(size)
+            self.endpoints(size)
+        self.query_construction(options['compiles'])
+
+    def measure(self, run, setup=None):
+        """Median milliseconds over the repeats, then tracemalloc's peak KB for one more run"""
+        samples = []
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            result = run()
+            samples.append((time.perf_counter() - start) * 1000)
+        if setup:
+            setup()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+        return statistics.median(samples), peak, result
+
+    def serializers(self, size):
+        """
+        Serialization of instances or values() rows loaded beforehand. Both
+        sides run the one query loading the page's skill names.
+        """
+        skills = list(islice(cycle(Skill.objects.all()), size))
+        user_skills = UserSkill.objects.select_related('skill').order_by('id')[:size]
+        users = User.objects.order_by('id')[:size]
+        swaps = SwapRequest.objects.select_related(*SWAP_RELATED).order_by('-created_at', '-id')[:size]
+        skill_rows = list(islice(cycle(Skill.objects.values(*skill_projection.columns)), size))
+        user_skill_rows = list(user_skills.values(*user_skill_projection.columns))
+        user_rows = list(users.values(*user_profile_projection.columns))
+        swap_rows = list(swaps.values(*swap_request_projection.columns))
+        user_skills, users, swaps = list(user_skills), list(users), list(swaps)
+        participants = [user for swap in swaps for user in (swap.from_user, swap.to_user)]
+
+        def cold(users):
+            def setup():
+                forget_skills(users)
+                profile_cache.invalidate_all()
+            return setup
+
+        cases = [
+            ('SkillSerializer', SkillSerializer, skills, None),
+            ('  projection', skill_projection, skill_rows, None),
+            ('UserSkillSerializer', UserSkillSerializer, user_skills, None),
+            ('  projection', user_skill_projection, user_skill_rows, None),
+            ('UserListSerializer', UserListSerializer, users, lambda: forget_skills(users)),
+            ('  projection', user_list_projection, user_rows, None),
+            ('UserProfileSerializer cold', UserProfileSerializer, users, cold(users)),
+            ('UserProfileSerializer warm', UserProfileSerializer, users, None),
+            ('  projection', user_profile_projection, user_rows, None),
+            ('SwapRequestSerializer cold', SwapRequestSerializer, swaps, cold(participants)),
+            ('SwapRequestSerializer warm', SwapRequestSerializer, swaps, None),
+            ('  projection', swap_request_projection, swap_rows, None),
+        ]
+        self.stdout.write(f"\n{'serializer':<28} {'rows':>6} {'ms':>9} {'us/row':>8} {'peak KB':>9}")
+        for label, serializer, rows, setup in cases:
+            if isinstance(serializer, Projection):
+                run = lambda: serializer.build(rows)
+            else:
+                run = lambda: serialize(serializer, rows)
+                if label.endswith('warm'):
+                    run()  # fill the profile cache
+            ms, peak, _ = self.measure(run, setup)
+            self.stdout.write(
+                f'{label:<28} {len(rows):>6} {ms:>9.1f} {ms * 1000 / max(len(rows), 1):>8.1f} {peak:>9.0f}'
+            )
+
+    def endpoints(self, size):
+        """Fetch plus serialization of list endpoint querysets, DRF against .values() projections"""
+        user_skills = UserSkill.objects.filter(status='approved').select_related('skill').order_by('id')[:size]
+        users = User.objects.filter(is_active=True).order_by('-created_at', '-id')[:size]
+        swaps = SwapRequest.objects.select_related(*SWAP_RELATED).order_by('-created_at', '-id')[:size]
+        cases = [
+            ('user skills', UserSkillSerializer, user_skills, user_skill_projection),
+            ('users', UserListSerializer, users, user_list_projection),
+            ('swap requests', SwapRequestSerializer, swaps, swap_request_projection),
+        ]
+        self.stdout.write(
+            f"\n{'endpoint':<16} {'rows':>6} {'drf ms':>9} {'values ms':>10} {'speedup':>8} "
+            f"{'drf KB':>9} {'values KB':>10} {'same':>5}"
+        )
+        for label, serializer_class, queryset, projection in cases:
+            drf_ms, drf_peak, drf = self.measure(
+                lambda: serialize(serializer_class, queryset.all()), profile_cache.invalidate_all
+            )
+            values_ms, values_peak, projected = self.measure(lambda: project(projection, queryset.all()))
+            same = [dict(row) for row in drf] == projected
+            self.stdout.write(
+                f'{label:<16} {len(projected):>6} {drf_ms:>9.1f} {values_ms:>10.1f} '
+                f'{drf_ms / max(values_ms, 1e-9):>7.1f}x {drf_peak:>9.0f} {values_peak:>10.0f} {str(same):>5}'
+            )
+
+    def query_construction(self, compiles):
+        """SQL compilation of the hot list querysets, without executing them"""
+        user = User.objects.order_by('id').first()
+        received = SwapRequest.objects.filter(to_user=user).exclude(from_user=user)
+        shapes = [
+            ('user list', User.objects.exclude(id=user.id).filter(is_active=True).order_by('-created_at')[:10]),
+            ('user search', get_search_backend().search(User.objects.filter(is_active=True), 'python dev')[:10]),
+            ('user skills', UserSkill.objects.filter(user=user, status='approved').select_related('skill')),
+            ('swap branch keys', received.order_by('-created_at', '-id').values_list('created_at', 'id')[:11]),
+            ('received', SwapRequest.objects.filter(to_user=user).select_related(*SWAP_RELATED)[:10]),
+            ('user detail', User.objects.filter(is_active=True).filter(pk=user.pk)),
+        ]
+        self.stdout.write(f"\n{'query':<20} {'us/compile':>11}")
+        for label, queryset in shapes:
+            samples = []
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                for _ in range(compiles):
+                    # A fresh clone each time, as each request builds its own
+                    queryset.all().query.get_compiler(queryset.db).as_sql()
+                samples.append((time.perf_counter() - start) * 1e6 / compiles)
+            self.stdout.write(f'{label:<20} {statistics.median(samples):>11.1f}')
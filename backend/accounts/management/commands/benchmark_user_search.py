@@ -0,0 +1,80 @@
+import random
+import sqlite3
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.search import SQLITE_CREATE_SQL, SQLiteFTSSearchBackend
+
+FIRST_NAMES = ['Sarah', 'Mike', 'Emily', 'David', 'Lisa', 'Omar', 'Priya', 'Chen', 'Ana', 'Lukas']
+LAST_NAMES = ['Chen', 'Rodriguez', 'Johnson', 'Kim', 'Wang', 'Haddad', 'Patel', 'Silva', 'Novak']
+CITIES = ['San Francisco, CA', 'Austin, TX', 'New York, NY', 'Seattle, WA', 'Boston, MA', 'Berlin', 'Pune']
+WORDS = [
+    'developer', 'designer', 'passionate', 'learning', 'teaching', 'frontend', 'backend',
+    'data', 'mobile', 'marketing', 'startup', 'music', 'photography', 'writing', 'cooking',
+]
+SKILLS = ['React', 'Python', 'Django', 'Figma', 'SEO', 'Photoshop', 'Kotlin', 'Swift', 'Pandas']
+QUERIES = ['sarah', 'pyth', 'seattle', 'photo', 'react austin', 'zzzz']
+
+
+class Command(BaseCommand):
+    help = 'Compare chained icontains scans with the FTS5 user search index at several table sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        backend = SQLiteFTSSearchBackend()
+        like_sql = (
+            'SELECT id FROM accounts_user WHERE first_name LIKE ? OR last_name LIKE ? '
+            'OR bio LIKE ? OR location LIKE ? ORDER BY created_at DESC LIMIT 10'
+        )
+        fts_sql = (
+            f'SELECT rowid FROM {backend.table} WHERE {backend.table} MATCH ? '
+            f'ORDER BY bm25({backend.table}, {", ".join(map(str, backend.weights))}) LIMIT 10'
+        )
+        self.stdout.write(f"{'users':>10} {'query':<14} {'icontains ms':>13} {'fts5 ms':>9}")
+        for size in options['sizes']:
+            db = self.build_database(size, random.Random(options['seed']))
+            for query in QUERIES:
+                # Like the view, icontains matches the whole query as one substring
+                pattern = f'%{query}%'
+                like_ms = self.time(db, like_sql, [pattern] * 4, options['repeat'])
+                fts_ms = self.time(db, fts_sql, [backend.match_expression(query)], options['repeat'])
+                self.stdout.write(f'{size:>10} {query:<14} {like_ms:>13.2f} {fts_ms:>9.2f}')
+            db.close()
+
+    def build_database(self, size, rng):
+        db = sqlite3.connect(':memory:')
+        db.execute(
+            'CREATE TABLE accounts_user (id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT, '
+            'bio TEXT, location TEXT, created_at REAL)'
+        )
+        db.execute(SQLITE_CREATE_SQL)
+        batch = []
+        for user_id in range(1, size + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            bio = ' '.join(rng.choices(WORDS, k=12))
+            location = rng.choice(CITIES)
+            skills = ' '.join(rng.sample(SKILLS, 3))
+            batch.append((user_id, first, last, bio, location, user_id, skills))
+            if len(batch) == 10_000 or user_id == size:
+                db.executemany('INSERT INTO accounts_user VALUES (?, ?, ?, ?, ?, ?)', [row[:6] for row in batch])
+                db.executemany(
+                    'INSERT INTO accounts_user_fts (rowid, name, bio, location, skills) VALUES (?, ?, ?, ?, ?)',
+                    [(r[0], f'{r[1]} {r[2]}', r[3], r[4], r[6]) for r in batch],
+                )
+                batch = []
+        db.commit()
+        return db
+
+    def time(self, db, sql, params, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            db.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,380 @@
+import random
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, reset_queries, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from accounts.models import User
+from accounts.profile_cache import profile_cache
+from accounts.search import get_search_backend
+from accounts.stats import COMPLETED_STATUSES
+from skills.canonical import normalize_skill_name
+from skills.catalogue import skill_catalogue
+from skills.matching import match_index
+from skills.models import Skill, UserSkill
+from swaps.models import SwapRequest, SwapSession, SwapRating
+
+FIRST_NAMES = [
+    'Sarah', 'Mike', 'Emily', 'David', 'Lisa', 'Omar', 'Priya', 'Chen', 'Ana', 'Lukas',
+    'Fatima', 'James', 'Yuki', 'Carlos', 'Amara', 'Noah', 'Ines', 'Ravi', 'Sofia', 'Tom',
+]
+LAST_NAMES = [
+    'Chen', 'Rodriguez', 'Johnson', 'Kim', 'Wang', 'Haddad', 'Patel', 'Silva', 'Novak',
+    'Okafor', 'Müller', 'Tanaka', 'Garcia', 'Smith', 'Rossi', 'Nguyen', 'Kowalski', 'Ali',
+]
+CITIES = [
+    'San Francisco, CA', 'Austin, TX', 'New York, NY', 'Seattle, WA', 'Boston, MA',
+    'Berlin', 'Pune', 'Lagos', 'São Paulo', 'Toronto, ON', 'Tokyo', 'London', '',
+]
+WORDS = [
+    'developer', 'designer', 'passionate', 'learning', 'teaching', 'frontend', 'backend',
+    'data', 'mobile', 'marketing', 'startup', 'music', 'photography', 'writing', 'cooking',
+    'mentor', 'curious', 'freelance', 'student', 'product', 'open', 'source', 'community',
+]
+BASE_SKILLS = {
+    'programming': ['Python', 'JavaScript', 'React', 'Django', 'Node.js', 'TypeScript', 'Go', 'Rust', 'SQL'],
+    'design': ['UI/UX Design', 'Figma', 'Photoshop', 'Illustration', 'Typography', 'Motion Design'],
+    'marketing': ['SEO', 'Content Writing', 'Copywriting', 'Social Media', 'Email Marketing'],
+    'business': ['Project Management', 'Public Speaking', 'Negotiation', 'Accounting', 'Sales'],
+    'data': ['Data Analysis', 'Machine Learning', 'Statistics', 'Pandas', 'Data Visualization'],
+    'mobile': ['iOS Development', 'Android Development', 'Flutter', 'Kotlin', 'Swift'],
+    'other': ['Guitar', 'Spanish', 'Cooking', 'Photography', 'Yoga', 'Chess'],
+}
+SKILL_LEVELS = ['Basics', 'Advanced', 'for Teams', 'Testing', 'Performance', 'Tooling', 'Architecture']
+
+# (value, weight) distributions
+USER_STATUS = [('approved', 85), ('pending', 10), ('rejected', 5)]
+SWAP_STATUS = [('pending', 30), ('accepted', 15), ('rejected', 15), ('completed', 30), ('cancelled', 10)]
+STARS = [(1, 5), (2, 5), (3, 15), (4, 35), (5, 40)]
+OFFERED_LEVELS = ['intermediate', 'advanced', 'expert']
+RATE_CHANCE = 0.7
+
+
+def choices_of(model, field):
+    return [value for value, _ in model._meta.get_field(field).choices]
+
+
+def weighted(pairs):
+    values, weights = zip(*pairs)
+    return list(values), list(accumulate(weights))
+
+
+def skill_names(count):
+    """``count`` distinct ``(name, category)`` pairs, base skills first"""
+    base = [(name, category) for category, names in BASE_SKILLS.items() for name in names]
+    names = base[:count]
+    for level in SKILL_LEVELS:
+        for name, category in base:
+            if len(names) == count:
+                return names
+            names.append((f'{name} {level}', category))
+    index = 0
+    while len(names) < count:
+        index += 1
+        names.extend((f'{name} {index}', category) for name, category in base[:count - len(names)])
+    return names
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the generated created_at/updated_at values"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a deterministic synthetic dataset (users, skills, swap requests, sessions '
+        'and ratings) for load tests and benchmarks'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000)
+        parser.add_argument('--skills', type=int, default=200,
+                            help='Skills in the generated catalogue; existing ones are reused by name')
+        parser.add_argument('--swaps-per-user', type=float, default=2.0, help='Average swap requests sent per user')
+        parser.add_argument('--days', type=int, default=730, help='How far back created_at values go')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--prefix', default='gen', help='Username and email prefix of generated users')
+        parser.add_argument('--password', default='password123', help='Password of every generated user')
+        parser.add_argument('--skip-search-index', action='store_true',
+                            help='Leave the user search index to be rebuilt later')
+
+    def handle(self, *args, **options):
+        if options['users'] < 2:
+            raise CommandError('--users must be at least 2.')
+        self.options = options
+        self.batch_size = options['batch_size']
+        self.prefix = options['prefix']
+        if User.objects.filter(username=f'{self.prefix}-0').exists():
+            raise CommandError(f'Users with prefix "{self.prefix}" already exist; pick another --prefix.')
+
+        self.now = timezone.now()
+        self.start = self.now - timedelta(days=options['days'])
+        self.span = (self.now - self.start).total_seconds()
+        self.user_base = (User.objects.aggregate(top=Max('id'))['top'] or 0) + 1
+        started = time.perf_counter()
+
+        self.skill_ids = self.ensure_skills(options['skills'])
+        # Zipf-like popularity: a few skills are held and wanted by most users
+        self.skill_cum = list(accumulate(1 / (rank + 1) ** 1.1 for rank in range(len(self.skill_ids))))
+
+        # Skills, then swaps, are drawn once here to build the offerer lists
+        # and user stats, and drawn again from the same seeds when written
+        self.offerers = [array('l') for _ in self.skill_ids]
+        for index, offered, _ in self.user_skill_draws():
+            for position in offered:
+                self.offerers[position].append(index)
+        self.stats = [array('L', [0]) * options['users'] for _ in range(3)]
+        for swap in self.swap_draws():
+            self.count_stats(swap)
+
+        with explicit_timestamps(User, UserSkill, SwapRequest, SwapSession, SwapRating):
+            self.phase('users', self.write_users())
+            self.phase('user skills', self.write_user_skills())
+            self.phase('swaps, sessions, ratings', self.write_swaps())
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [User, UserSkill, SwapRequest, SwapSession, SwapRating]
+            ):
+                cursor.execute(sql)
+        if not options['skip_search_index']:
+            self.phase('search index', self.rebuild_search_index())
+        profile_cache.invalidate_all()
+        skill_catalogue.invalidate()
+        match_index.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {options["users"]} users in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def phase(self, label, rows):
+        start = time.perf_counter()
+        total = 0
+        for count in rows:
+            total += count
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'{label:<26} {total:>10} rows {elapsed:>8.1f}s {total / max(elapsed, 1e-9):>10.0f} rows/s')
+
+    def ensure_skills(self, count):
+        names = skill_names(count)
+        existing = set(Skill.objects.values_list('normalized_name', flat=True))
+        Skill.objects.bulk_create(
+            [
+                Skill(name=name, category=category, normalized_name=normalize_skill_name(name))
+                for name, category in names
+                if normalize_skill_name(name) not in existing
+            ],
+            batch_size=self.batch_size,
+        )
+        by_name = dict(Skill.objects.values_list('normalized_name', 'id'))
+        return [by_name[normalize_skill_name(name)] for name, _ in names]
+
+    def user_created(self, index):
+        """Signup times rise with the user's position, like autoincrement ids"""
+        return self.start + timedelta(seconds=self.span * 0.9 * index / self.options['users'])
+
+    def popular_skill(self, rng, k=1):
+        return rng.choices(range(len(self.skill_cum)), cum_weights=self.skill_cum, k=k)
+
+    def draw_skills(self, rng, low, high):
+        return list(dict.fromkeys(self.popular_skill(rng, rng.randint(low, high))))
+
+    def user_skill_draws(self):
+        """``(user index, offered, wanted)`` skill positions, identical on every call"""
+        rng = random.Random(f'{self.options["seed"]}:skills')
+        for index in range(self.options['users']):
+            offered = self.draw_skills(rng, 1, 4)
+            wanted = [position for position in self.draw_skills(rng, 1, 3) if position not in offered]
+            yield index, offered, wanted
+
+    def swap_draws(self):
+        """Swap requests with their session and ratings, identical on every call"""
+        rng = random.Random(f'{self.options["seed"]}:swaps')
+        users = self.options['users']
+        statuses, status_cum = weighted(SWAP_STATUS)
+        stars, stars_cum = weighted(STARS)
+        durations = choices_of(SwapRequest, 'duration')
+        times = choices_of(SwapRequest, 'preferred_time')
+        rate = 1 / self.options['swaps_per_user']
+        for sender in range(users):
+            for _ in range(int(rng.expovariate(rate))):
+                wanted = self.popular_skill(rng)[0]
+                holders = self.offerers[wanted]
+                if not holders:
+                    continue
+                receiver = holders[rng.randrange(len(holders))]
+                if receiver == sender:
+                    continue
+                offered = self.popular_skill(rng)[0]
+                status = rng.choices(statuses, cum_weights=status_cum)[0]
+                earliest = self.user_created(max(sender, receiver))
+                created = earliest + (self.now - earliest) * rng.random()
+                swap = {
+                    'from': sender, 'to': receiver, 'offered': offered, 'wanted': wanted,
+                    'status': status, 'created_at': created,
+                    'duration': rng.choice(durations), 'preferred_time': rng.choice(times),
+                    'session': None, 'ratings': [],
+                }
+                if status in COMPLETED_STATUSES:
+                    swap['session'] = created + timedelta(days=rng.randint(1, 21))
+                if status == 'completed':
+                    for rater in (sender, receiver):
+                        if rng.random() < RATE_CHANCE:
+                            swap['ratings'].append((rater, rng.choices(stars, cum_weights=stars_cum)[0]))
+                yield swap
+
+    def count_stats(self, swap):
+        completed, rating_sum, rating_count = self.stats
+        if swap['status'] in COMPLETED_STATUSES:
+            completed[swap['from']] += 1
+            completed[swap['to']] += 1
+        for rater, stars in swap['ratings']:
+            rated = swap['to'] if rater == swap['from'] else swap['from']
+            rating_sum[rated] += stars
+            rating_count[rated] += 1
+
+    def write(self, model, rows):
+        with transaction.atomic():
+            model.objects.bulk_create(rows, batch_size=self.batch_size)
+        # Under DEBUG every INSERT is kept in connection.queries
+        reset_queries()
+        return len(rows)
+
+    def write_users(self):
+        rng = random.Random(f'{self.options["seed"]}:users')
+        # One hash for everyone: hashing per user would dominate the run
+        password = make_password(self.options['password'])
+        availability = choices_of(User, 'availability')
+        experience = choices_of(User, 'experience_level')
+        response = choices_of(User, 'response_time')
+        completed, rating_sum, rating_count = self.stats
+        batch = []
+        for index in range(self.options['users']):
+            created = self.user_created(index)
+            count = rating_count[index]
+            batch.append(User(
+                id=self.user_base + index,
+                username=f'{self.prefix}-{index}',
+                email=f'{self.prefix}-{index}@example.com',
+                password=password,
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                bio=' '.join(rng.choices(WORDS, k=rng.randint(0, 20))).capitalize(),
+                location=rng.choice(CITIES),
+                availability=rng.choice(availability),
+                experience_level=rng.choice(experience),
+                response_time=rng.choice(response),
+                is_active=rng.random() >= 0.02,
+                is_banned=rng.random() < 0.005,
+                completed_swaps=completed[index],
+                rating_sum=rating_sum[index],
+                rating_count=count,
+                rating=round(Decimal(rating_sum[index]) / count, 2) if count else Decimal('0.00'),
+                date_joined=created,
+                created_at=created,
+                updated_at=created,
+            ))
+            if len(batch) == self.batch_size:
+                yield self.write(User, batch)
+                batch = []
+        yield self.write(User, batch)
+
+    def write_user_skills(self):
+        rng = random.Random(f'{self.options["seed"]}:user-skills')
+        statuses, status_cum = weighted(USER_STATUS)
+        batch = []
+        for index, offered, wanted in self.user_skill_draws():
+            user_id = self.user_base + index
+            joined = self.user_created(index)
+            for skill_type, positions in (('offered', offered), ('wanted', wanted)):
+                for position in positions:
+                    status = rng.choices(statuses, cum_weights=status_cum)[0]
+                    batch.append(UserSkill(
+                        user_id=user_id,
+                        skill_id=self.skill_ids[position],
+                        skill_type=skill_type,
+                        proficiency_level=rng.choice(OFFERED_LEVELS) if skill_type == 'offered' else 'beginner',
+                        status=status,
+                        rejection_reason='Not a teachable skill.' if status == 'rejected' else None,
+                        created_at=joined + timedelta(minutes=rng.randint(1, 600)),
+                    ))
+            if len(batch) >= self.batch_size:
+                yield self.write(UserSkill, batch)
+                batch = []
+        yield self.write(UserSkill, batch)
+
+    def write_swaps(self):
+        swap_id = (SwapRequest.objects.aggregate(top=Max('id'))['top'] or 0) + 1
+        session_id = (SwapSession.objects.aggregate(top=Max('id'))['top'] or 0) + 1
+        swaps, sessions, ratings = [], [], []
+        for swap in self.swap_draws():
+            swaps.append(SwapRequest(
+                id=swap_id,
+                from_user_id=self.user_base + swap['from'],
+                to_user_id=self.user_base + swap['to'],
+                skill_offered_id=self.skill_ids[swap['offered']],
+                skill_wanted_id=self.skill_ids[swap['wanted']],
+                message="Hi! I'd love to swap skills with you.",
+                duration=swap['duration'],
+                preferred_time=swap['preferred_time'],
+                status=swap['status'],
+                created_at=swap['created_at'],
+                updated_at=swap['created_at'],
+            ))
+            if swap['session'] is not None:
+                sessions.append(SwapSession(
+                    id=session_id,
+                    swap_request_id=swap_id,
+                    scheduled_date=swap['session'],
+                    completed=swap['status'] == 'completed',
+                    created_at=swap['created_at'],
+                ))
+                ratings.extend(
+                    SwapRating(
+                        swap_session_id=session_id,
+                        from_user_id=self.user_base + rater,
+                        rating=stars,
+                        created_at=swap['session'],
+                    )
+                    for rater, stars in swap['ratings']
+                )
+                session_id += 1
+            swap_id += 1
+            if len(swaps) == self.batch_size:
+                yield self.write_swap_batch(swaps, sessions, ratings)
+                swaps, sessions, ratings = [], [], []
+        yield self.write_swap_batch(swaps, sessions, ratings)
+
+    def write_swap_batch(self, swaps, sessions, ratings):
+        with transaction.atomic():
+            SwapRequest.objects.bulk_create(swaps, batch_size=self.batch_size)
+            SwapSession.objects.bulk_create(sessions, batch_size=self.batch_size)
+            SwapRating.objects.bulk_create(ratings, batch_size=self.batch_size)
+        reset_queries()
+        return len(swaps) + len(sessions) + len(ratings)
+
+    def rebuild_search_index(self):
+        with transaction.atomic():
+            get_search_backend().rebuild()
+        yield User.objects.count()
@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.avatars import queue_missing_thumbnails, run_job
+from accounts.models import AvatarJob
+
+
+class Command(BaseCommand):
+    help = 'Render thumbnails for uploaded avatars, requeueing jobs a dead worker left running'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument(
+            '--stale-after', type=int, default=120,
+            help='Seconds a job may stay running before it is considered abandoned and requeued',
+        )
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help='First queue a job for every avatar that has no thumbnails yet',
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            self.stdout.write(f'Queued {queue_missing_thumbnails()} avatar(s) without thumbnails')
+        while True:
+            self.requeue_stale_jobs(options['stale_after'])
+            job = self.claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            try:
+                run_job(job)
+            except Exception as exc:
+                AvatarJob.objects.filter(pk=job.pk).update(
+                    status='failed', error=str(exc), finished_at=timezone.now(), updated_at=timezone.now()
+                )
+                self.stderr.write(f'{job} failed: {exc}')
+            else:
+                message = f'{job}' + (f': {job.error}' if job.error else '')
+                self.stdout.write(self.style.SUCCESS(message) if job.status == 'done' else self.style.WARNING(message))
+
+    def claim_next_job(self):
+        """Atomically move the oldest queued job to running; other workers skip it"""
+        while True:
+            job = AvatarJob.objects.filter(status='queued').order_by('created_at').first()
+            if job is None:
+                return None
+            now = timezone.now()
+            claimed = AvatarJob.objects.filter(pk=job.pk, status='queued').update(
+                status='running', started_at=now, updated_at=now
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+
+    def requeue_stale_jobs(self, stale_after):
+        cutoff = timezone.now() - timedelta(seconds=stale_after)
+        requeued = AvatarJob.objects.filter(status='running', updated_at__lt=cutoff).update(status='queued')
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stalled job(s)')
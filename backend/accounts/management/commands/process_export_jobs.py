@@ -0,0 +1,60 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.export_jobs import run_job
+from accounts.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = 'Work through queued admin export jobs, resuming any that were interrupted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=2.0)
+        parser.add_argument(
+            '--stale-after', type=int, default=300,
+            help='Seconds without progress before a running job is considered abandoned and requeued',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.requeue_stale_jobs(options['stale_after'])
+            job = self.claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            self.stdout.write(f'Running {job}')
+            try:
+                run_job(job)
+            except Exception as exc:
+                ExportJob.objects.filter(pk=job.pk).update(
+                    status='failed', error=str(exc), finished_at=timezone.now(), updated_at=timezone.now()
+                )
+                self.stderr.write(f'{job} failed: {exc}')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{job}: {job.rows_written} rows'))
+
+    def claim_next_job(self):
+        """Atomically move the oldest queued job to running; other workers skip it"""
+        while True:
+            job = ExportJob.objects.filter(status='queued').order_by('created_at').first()
+            if job is None:
+                return None
+            now = timezone.now()
+            claimed = ExportJob.objects.filter(pk=job.pk, status='queued').update(
+                status='running', started_at=now, updated_at=now
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+
+    def requeue_stale_jobs(self, stale_after):
+        cutoff = timezone.now() - timedelta(seconds=stale_after)
+        requeued = ExportJob.objects.filter(status='running', updated_at__lt=cutoff).update(status='queued')
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stalled job(s)')
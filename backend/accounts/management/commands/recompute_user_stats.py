@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.stats import recompute_user_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild every user's rating and completed_swaps from swaps and ratings"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recompute_user_stats()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed stats for {updated} user(s)'))
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# Copied from accounts.search as of this migration; later changes there
+# must not change the index this migration builds
+SQLITE_CREATE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS accounts_user_fts USING fts5("
+    "name, bio, location, skills, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+SQLITE_REBUILD_SQL = """
+    INSERT INTO accounts_user_fts (rowid, name, bio, location, skills)
+    SELECT u.id, u.first_name || ' ' || u.last_name, u.bio, u.location,
+           COALESCE((SELECT group_concat(s.name, ' ')
+                     FROM skills_userskill us JOIN skills_skill s ON s.id = us.skill_id
+                     WHERE us.user_id = u.id AND us.status = 'approved'), '')
+    FROM accounts_user u
+"""
+
+POSTGRES_CREATE_SQL = [
+    "CREATE TABLE IF NOT EXISTS accounts_user_search ("
+    "user_id bigint PRIMARY KEY REFERENCES accounts_user (id) ON DELETE CASCADE, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS accounts_user_search_document_gin "
+    "ON accounts_user_search USING GIN (document)",
+]
+
+POSTGRES_REBUILD_SQL = """
+    INSERT INTO accounts_user_search (user_id, document)
+    SELECT u.id,
+           setweight(to_tsvector('simple', u.first_name || ' ' || u.last_name), 'A') ||
+           setweight(to_tsvector('simple', u.bio), 'C') ||
+           setweight(to_tsvector('simple', u.location), 'B') ||
+           setweight(to_tsvector('simple', COALESCE((SELECT string_agg(s.name, ' ') FROM skills_userskill us
+                                                     JOIN skills_skill s ON s.id = us.skill_id
+                                                     WHERE us.user_id = u.id AND us.status = 'approved'), '')), 'A')
+    FROM accounts_user u
+"""
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE_SQL)
+        schema_editor.execute(SQLITE_REBUILD_SQL)
+    elif vendor == 'postgresql':
+        for sql in POSTGRES_CREATE_SQL:
+            schema_editor.execute(sql)
+        schema_editor.execute(POSTGRES_REBUILD_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS accounts_user_fts')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP TABLE IF EXISTS accounts_user_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_role'),
+        ('skills', '0002_userskill_rejection_reason_userskill_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
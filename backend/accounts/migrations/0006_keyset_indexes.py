@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-created_at', '-id'], name='user_created_keyset_idx'),
+        ),
+    ]
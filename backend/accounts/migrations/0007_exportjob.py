@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('users', 'Users'), ('swaps', 'Swaps'), ('ratings', 'Ratings'), ('user_skills', 'User Skills')], max_length=20)),
+                ('format', models.CharField(choices=[('csv', 'Gzipped CSV'), ('parquet', 'Parquet')], default='csv', max_length=10)),
+                ('date_from', models.DateField(blank=True, null=True)),
+                ('date_to', models.DateField(blank=True, null=True)),
+                ('status_filter', models.CharField(blank=True, max_length=20)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('file', models.FileField(blank=True, upload_to='exports/')),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('rows_written', models.PositiveIntegerField(default=0)),
+                ('last_id', models.BigIntegerField(blank=True, help_text='Primary key of the last row written.', null=True)),
+                ('checkpoint', models.BigIntegerField(default=0, help_text='Bytes of CSV output or Parquet parts committed.')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='exportjob_queue_idx')],
+            },
+        ),
+    ]
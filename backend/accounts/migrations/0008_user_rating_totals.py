@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
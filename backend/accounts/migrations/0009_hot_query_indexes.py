@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_user_rating_totals'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='platformmessage',
+            index=models.Index(fields=['-created_at'], name='platformmessage_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='user_active_created_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_small',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='avatars/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='avatar_thumb',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='avatars/thumbs/'),
+        ),
+        migrations.CreateModel(
+            name='AvatarJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text='Storage name of the uploaded original.', max_length=100)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='avatar_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='avatarjob_queue_idx')],
+            },
+        ),
+    ]
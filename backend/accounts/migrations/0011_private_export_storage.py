@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:32
+
+from django.db import migrations, models
+import skillswap.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_avatar_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='file',
+            field=models.FileField(blank=True, storage=skillswap.storage.private_storage, upload_to='exports/'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_private_export_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='avatarjob',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text="The user's avatar_version this upload created."),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='avatar_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
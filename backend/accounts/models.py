@@ -1,11 +1,18 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from skillswap.storage import private_storage
+
 class User(AbstractUser):
     email = models.EmailField(unique=True)
     bio = models.TextField(max_length=500, blank=True)
     location = models.CharField(max_length=100, blank=True)
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
+    # Square renditions of the avatar, written by the avatar worker (accounts.avatars)
+    avatar_thumb = models.ImageField(upload_to='avatars/thumbs/', blank=True, null=True, editable=False)
+    avatar_small = models.ImageField(upload_to='avatars/thumbs/', blank=True, null=True, editable=False)
+    # Moves with every upload or delete; an avatar job only writes thumbnails for its own version
+    avatar_version = models.PositiveIntegerField(default=0, editable=False)
     availability = models.CharField(max_length=50, choices=[
         ('weekdays', 'Weekdays'),
         ('weekends', 'Weekends'),
@@ -26,6 +33,9 @@ class User(AbstractUser):
         ('2-3days', 'Usually responds within 2-3 days'),
     ], blank=True)
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.0)
+    # Running totals behind the rating average, maintained by accounts.stats
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
     completed_swaps = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -44,6 +54,16 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
+    class Meta(AbstractUser.Meta):
+        swappable = 'AUTH_USER_MODEL'
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='user_created_keyset_idx'),
+            # The public user list only ever shows active accounts
+            models.Index(
+                fields=['-created_at', '-id'], name='user_active_created_idx', condition=models.Q(is_active=True)
+            ),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -59,5 +79,82 @@ class PlatformMessage(models.Model):
     is_active = models.BooleanField(default=True)
     expires_at = models.DateTimeField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='platformmessage_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
+
+
+class ExportJob(models.Model):
+    KIND_CHOICES = [
+        ('users', 'Users'),
+        ('swaps', 'Swaps'),
+        ('ratings', 'Ratings'),
+        ('user_skills', 'User Skills'),
+    ]
+    FORMAT_CHOICES = [
+        ('csv', 'Gzipped CSV'),
+        ('parquet', 'Parquet'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    date_from = models.DateField(blank=True, null=True)
+    date_to = models.DateField(blank=True, null=True)
+    status_filter = models.CharField(max_length=20, blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='export_jobs')
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    file = models.FileField(upload_to='exports/', storage=private_storage, blank=True)
+    total_rows = models.PositiveIntegerField(default=0)
+    rows_written = models.PositiveIntegerField(default=0)
+    last_id = models.BigIntegerField(blank=True, null=True, help_text="Primary key of the last row written.")
+    checkpoint = models.BigIntegerField(default=0, help_text="Bytes of CSV output or Parquet parts committed.")
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='exportjob_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} export #{self.pk} ({self.status})"
+
+
+class AvatarJob(models.Model):
+    STATUS_CHOICES = ExportJob.STATUS_CHOICES
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='avatar_jobs')
+    source = models.CharField(max_length=100, help_text="Storage name of the uploaded original.")
+    version = models.PositiveIntegerField(default=0, help_text="The user's avatar_version this upload created.")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='avatarjob_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"avatar job #{self.pk} for user {self.user_id} ({self.status})"
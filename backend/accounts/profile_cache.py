@@ -0,0 +1,122 @@
+"""
+Versioned cache of ``UserProfileSerializer`` output.
+
+Each user has a version counter in the cache. A profile is stored under
+``(user id, version)``, so bumping the version is all it takes to
+invalidate it and stale entries simply age out. Anything that changes a
+serialized field (profile edits, avatars, skills, moderation, stats) calls
+``bump_profiles``; ``accounts.signals`` covers the model saves and the bulk
+paths call it directly.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+PROFILE_TIMEOUT = 24 * 60 * 60
+GENERATION_KEY = 'profile:generation'
+
+
+class ProfileCache:
+    def __init__(self, alias):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _version_key(self, user_id):
+        return f'profile:v:{user_id}'
+
+    def _data_key(self, generation, user_id, version, variant):
+        return f'profile:{generation}:{user_id}:{version}:{variant}'
+
+    @staticmethod
+    def _fresh_version():
+        # Never reuse a number: an evicted counter must not revive old entries
+        return time.time_ns()
+
+    def _versions(self, user_ids):
+        keys = {self._version_key(user_id): user_id for user_id in user_ids}
+        keys[GENERATION_KEY] = None
+        found = self.cache.get_many(list(keys))
+        versions = {}
+        for key, user_id in keys.items():
+            value = found.get(key)
+            if value is None:
+                value = self._fresh_version()
+                if not self.cache.add(key, value, timeout=None):
+                    value = self.cache.get(key, value)
+            versions[user_id] = value
+        generation = versions.pop(None)
+        return generation, versions
+
+    def get_many(self, user_ids, variant=''):
+        """
+        Return ``{user_id: (entry_key, data)}``; ``data`` is None on a miss and
+        ``entry_key`` is what to pass back to ``set`` once it is computed.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
+        generation, versions = self._versions(user_ids)
+        keys = {
+            user_id: self._data_key(generation, user_id, version, variant)
+            for user_id, version in versions.items()
+        }
+        found = self.cache.get_many(list(keys.values()))
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return {user_id: (key, found.get(key)) for user_id, key in keys.items()}
+
+    def set(self, entry_key, data):
+        self.cache.set(entry_key, data, timeout=PROFILE_TIMEOUT)
+
+    def bump(self, user_ids):
+        for user_id in set(user_ids):
+            key = self._version_key(user_id)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, self._fresh_version(), timeout=None)
+
+    def invalidate_all(self):
+        self.cache.set(GENERATION_KEY, self._fresh_version(), timeout=None)
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+
+
+profile_cache = ProfileCache(getattr(settings, 'PROFILE_CACHE_ALIAS', 'default'))
+
+
+def bump_profiles(user_ids):
+    profile_cache.bump(user_ids)
+
+
+def cache_variant(request):
+    """Avatar URLs are absolute when a request is in the serializer context"""
+    if request is None:
+        return ''
+    return f'{request.scheme}://{request.get_host()}'
+
+
+def attach_cached_profiles(users, request=None):
+    """Look up cached profiles for ``users`` in one multi-get and attach them"""
+    users = [u for u in users if u is not None]
+    entries = profile_cache.get_many([u.pk for u in users], cache_variant(request))
+    for user in users:
+        user.cached_profile = entries[user.pk]
+    return [user for user in users if user.cached_profile[1] is None]
@@ -0,0 +1,18 @@
+"""Projections of the user serializers, for lists built from values() rows"""
+from operator import itemgetter
+
+from skills.loaders import skill_names_by_user
+from skillswap.exports import full_name
+from skillswap.projections import Computed, Projection
+
+from .serializers import UserListSerializer, UserProfileSerializer
+
+USER_COMPUTED = {
+    'full_name': Computed(full_name, 'first_name', 'last_name'),
+    'skills_offered': Computed(itemgetter('offered'), 'id', loader=skill_names_by_user),
+    'skills_wanted': Computed(itemgetter('wanted'), 'id', loader=skill_names_by_user),
+}
+
+user_list_projection = Projection(UserListSerializer, computed=USER_COMPUTED)
+# Built from the database, so the profile cache is neither read nor filled
+user_profile_projection = Projection(UserProfileSerializer, computed=USER_COMPUTED)
@@ -0,0 +1,210 @@
+"""
+Full-text search over user profiles.
+
+Each backend keeps a per-user document of name, bio, location and approved
+skill names in a side table and ranks matches by relevance. The side table
+is created by migration ``0005_user_search_index`` and kept current by the
+signal handlers in ``accounts.signals``.
+"""
+import re
+
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_tokens(query):
+    return TOKEN_RE.findall(query.lower())
+
+
+class IcontainsSearchBackend:
+    """Fallback for databases without a full-text index: unranked LIKE scans"""
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            models.Q(first_name__icontains=query) |
+            models.Q(last_name__icontains=query) |
+            models.Q(bio__icontains=query) |
+            models.Q(location__icontains=query)
+        ).order_by('-created_at')
+
+    def index_users(self, user_ids):
+        pass
+
+    def remove_user(self, user_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SQLiteFTSSearchBackend:
+    """SQLite FTS5 virtual table keyed by user id, ranked with bm25"""
+
+    table = 'accounts_user_fts'
+    # bm25 column weights for name, bio, location and skills
+    weights = (10.0, 1.0, 2.0, 5.0)
+
+    def match_expression(self, query):
+        # Every token is a quoted prefix term, so "pyth dja" matches
+        # "Python Django" as the user types
+        return ' '.join(f'"{token}"*' for token in search_tokens(query))
+
+    def search(self, queryset, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return queryset.none()
+        weights = ', '.join(str(w) for w in self.weights)
+        user_table = queryset.model._meta.db_table
+        # Joined rather than ranked in a correlated subquery, which re-ran
+        # the MATCH once per matching row
+        return queryset.extra(
+            tables=[self.table],
+            where=[f'{self.table}.rowid = "{user_table}"."id"', f'{self.table} MATCH %s'],
+            params=[expression],
+            select={'search_rank': f'bm25({self.table}, {weights})'},
+        ).order_by('search_rank', '-created_at')
+
+    def index_users(self, user_ids):
+        documents = user_documents(user_ids)
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(i,) for i in user_ids])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, name, bio, location, skills) VALUES (%s, %s, %s, %s, %s)',
+                documents,
+            )
+
+    def remove_user(self, user_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [user_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(SQLITE_REBUILD_SQL)
+
+
+class PostgresSearchBackend:
+    """Weighted tsvector per user in a side table with a GIN index, ranked with ts_rank"""
+
+    table = 'accounts_user_search'
+
+    def tsquery(self, query):
+        return ' & '.join(f'{token}:*' for token in search_tokens(query))
+
+    def search(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return queryset.none()
+        user_table = queryset.model._meta.db_table
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT user_id FROM {self.table} WHERE document @@ to_tsquery('simple', %s)",
+                (tsquery,),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -ts_rank(document, to_tsquery('simple', %s)) FROM {self.table} "
+                f'WHERE user_id = "{user_table}"."id"',
+                (tsquery,),
+            )
+        ).order_by('search_rank', '-created_at')
+
+    def index_users(self, user_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"""
+                INSERT INTO {self.table} (user_id, document)
+                VALUES (%s, {POSTGRES_DOCUMENT_SQL % ('%s', '%s', '%s', '%s')})
+                ON CONFLICT (user_id) DO UPDATE SET document = EXCLUDED.document
+                """,
+                user_documents(user_ids),
+            )
+
+    def remove_user(self, user_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE user_id = %s', [user_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(POSTGRES_REBUILD_SQL)
+
+
+def user_documents(user_ids):
+    """``(id, name, bio, location, skills)`` rows for the given users"""
+    from skills.models import UserSkill
+    from .models import User
+
+    skills = {}
+    rows = UserSkill.objects.filter(user_id__in=user_ids, status='approved').values_list(
+        'user_id', 'skill__name'
+    )
+    for user_id, skill_name in rows:
+        skills.setdefault(user_id, []).append(skill_name)
+    users = User.objects.filter(id__in=user_ids).values_list(
+        'id', 'first_name', 'last_name', 'bio', 'location'
+    )
+    return [
+        (user_id, f'{first_name} {last_name}', bio, location, ' '.join(skills.get(user_id, [])))
+        for user_id, first_name, last_name, bio, location in users
+    ]
+
+
+SQLITE_CREATE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS accounts_user_fts USING fts5("
+    "name, bio, location, skills, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+SQLITE_REBUILD_SQL = """
+    INSERT INTO accounts_user_fts (rowid, name, bio, location, skills)
+    SELECT u.id, u.first_name || ' ' || u.last_name, u.bio, u.location,
+           COALESCE((SELECT group_concat(s.name, ' ')
+                     FROM skills_userskill us JOIN skills_skill s ON s.id = us.skill_id
+                     WHERE us.user_id = u.id AND us.status = 'approved'), '')
+    FROM accounts_user u
+"""
+
+POSTGRES_CREATE_SQL = [
+    "CREATE TABLE IF NOT EXISTS accounts_user_search ("
+    "user_id bigint PRIMARY KEY REFERENCES accounts_user (id) ON DELETE CASCADE, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS accounts_user_search_document_gin "
+    "ON accounts_user_search USING GIN (document)",
+]
+
+POSTGRES_DOCUMENT_SQL = (
+    "setweight(to_tsvector('simple', %s), 'A') || "
+    "setweight(to_tsvector('simple', %s), 'C') || "
+    "setweight(to_tsvector('simple', %s), 'B') || "
+    "setweight(to_tsvector('simple', %s), 'A')"
+)
+
+POSTGRES_REBUILD_SQL = f"""
+    INSERT INTO accounts_user_search (user_id, document)
+    SELECT u.id, {POSTGRES_DOCUMENT_SQL % (
+        "u.first_name || ' ' || u.last_name", 'u.bio', 'u.location',
+        "COALESCE((SELECT string_agg(s.name, ' ') FROM skills_userskill us "
+        "JOIN skills_skill s ON s.id = us.skill_id "
+        "WHERE us.user_id = u.id AND us.status = 'approved'), '')",
+    )}
+    FROM accounts_user u
+"""
+
+_backend = None
+
+
+def get_search_backend():
+    """Pick the backend for the default database, falling back to icontains"""
+    global _backend
+    if _backend is None:
+        tables = connection.introspection.table_names()
+        if connection.vendor == 'sqlite' and SQLiteFTSSearchBackend.table in tables:
+            _backend = SQLiteFTSSearchBackend()
+        elif connection.vendor == 'postgresql' and PostgresSearchBackend.table in tables:
+            _backend = PostgresSearchBackend()
+        else:
+            _backend = IcontainsSearchBackend()
+    return _backend
@@ -1,6 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate, login, logout
-from .models import User, PlatformMessage
+from skills.loaders import prefetch_user_skills, get_user_skill_names
+from django.urls import reverse
+from skills.models import UserSkill
+from swaps.models import SwapRequest
+from .export_jobs import pyarrow_modules
+from .profile_cache import profile_cache, cache_variant, attach_cached_profiles
+from .models import User, PlatformMessage, ExportJob
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=6)
@@ -44,6 +50,23 @@ class UserLoginSerializer(serializers.Serializer):
         
         return attrs
 
+class UserSkillsListSerializer(serializers.ListSerializer):
+    """Loads skills for the whole page in one query before serializing it"""
+
+    def to_representation(self, data):
+        users = list(data.all() if hasattr(data, 'all') else data)
+        prefetch_user_skills(users)
+        return super().to_representation(users)
+
+class ProfileListSerializer(serializers.ListSerializer):
+    """Serves cached profiles in one multi-get and loads skills only for the misses"""
+
+    def to_representation(self, data):
+        users = list(data.all() if hasattr(data, 'all') else data)
+        misses = attach_cached_profiles(users, self.context.get('request'))
+        prefetch_user_skills(misses)
+        return super().to_representation(users)
+
 class UserProfileSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
     skills_offered = serializers.SerializerMethodField()
@@ -57,22 +80,34 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = User
         fields = (
             'id', 'email', 'username', 'first_name', 'last_name', 'full_name',
-            'bio', 'location', 'avatar', 'availability', 'experience_level',
+            'bio', 'location', 'avatar', 'avatar_thumb', 'avatar_small', 'availability', 'experience_level',
             'response_time', 'rating', 'completed_swaps', 'created_at',
             'skills_offered', 'skills_wanted',
             'is_admin', 'is_staff', 'is_superuser', 'role'
         )
         read_only_fields = ('id', 'email', 'rating', 'completed_swaps', 'created_at')
+        list_serializer_class = ProfileListSerializer
+
+    def to_representation(self, instance):
+        if instance.pk is None:
+            return super().to_representation(instance)
+        # Attached by a list serializer's multi-get; used once so a later
+        # re-serialization of a modified instance looks the cache up again
+        entry = instance.__dict__.pop('cached_profile', None)
+        if entry is None:
+            variant = cache_variant(self.context.get('request'))
+            entry = profile_cache.get_many([instance.pk], variant)[instance.pk]
+        entry_key, data = entry
+        if data is None:
+            data = super().to_representation(instance)
+            profile_cache.set(entry_key, data)
+        return data
     
     def get_skills_offered(self, obj):
-        from skills.models import UserSkill
-        skills = UserSkill.objects.filter(user=obj, skill_type='offered')
-        return [skill.skill.name for skill in skills]
+        return get_user_skill_names(obj, 'offered')
     
     def get_skills_wanted(self, obj):
-        from skills.models import UserSkill
-        skills = UserSkill.objects.filter(user=obj, skill_type='wanted')
-        return [skill.skill.name for skill in skills]
+        return get_user_skill_names(obj, 'wanted')
 
 class UserListSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
@@ -82,21 +117,55 @@ class UserListSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
-            'id', 'full_name', 'avatar', 'location', 'availability',
+            'id', 'full_name', 'avatar', 'avatar_thumb', 'avatar_small', 'location', 'availability',
             'rating', 'skills_offered', 'skills_wanted', 'bio'
         )
+        list_serializer_class = UserSkillsListSerializer
     
     def get_skills_offered(self, obj):
-        from skills.models import UserSkill
-        skills = UserSkill.objects.filter(user=obj, skill_type='offered')
-        return [skill.skill.name for skill in skills]
+        return get_user_skill_names(obj, 'offered')
     
     def get_skills_wanted(self, obj):
-        from skills.models import UserSkill
-        skills = UserSkill.objects.filter(user=obj, skill_type='wanted')
-        return [skill.skill.name for skill in skills]
+        return get_user_skill_names(obj, 'wanted')
 
 class PlatformMessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = PlatformMessage
         fields = ['id', 'title', 'body', 'created_at', 'is_active', 'expires_at']
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    # Status values accepted per export kind
+    STATUS_FILTERS = {
+        'swaps': [choice for choice, _ in SwapRequest.STATUS_CHOICES],
+        'user_skills': [choice for choice, _ in UserSkill.STATUS_CHOICES],
+    }
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'kind', 'format', 'date_from', 'date_to', 'status_filter',
+            'status', 'total_rows', 'rows_written', 'error',
+            'created_at', 'started_at', 'finished_at', 'download_url',
+        ]
+        read_only_fields = [
+            'status', 'total_rows', 'rows_written', 'error', 'created_at', 'started_at', 'finished_at'
+        ]
+
+    def validate(self, attrs):
+        status_filter = attrs.get('status_filter')
+        if status_filter and status_filter not in self.STATUS_FILTERS.get(attrs['kind'], []):
+            raise serializers.ValidationError(f"Invalid status filter for {attrs['kind']} export")
+        if attrs.get('format') == 'parquet' and pyarrow_modules() is None:
+            raise serializers.ValidationError("Parquet exports require pyarrow to be installed")
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError("date_from must not be after date_to")
+        return attrs
+
+    def get_download_url(self, obj):
+        if obj.status != 'done':
+            return None
+        url = reverse('admin_download_export_job', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,65 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from skills.models import Skill, UserSkill
+from skills.signals import user_skills_updated
+from swaps.models import SwapRating
+from .models import User
+from .profile_cache import bump_profiles
+from .search import get_search_backend
+from .stats import apply_rating
+
+SEARCHABLE_FIELDS = {'first_name', 'last_name', 'bio', 'location'}
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_profiles([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def index_user(sender, instance, update_fields=None, **kwargs):
+    # Logins save last_login alone; skip saves that leave the document unchanged
+    if update_fields is not None and not SEARCHABLE_FIELDS.intersection(update_fields):
+        return
+    get_search_backend().index_users([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def unindex_user(sender, instance, **kwargs):
+    get_search_backend().remove_user(instance.pk)
+
+
+@receiver(post_save, sender=UserSkill)
+@receiver(post_delete, sender=UserSkill)
+def reindex_skill_owner(sender, instance, **kwargs):
+    bump_profiles([instance.user_id])
+    get_search_backend().index_users([instance.user_id])
+
+
+@receiver(user_skills_updated)
+def reindex_skill_owners(sender, queryset, **kwargs):
+    user_ids = list(queryset.values_list('user_id', flat=True).distinct())
+    bump_profiles(user_ids)
+    get_search_backend().index_users(user_ids)
+
+
+@receiver(post_save, sender=Skill)
+def reindex_skill_holders(sender, instance, created, **kwargs):
+    if not created:
+        user_ids = list(UserSkill.objects.filter(skill=instance).values_list('user_id', flat=True).distinct())
+        bump_profiles(user_ids)
+        get_search_backend().index_users(user_ids)
+
+
+@receiver(post_save, sender=SwapRating)
+def add_rating_to_average(sender, instance, created, **kwargs):
+    if created:
+        apply_rating(instance)
+
+
+@receiver(post_delete, sender=SwapRating)
+def remove_rating_from_average(sender, instance, **kwargs):
+    apply_rating(instance, sign=-1)
@@ -0,0 +1,99 @@
+"""
+Denormalized user statistics.
+
+``User.completed_swaps`` and ``User.rating`` are maintained with single
+UPDATE statements built from ``F()`` expressions, so concurrent requests
+never lose an increment. ``completed_swaps`` moves only when a swap enters
+or leaves ``COMPLETED_STATUSES``, which is what ``recompute_user_stats``
+counts. The rating is a running average kept as
+``rating_sum``/``rating_count``; ``recompute_user_stats`` rebuilds all of
+them from the swap and rating tables.
+"""
+from decimal import Decimal
+
+from django.db.models import DecimalField, F, FloatField, Func, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from skills.matching import match_index
+
+from .models import User
+from .profile_cache import bump_profiles, profile_cache
+
+COMPLETED_STATUSES = ('accepted', 'completed')
+RATING_FIELD = DecimalField(max_digits=3, decimal_places=2)
+
+
+def average_rating(rating_sum, rating_count):
+    """SQL expression for the two-decimal average, zero when there are no ratings"""
+    return Coalesce(
+        Cast(Cast(rating_sum, FloatField()) / NullIf(rating_count, Value(0)), RATING_FIELD),
+        Value(Decimal('0.00')),
+        output_field=RATING_FIELD,
+    )
+
+
+def record_completed_swap(swap_request, sign=1):
+    """Count (or with ``sign=-1`` uncount) ``swap_request`` for both participants"""
+    user_ids = [swap_request.from_user_id, swap_request.to_user_id]
+    User.objects.filter(pk__in=user_ids).update(completed_swaps=F('completed_swaps') + sign)
+    bump_profiles(user_ids)
+
+
+def rated_user_id(rating):
+    """The participant of the rated swap who did not leave ``rating``"""
+    swap_request = rating.swap_session.swap_request
+    if rating.from_user_id == swap_request.from_user_id:
+        return swap_request.to_user_id
+    return swap_request.from_user_id
+
+
+def apply_rating(rating, sign=1):
+    """Add (or with ``sign=-1`` remove) one rating from the rated user's average"""
+    rating_sum = F('rating_sum') + sign * rating.rating
+    rating_count = F('rating_count') + sign
+    user_id = rated_user_id(rating)
+    User.objects.filter(pk=user_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=average_rating(rating_sum, rating_count),
+    )
+    bump_profiles([user_id])
+    match_index.sync_users(User.objects.filter(pk=user_id))
+
+
+def subquery_aggregate(queryset, function, field):
+    """Correlated scalar subquery such as ``SELECT SUM(rating) FROM ... WHERE ...``"""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().annotate(
+                result=Func(F(field), function=function, output_field=IntegerField())
+            ).values('result')[:1]
+        ),
+        Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def recompute_user_stats():
+    """Rebuild every user's aggregates in two set-based UPDATEs; returns the user count"""
+    from swaps.models import SwapRequest, SwapRating
+
+    swaps = SwapRequest.objects.filter(
+        Q(from_user=OuterRef('pk')) | Q(to_user=OuterRef('pk')),
+        status__in=COMPLETED_STATUSES,
+    )
+    received_ratings = SwapRating.objects.filter(
+        Q(swap_session__swap_request__from_user=OuterRef('pk')) |
+        Q(swap_session__swap_request__to_user=OuterRef('pk'))
+    ).exclude(from_user=OuterRef('pk'))
+
+    updated = User.objects.update(
+        completed_swaps=subquery_aggregate(swaps, 'COUNT', 'id'),
+        rating_sum=subquery_aggregate(received_ratings, 'SUM', 'rating'),
+        rating_count=subquery_aggregate(received_ratings, 'COUNT', 'id'),
+    )
+    # A second statement, since the first one's right-hand sides only see old values
+    User.objects.update(rating=average_rating(F('rating_sum'), F('rating_count')))
+    profile_cache.invalidate_all()
+    match_index.invalidate()
+    return updated
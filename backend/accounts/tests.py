@@ -0,0 +1,184 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from django.test import TestCase
+
+from skills.models import Skill, UserSkill
+from skillswap.testing import CraftedCursorMixin
+from swaps.models import SwapRating, SwapRequest, SwapSession
+
+from .export_jobs import job_queryset
+from .models import ExportJob, User
+from .search import IcontainsSearchBackend, SQLiteFTSSearchBackend, get_search_backend
+from .stats import recompute_user_stats
+
+
+class UserListCursorTests(CraftedCursorMixin, TestCase):
+    CURSOR_LISTS = ['/api/auth/users/']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='reader@example.com', username='reader', password='password123',
+            first_name='Rea', last_name='Der',
+        )
+        for index in range(15):
+            User.objects.create_user(
+                email=f'user{index}@example.com', username=f'user{index}', password='password123',
+                first_name=f'User{index}', last_name='Test',
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_next_link_cursor_round_trips(self):
+        response = self.client.get('/api/auth/users/', {'cursor': ''})
+        self.assertEqual(response.status_code, 200)
+        first = response.json()
+        self.assertIsNotNone(first['next'])
+        response = self.client.get(first['next'])
+        self.assertEqual(response.status_code, 200)
+        ids = [user['id'] for user in first['results'] + response.json()['results']]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(ids), User.objects.exclude(pk=self.user.pk).count())
+
+
+class ExportJobQuerysetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for day, hour in [(9, 23), (10, 0), (12, 23), (13, 0)]:
+            user = User.objects.create_user(
+                email=f'user{day}-{hour}@example.com', username=f'user{day}-{hour}', password='password123',
+            )
+            User.objects.filter(pk=user.pk).update(created_at=datetime(2026, 3, day, hour, 30, tzinfo=timezone.utc))
+
+    def test_date_range_is_inclusive_and_uses_datetime_bounds(self):
+        job = ExportJob(kind='users', date_from=date(2026, 3, 10), date_to=date(2026, 3, 12))
+        queryset = job_queryset(job)
+        self.assertEqual(
+            [created.day for created in queryset.values_list('created_at', flat=True)], [10, 12],
+        )
+        self.assertNotIn('cast_date', str(queryset.query).lower())
+
+
+class RatingAverageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user(email='teacher@example.com', username='teacher', password='password123')
+        cls.student = User.objects.create_user(email='student@example.com', username='student', password='password123')
+        cls.skill = Skill.objects.create(name='Chess', category='other')
+
+    def session(self):
+        swap_request = SwapRequest.objects.create(
+            from_user=self.student, to_user=self.teacher, skill_offered=self.skill, skill_wanted=self.skill,
+            message='Hi', duration='1hour', preferred_time='flexible', status='completed',
+        )
+        return SwapSession.objects.create(swap_request=swap_request, scheduled_date=datetime.now(timezone.utc))
+
+    def stats(self, user):
+        return User.objects.values_list('rating', 'rating_sum', 'rating_count').get(pk=user.pk)
+
+    def test_running_average_matches_recompute(self):
+        sessions = [self.session() for _ in range(3)]
+        # The teacher's own rating of the student never counts towards the teacher
+        SwapRating.objects.create(swap_session=sessions[0], from_user=self.teacher, rating=1)
+        ratings = []
+        steps = [
+            ('add 5', lambda: ratings.append(
+                SwapRating.objects.create(swap_session=sessions[0], from_user=self.student, rating=5)
+            ), (Decimal('5.00'), 5, 1)),
+            ('add 4', lambda: ratings.append(
+                SwapRating.objects.create(swap_session=sessions[1], from_user=self.student, rating=4)
+            ), (Decimal('4.50'), 9, 2)),
+            ('add 2', lambda: ratings.append(
+                SwapRating.objects.create(swap_session=sessions[2], from_user=self.student, rating=2)
+            ), (Decimal('3.67'), 11, 3)),
+            ('delete 5', lambda: ratings[0].delete(), (Decimal('3.00'), 6, 2)),
+        ]
+        for label, step, expected in steps:
+            with self.subTest(step=label):
+                step()
+                self.assertEqual(self.stats(self.teacher), expected)
+        self.assertEqual(self.stats(self.student), (Decimal('1.00'), 1, 1))
+
+        incremental = {user.pk: self.stats(user) for user in (self.teacher, self.student)}
+        User.objects.update(rating=0, rating_sum=0, rating_count=0)
+        recompute_user_stats()
+        self.assertEqual({user.pk: self.stats(user) for user in (self.teacher, self.student)}, incremental)
+
+
+class UserSearchTests(TestCase):
+    """Ranking and reindexing of the SQLite FTS5 backend the test database migrates to"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.pianist = User.objects.create_user(
+            email='pianist@example.com', username='pianist', password='password123',
+            first_name='Piano', last_name='Player', bio='Classical repertoire', location='Vienna',
+        )
+        cls.fan = User.objects.create_user(
+            email='fan@example.com', username='fan', password='password123',
+            first_name='Ola', last_name='Nordmann', bio='Learning the piano slowly', location='Oslo',
+        )
+        cls.cook = User.objects.create_user(
+            email='cook@example.com', username='cook', password='password123',
+            first_name='Cem', last_name='Kaya', bio='Home cooking', location='Izmir',
+        )
+        cls.baking = Skill.objects.create(name='Sourdough Baking', category='other')
+
+    def search(self, query):
+        return list(get_search_backend().search(User.objects.all(), query).values_list('id', flat=True))
+
+    def test_backend_is_fts5(self):
+        self.assertIsInstance(get_search_backend(), SQLiteFTSSearchBackend)
+
+    def test_name_matches_outrank_bio_matches(self):
+        self.assertEqual(self.search('piano'), [self.pianist.pk, self.fan.pk])
+        self.assertEqual(self.search('pia'), [self.pianist.pk, self.fan.pk])
+        self.assertEqual(self.search('piano vienna'), [self.pianist.pk])
+        self.assertEqual(self.search('!!'), [])
+
+    def test_list_endpoint_ranks_search_results(self):
+        self.client.force_login(self.cook)
+        response = self.client.get('/api/auth/users/', {'search': 'piano'})
+        self.assertEqual([user['id'] for user in response.json()['results']], [self.pianist.pk, self.fan.pk])
+
+    def test_user_save_reindexes(self):
+        self.cook.bio = 'Jazz piano on weekends'
+        self.cook.save()
+        self.assertIn(self.cook.pk, self.search('jazz'))
+        self.assertEqual(self.search('cooking'), [])
+
+    def test_user_skill_changes_reindex(self):
+        user_skill = UserSkill.objects.create(user=self.cook, skill=self.baking, skill_type='offered', status='pending')
+        self.assertEqual(self.search('sourdough'), [])
+        user_skill.status = 'approved'
+        user_skill.save()
+        self.assertEqual(self.search('sourdough'), [self.cook.pk])
+        user_skill.delete()
+        self.assertEqual(self.search('sourdough'), [])
+
+    def test_bulk_approval_reindexes(self):
+        user_skill = UserSkill.objects.create(user=self.cook, skill=self.baking, skill_type='offered', status='pending')
+        admin = User.objects.create_superuser(email='root@example.com', username='root', password='password123')
+        self.client.force_login(admin)
+        response = self.client.post(
+            '/api/auth/admin/user-skills/bulk-approve/', {'ids': [user_skill.pk]}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.search('sourdough'), [self.cook.pk])
+
+    def test_skill_rename_reindexes_holders(self):
+        UserSkill.objects.create(user=self.cook, skill=self.baking, skill_type='offered', status='approved')
+        self.baking.name = 'Bread Making'
+        self.baking.save()
+        self.assertEqual(self.search('bread'), [self.cook.pk])
+        self.assertEqual(self.search('sourdough'), [])
+
+    def test_deleted_user_leaves_the_index(self):
+        self.fan.delete()
+        self.assertEqual(self.search('piano'), [self.pianist.pk])
+
+    def test_icontains_fallback(self):
+        results = IcontainsSearchBackend().search(User.objects.all(), 'piano')
+        self.assertEqual(set(results.values_list('id', flat=True)), {self.pianist.pk, self.fan.pk})
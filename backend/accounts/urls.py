@@ -20,12 +20,17 @@ urlpatterns += [
     path('admin/user-skills/', admin_api.admin_list_user_skills, name='admin_list_user_skills'),
     path('admin/user-skills/<int:pk>/approve/', admin_api.admin_approve_skill, name='admin_approve_skill'),
     path('admin/user-skills/<int:pk>/reject/', admin_api.admin_reject_skill, name='admin_reject_skill'),
+    path('admin/user-skills/bulk-approve/', admin_api.admin_bulk_approve_skills, name='admin_bulk_approve_skills'),
+    path('admin/user-skills/bulk-reject/', admin_api.admin_bulk_reject_skills, name='admin_bulk_reject_skills'),
 
     path('admin/users/', admin_api.admin_list_users, name='admin_list_users'),
     path('admin/users/<int:pk>/ban/', admin_api.admin_ban_user, name='admin_ban_user'),
     path('admin/users/<int:pk>/unban/', admin_api.admin_unban_user, name='admin_unban_user'),
+    path('admin/users/bulk-ban/', admin_api.admin_bulk_ban_users, name='admin_bulk_ban_users'),
+    path('admin/users/bulk-unban/', admin_api.admin_bulk_unban_users, name='admin_bulk_unban_users'),
 
     path('admin/swaps/', admin_api.admin_list_swaps, name='admin_list_swaps'),
+    path('admin/profile-cache/', admin_api.admin_profile_cache_stats, name='admin_profile_cache_stats'),
 
     path('admin/messages/', admin_api.admin_messages, name='admin_messages'),
     path('admin/messages/<int:pk>/', admin_api.admin_update_message, name='admin_update_message'),
@@ -33,4 +38,8 @@ urlpatterns += [
     path('admin/export/users/', admin_api.admin_export_users_csv, name='admin_export_users_csv'),
     path('admin/export/swaps/', admin_api.admin_export_swaps_csv, name='admin_export_swaps_csv'),
     path('admin/export/ratings/', admin_api.admin_export_ratings_csv, name='admin_export_ratings_csv'),
+
+    path('admin/export-jobs/', admin_api.admin_export_jobs, name='admin_export_jobs'),
+    path('admin/export-jobs/<int:pk>/', admin_api.admin_export_job_detail, name='admin_export_job_detail'),
+    path('admin/export-jobs/<int:pk>/download/', admin_api.admin_download_export_job, name='admin_download_export_job'),
 ]
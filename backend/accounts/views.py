@@ -1,3 +1,5 @@
+import logging
+
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.response import Response
@@ -5,8 +7,13 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.db import models
+from skillswap.projections import ProjectedListMixin
+from skillswap.query_budget import query_budget
+from skillswap.request_logging import log_payload
+from .avatars import MAX_AVATAR_BYTES, clear_avatar, replace_avatar, sniff_image_type
 from .models import User
+from .projections import user_list_projection
+from .search import get_search_backend
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer, 
@@ -14,6 +21,9 @@ from .serializers import (
     UserListSerializer
 )
 
+logger = logging.getLogger(__name__)
+
+@query_budget(24)
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def register(request):
@@ -28,6 +38,7 @@ def register(request):
         }, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(14)
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def login_view(request):
@@ -36,8 +47,7 @@ def login_view(request):
     if serializer.is_valid():
         user = serializer.validated_data['user']
         login(request, user)
-        print(f"Login - User: {user.full_name}, Session ID: {request.session.session_key}")
-        print(f"Login - Session data: {dict(request.session)}")
+        logger.info('Login succeeded', extra={'user_id': user.pk})
         
         response = Response({
             'message': 'Login successful',
@@ -56,11 +66,11 @@ def login_view(request):
                 path='/',
                 domain=None  # Use default domain
             )
-            print(f"Login - Set session cookie: sessionid={request.session.session_key}")
         
         return response
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(6)
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def logout_view(request):
@@ -70,16 +80,17 @@ def logout_view(request):
     response.delete_cookie('sessionid')
     return response
 
+@query_budget(8)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def check_auth(request):
     """Check if user is authenticated"""
-    print(f"Check auth - User: {request.user}, Authenticated: {request.user.is_authenticated}")
-    print(f"Check auth - Session ID: {request.session.session_key}")
-    print(f"Check auth - Cookies: {dict(request.COOKIES)}")
-    print(f"Check auth - Session data: {dict(request.session)}")
-    print(f"Check auth - User ID in session: {request.session.get('_auth_user_id')}")
-    
+    log_payload(logger, 'Auth check', lambda: {
+        'authenticated': request.user.is_authenticated,
+        'cookies': sorted(request.COOKIES),
+        'session_keys': sorted(request.session.keys()),
+    })
+
     if request.user.is_authenticated:
         return Response({
             'authenticated': True,
@@ -87,6 +98,7 @@ def check_auth(request):
         })
     return Response({'authenticated': False})
 
+@query_budget(4)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def profile(request):
@@ -94,6 +106,7 @@ def profile(request):
     serializer = UserProfileSerializer(request.user)
     return Response(serializer.data)
 
+@query_budget(12)
 @api_view(['PATCH'])
 @permission_classes([permissions.IsAuthenticated])
 def update_profile(request):
@@ -104,71 +117,65 @@ def update_profile(request):
         return Response(serializer.data)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(12)
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser])
 def upload_avatar(request):
-    """Upload a new avatar image for the current user"""
+    """Upload a new avatar image for the current user; thumbnails are rendered in the background"""
     if 'avatar' not in request.FILES:
         return Response({'error': 'No avatar file provided'}, status=status.HTTP_400_BAD_REQUEST)
     
     # Get the uploaded file
     avatar_file = request.FILES['avatar']
     
-    # Validate file type
-    allowed_types = ['image/jpeg', 'image/png', 'image/gif']
-    if avatar_file.content_type not in allowed_types:
+    # Validate file type by its contents, not the client's content type
+    image_type = sniff_image_type(avatar_file)
+    if image_type is None:
         return Response(
             {'error': 'Invalid file type. Only JPEG, PNG, and GIF are allowed.'},
             status=status.HTTP_400_BAD_REQUEST
         )
     
     # Validate file size (max 5MB)
-    if avatar_file.size > 5 * 1024 * 1024:
+    if avatar_file.size > MAX_AVATAR_BYTES:
         return Response(
             {'error': 'File too large. Maximum size is 5MB.'},
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Delete old avatar if it exists
-    if request.user.avatar:
-        request.user.avatar.delete(save=False)
-    
-    # Save the new avatar
-    request.user.avatar = avatar_file
-    request.user.save()
+    # Replace the old avatar and queue its thumbnails
+    replace_avatar(request.user, avatar_file, image_type)
     
     return Response({
         'message': 'Avatar uploaded successfully',
-        'avatar_url': request.user.avatar.url
+        'avatar_url': request.user.avatar.url,
+        'thumbnails': 'processing'
     })
 
+@query_budget(12)
 @api_view(['DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def delete_avatar(request):
-    """Delete current user's avatar"""
+    """Delete current user's avatar and its thumbnails"""
     if request.user.avatar:
-        request.user.avatar.delete()
-        request.user.save()
+        clear_avatar(request.user)
         return Response({'message': 'Avatar deleted successfully'})
     return Response({'error': 'No avatar to delete'}, status=status.HTTP_400_BAD_REQUEST)
 
-class UserListView(generics.ListAPIView):
+class UserListView(ProjectedListMixin, generics.ListAPIView):
     """List all users with search functionality"""
     serializer_class = UserListSerializer
+    projection = user_list_projection
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 8
     
     def get_queryset(self):
         queryset = User.objects.exclude(id=self.request.user.id).filter(is_active=True)
         search = self.request.query_params.get('search', None)
         
         if search:
-            queryset = queryset.filter(
-                models.Q(first_name__icontains=search) |
-                models.Q(last_name__icontains=search) |
-                models.Q(bio__icontains=search) |
-                models.Q(location__icontains=search)
-            )
+            return get_search_backend().search(queryset, search)
         
         return queryset.order_by('-created_at')
 
@@ -177,3 +184,4 @@ class UserDetailView(generics.RetrieveAPIView):
     queryset = User.objects.filter(is_active=True)
     serializer_class = UserListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 6
@@ -1,11 +1,19 @@
 from django.contrib import admin
-from .models import Skill, UserSkill
+from django.db.models import Q
+from .models import Skill, SkillAlias, UserSkill
+from .signals import user_skills_updated
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'created_at')
     list_filter = ('category',)
-    search_fields = ('name',)
+    search_fields = ('name', 'normalized_name')
+
+@admin.register(SkillAlias)
+class SkillAliasAdmin(admin.ModelAdmin):
+    list_display = ('alias', 'skill', 'created_at')
+    search_fields = ('alias', 'skill__name')
+    autocomplete_fields = ('skill',)
 
 @admin.register(UserSkill)
 class UserSkillAdmin(admin.ModelAdmin):
@@ -19,16 +27,21 @@ class UserSkillAdmin(admin.ModelAdmin):
     actions = ['approve_skills', 'reject_skills']
 
     def approve_skills(self, request, queryset):
-        updated = queryset.update(status='approved', rejection_reason=None)
+        # Ids first: with a status filter active the queryset is empty after the update
+        ids = list(queryset.values_list('id', flat=True))
+        updated = UserSkill.objects.filter(id__in=ids).update(status='approved', rejection_reason=None)
+        user_skills_updated.send(sender=UserSkill, queryset=UserSkill.objects.filter(id__in=ids))
         self.message_user(request, f"{updated} skill(s) approved.")
     approve_skills.short_description = "Approve selected skills"
 
     def reject_skills(self, request, queryset):
-        for obj in queryset:
-            obj.status = 'rejected'
-            # Optionally, set a default rejection reason or prompt for input in the future
-            if not obj.rejection_reason:
-                obj.rejection_reason = 'Rejected by admin.'
-            obj.save()
-        self.message_user(request, f"{queryset.count()} skill(s) rejected.")
+        # Ids first: with a status filter active the queryset is empty after the update
+        skills = UserSkill.objects.filter(id__in=list(queryset.values_list('id', flat=True)))
+        rejected = skills.update(status='rejected')
+        # Keep any reason already given, default the rest
+        skills.filter(Q(rejection_reason__isnull=True) | Q(rejection_reason='')).update(
+            rejection_reason='Rejected by admin.'
+        )
+        user_skills_updated.send(sender=UserSkill, queryset=skills)
+        self.message_user(request, f"{rejected} skill(s) rejected.")
     reject_skills.short_description = "Reject selected skills (default reason: 'Rejected by admin.')"
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class SkillsConfig(AppConfig):
+    name = 'skills'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,59 @@
+"""
+In-memory autocomplete over canonical skill names and their aliases.
+
+Terms are normalized with ``normalize_skill_name``. Prefix matches come
+from a sorted term list via ``bisect``; anything else is ranked by trigram
+similarity, so typos and partial words ("pyhton", "learn") still find a
+skill. The index is rebuilt with the catalogue snapshot.
+"""
+from bisect import bisect_left
+from collections import Counter
+
+from .canonical import normalize_skill_name
+
+MIN_SIMILARITY = 0.3
+
+
+def trigrams(term):
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AutocompleteIndex:
+    def __init__(self, skills, terms):
+        """``skills`` are ``{id, name, category}`` rows, ``terms`` normalized ``(term, skill_id)`` pairs"""
+        self.skills = {skill['id']: skill for skill in skills}
+        self._terms = sorted({(term, skill_id) for term, skill_id in terms if skill_id in self.skills})
+        self._keys = [term for term, _ in self._terms]
+        self._gram_counts = []
+        self._postings = {}
+        for position, (term, _) in enumerate(self._terms):
+            grams = trigrams(term)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+
+    def search(self, query, limit=10):
+        """Best matching catalogue rows, prefix matches first, then by similarity"""
+        query = normalize_skill_name(query)
+        if not query:
+            return []
+        scores = {}
+
+        start = bisect_left(self._keys, query)
+        for term, skill_id in self._terms[start:]:
+            if not term.startswith(query):
+                break
+            # Shorter completions first among prefix matches
+            scores[skill_id] = max(scores.get(skill_id, 0), 2 - len(term) / 1000)
+
+        grams = trigrams(query)
+        shared = Counter(position for gram in grams for position in self._postings.get(gram, ()))
+        for position, count in shared.items():
+            similarity = count / (len(grams) + self._gram_counts[position] - count)
+            if similarity >= MIN_SIMILARITY:
+                skill_id = self._terms[position][1]
+                scores[skill_id] = max(scores.get(skill_id, 0), similarity)
+
+        ranked = sorted(scores, key=lambda skill_id: (-scores[skill_id], self.skills[skill_id]['name']))
+        return [self.skills[skill_id] for skill_id in ranked[:limit]]
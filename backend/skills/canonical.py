@@ -0,0 +1,156 @@
+"""
+Skill name canonicalization.
+
+``normalize_skill_name`` maps the ways people type a skill ("React ",
+"react", "REACT") to one key that is stored on ``Skill.normalized_name``.
+Spellings that differ by more than case and punctuation ("ReactJS") are
+recorded as ``SkillAlias`` rows pointing at the canonical skill.
+``find_skill`` checks both; ``resolve_skill`` creates a new ``Skill`` when
+neither matches.
+"""
+import re
+import unicodedata
+
+# Characters that carry meaning in skill names: C++, C#, .NET, Node.js
+KEPT_SYMBOLS = '+#.'
+SEPARATORS = re.compile(r'[\s\-_/,;:|&]+')
+DROPPED = re.compile(rf'[^\w\s{re.escape(KEPT_SYMBOLS)}]')
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_skill_name(name):
+    """Case-folded key with separators collapsed to single spaces and stray punctuation dropped"""
+    name = unicodedata.normalize('NFKC', name).casefold()
+    name = DROPPED.sub('', SEPARATORS.sub(' ', name))
+    return WHITESPACE.sub(' ', name).strip().rstrip('.').strip()
+
+
+def display_skill_name(name):
+    """The name as typed, trimmed with inner whitespace collapsed"""
+    return WHITESPACE.sub(' ', name).strip()
+
+
+def find_skill(name):
+    """The canonical ``Skill`` for ``name`` by alias or normalized name, or None"""
+    from .models import Skill, SkillAlias
+
+    normalized = normalize_skill_name(name)
+    alias = SkillAlias.objects.select_related('skill').filter(alias=normalized).first()
+    if alias is not None:
+        return alias.skill
+    return Skill.objects.filter(normalized_name=normalized).order_by('id').first()
+
+
+def resolve_skill(name, category='other'):
+    """Return the canonical ``Skill`` for ``name``, creating it if nothing matches"""
+    from .models import Skill
+
+    skill = find_skill(name)
+    if skill is not None:
+        return skill
+    skill, _ = Skill.objects.get_or_create(
+        name=display_skill_name(name),
+        defaults={'category': category},
+    )
+    return skill
+
+
+MERGE_CHUNK_SIZE = 500
+# Which of two clashing UserSkill rows survives a merge
+STATUS_RANK = {'approved': 0, 'pending': 1, 'rejected': 2}
+
+
+def chunked(ids, size=MERGE_CHUNK_SIZE):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def duplicate_groups():
+    """
+    Map each canonical skill id to the ids that should be merged into it.
+
+    Skills sharing a normalized name merge into the oldest of them; a skill
+    whose normalized name is an alias of another skill merges into that one.
+    """
+    from .models import Skill, SkillAlias
+
+    names = dict(Skill.objects.order_by('id').values_list('id', 'normalized_name'))
+    first_with_name = {}
+    for skill_id, normalized in names.items():
+        first_with_name.setdefault(normalized, skill_id)
+    alias_targets = {
+        alias: first_with_name[names[skill_id]]
+        for alias, skill_id in SkillAlias.objects.values_list('alias', 'skill_id')
+    }
+
+    def target_of(skill_id):
+        normalized = names[skill_id]
+        return alias_targets.get(normalized, first_with_name[normalized])
+
+    groups = {}
+    for skill_id in names:
+        # Follow alias chains (a -> b, b -> c), stopping on a cycle
+        target, seen = target_of(skill_id), {skill_id}
+        while target_of(target) != target and target not in seen:
+            seen.add(target)
+            target = target_of(target)
+        if target != skill_id:
+            groups.setdefault(target, []).append(skill_id)
+    return groups
+
+
+def merge_skills(canonical_id, duplicate_ids):
+    """
+    Fold ``duplicate_ids`` into the canonical skill and delete them.
+
+    ``UserSkill`` rows are re-pointed in bulk. Where a user now has the same
+    skill twice for one skill type, the approved (then oldest) row is kept.
+    Swap requests and aliases are re-pointed too. Returns counts of
+    ``(user skills moved, user skills dropped, swap requests re-pointed)``.
+    """
+    from swaps.models import SwapRequest
+    from .models import Skill, SkillAlias, UserSkill
+    from .signals import user_skills_updated
+
+    rows = list(UserSkill.objects.filter(skill_id__in=[canonical_id, *duplicate_ids]).values_list(
+        'id', 'user_id', 'skill_type', 'status', 'skill_id'
+    ))
+
+    def preference(row):
+        row_id, _, _, row_status, skill_id = row
+        return STATUS_RANK.get(row_status, len(STATUS_RANK)), skill_id != canonical_id, row_id
+
+    keepers = {}
+    for row in sorted(rows, key=preference):
+        keepers.setdefault((row[1], row[2]), row)
+    kept_ids = {row[0] for row in keepers.values()}
+    drop_ids = [row[0] for row in rows if row[0] not in kept_ids]
+    move_ids = [row[0] for row in keepers.values() if row[4] != canonical_id]
+
+    for ids in chunked(drop_ids):
+        UserSkill.objects.filter(id__in=ids).delete()
+    for ids in chunked(move_ids):
+        UserSkill.objects.filter(id__in=ids).update(skill_id=canonical_id)
+        user_skills_updated.send(sender=UserSkill, queryset=UserSkill.objects.filter(id__in=ids))
+
+    swaps_moved = 0
+    for ids in chunked(duplicate_ids):
+        swaps_moved += SwapRequest.objects.filter(skill_offered_id__in=ids).update(skill_offered_id=canonical_id)
+        swaps_moved += SwapRequest.objects.filter(skill_wanted_id__in=ids).update(skill_wanted_id=canonical_id)
+        SkillAlias.objects.filter(skill_id__in=ids).update(skill_id=canonical_id)
+
+    canonical = Skill.objects.get(pk=canonical_id)
+    duplicates = list(Skill.objects.filter(id__in=duplicate_ids))
+    # Keep the other spellings resolving to the merged skill
+    for duplicate in duplicates:
+        if duplicate.normalized_name != canonical.normalized_name:
+            SkillAlias.objects.get_or_create(alias=duplicate.normalized_name, defaults={'skill': canonical})
+    if canonical.category == 'other':
+        category = next((d.category for d in duplicates if d.category != 'other'), None)
+        if category:
+            canonical.category = category
+            canonical.save(update_fields=['category'])
+    for ids in chunked(duplicate_ids):
+        Skill.objects.filter(id__in=ids).delete()
+    return len(move_ids), len(drop_ids), swaps_moved
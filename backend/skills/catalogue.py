@@ -0,0 +1,73 @@
+"""
+In-process snapshot of the skill catalogue.
+
+The catalogue is small and changes only when a new skill name appears, so
+each worker keeps the serialized list in memory and rebuilds it only when
+the catalogue version in the shared cache moves. The snapshot also carries
+the autocomplete index. ``Skill`` and ``SkillAlias`` saves and deletes
+bump that version (see ``skills.signals``), which also invalidates
+the snapshots held by every other process on their next request.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from .autocomplete import AutocompleteIndex
+from .models import Skill, SkillAlias
+
+VERSION_KEY = 'skills:catalogue:version'
+
+Snapshot = namedtuple('Snapshot', 'version skills grouped digest autocomplete')
+
+
+class SkillCatalogue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def current_version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(VERSION_KEY)
+        return version
+
+    def snapshot(self):
+        version = self.current_version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = self._build(version)
+            return self._snapshot
+
+    def invalidate(self):
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+        self._snapshot = None
+
+    @staticmethod
+    def _build(version):
+        # Same fields and order as SkillSerializer, without a serializer per row
+        rows = Skill.objects.order_by('name', 'id').values_list(
+            'id', 'name', 'category', 'description', 'normalized_name'
+        )
+        skills, terms, grouped = [], [], {}
+        for skill_id, name, category, description, normalized_name in rows:
+            skills.append({'id': skill_id, 'name': name, 'category': category, 'description': description})
+            terms.append((normalized_name, skill_id))
+            grouped.setdefault(category, []).append([skill_id, name])
+        terms += SkillAlias.objects.values_list('alias', 'skill_id')
+        autocomplete = AutocompleteIndex(
+            [{'id': skill['id'], 'name': skill['name'], 'category': skill['category']} for skill in skills],
+            terms,
+        )
+        digest = hashlib.sha256(json.dumps(skills, sort_keys=True).encode()).hexdigest()[:32]
+        return Snapshot(version, skills, grouped, digest, autocomplete)
+
+
+skill_catalogue = SkillCatalogue()
@@ -0,0 +1,14 @@
+from skillswap.exports import EXPORT_CHUNK_SIZE, full_name
+
+USER_SKILL_HEADER = [
+    'ID', 'User', 'Skill', 'Category', 'Skill Type', 'Proficiency Level', 'Status', 'Created At'
+]
+
+
+def user_skill_rows(queryset):
+    rows = queryset.values_list(
+        'id', 'user__first_name', 'user__last_name', 'skill__name', 'skill__category',
+        'skill_type', 'proficiency_level', 'status', 'created_at',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for user_skill_id, first_name, last_name, *rest in rows:
+        yield [user_skill_id, full_name(first_name, last_name), *rest]
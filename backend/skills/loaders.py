@@ -0,0 +1,37 @@
+from collections import defaultdict
+from .models import UserSkill
+
+
+def skill_names_by_user(user_ids):
+    """``{user_id: {'offered': [names], 'wanted': [names]}}`` in one query; unknown ids map to empty lists"""
+    skills_by_user = defaultdict(lambda: {'offered': [], 'wanted': []})
+    rows = (
+        UserSkill.objects
+        .filter(user_id__in=user_ids)
+        .order_by('pk')
+        .values_list('user_id', 'skill_type', 'skill__name')
+    )
+    for user_id, skill_type, skill_name in rows:
+        skills_by_user[user_id][skill_type].append(skill_name)
+    return skills_by_user
+
+
+def prefetch_user_skills(users):
+    """Attach offered/wanted skill names to every user in one query.
+
+    Each user gets a ``prefetched_skills`` dict keyed by skill type, which the
+    profile serializers read instead of querying ``UserSkill`` per user.
+    """
+    users = [u for u in users if u is not None and not hasattr(u, 'prefetched_skills')]
+    if not users:
+        return
+    skills_by_user = skill_names_by_user({u.pk for u in users})
+    for user in users:
+        user.prefetched_skills = skills_by_user[user.pk]
+
+
+def get_user_skill_names(user, skill_type):
+    """Skill names of ``skill_type`` for ``user``, loading them if needed."""
+    if not hasattr(user, 'prefetched_skills'):
+        prefetch_user_skills([user])
+    return user.prefetched_skills.get(skill_type, [])
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from skills.canonical import duplicate_groups, merge_skills
+from skills.models import Skill
+
+
+class Command(BaseCommand):
+    help = 'Merge skills whose names normalize to the same key or to an alias of another skill'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='List the merges without changing anything')
+
+    def handle(self, *args, **options):
+        groups = duplicate_groups()
+        if not groups:
+            self.stdout.write('No duplicate skills found')
+            return
+
+        names = dict(Skill.objects.values_list('id', 'name'))
+        totals = [0, 0, 0]
+        for canonical_id, duplicate_ids in groups.items():
+            merged = ', '.join(repr(names[skill_id]) for skill_id in duplicate_ids)
+            self.stdout.write(f'{names[canonical_id]!r} <- {merged}')
+            if options['dry_run']:
+                continue
+            with transaction.atomic():
+                counts = merge_skills(canonical_id, duplicate_ids)
+            totals = [total + count for total, count in zip(totals, counts)]
+
+        if options['dry_run']:
+            return
+        moved, dropped, swaps = totals
+        self.stdout.write(self.style.SUCCESS(
+            f'Merged {sum(len(ids) for ids in groups.values())} skill(s): '
+            f'{moved} user skill(s) moved, {dropped} duplicate(s) dropped, {swaps} swap request(s) re-pointed'
+        ))
@@ -0,0 +1,238 @@
+"""
+In-process skill match index.
+
+Keeps an inverted index from skill to the users who offer or want it, built
+from approved ``UserSkill`` rows. Writes are applied to the index of the
+process that made them, once they commit, by the signal handlers in
+``skills.signals`` and by the bulk paths, which call ``sync_users``,
+``sync_user_skills`` or ``invalidate`` themselves.
+
+Every write also moves a version stamp in the shared cache, and each read
+compares it with the version the index was built at. A process whose index
+missed a write, because another worker made it or a bulk path only
+invalidated, rebuilds on its next read. A process that applied the write
+itself keeps its index, as long as nobody else wrote in between. Across
+workers this needs a shared ``CACHES`` backend; the local-memory default
+only covers the threads of one process.
+"""
+import heapq
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import UserSkill
+
+VERSION_KEY = 'skills:matches:version'
+# User fields the index reads; saves touching none of them leave it alone
+PROFILE_COLUMNS = ('rating', 'availability', 'experience_level', 'is_active', 'is_banned')
+PROFILE_FIELDS = frozenset(PROFILE_COLUMNS)
+
+# Score multipliers applied on top of the raw skill overlap
+RECIPROCAL_BONUS = 2.0
+RATING_WEIGHT = 0.5
+AVAILABILITY_WEIGHT = 0.25
+EXPERIENCE_WEIGHTS = {
+    'beginner': 0.0,
+    'intermediate': 0.1,
+    'advanced': 0.2,
+    'expert': 0.3,
+}
+
+
+class MatchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        # The shared version the index was built at; None until it is built
+        self._version = None
+        self._rows = {}
+        self._offered_by = defaultdict(set)
+        self._wanted_by = defaultdict(set)
+        self._user_offered = defaultdict(set)
+        self._user_wanted = defaultdict(set)
+        self._profiles = {}
+
+    # Building and incremental maintenance
+
+    @staticmethod
+    def current_version():
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(VERSION_KEY)
+        return version
+
+    def ensure_built(self):
+        # Read before the rows, so a write landing mid-build moves it again
+        version = self.current_version()
+        if self._version == version:
+            return
+        with self._lock:
+            if self._version == version:
+                return
+            self._clear()
+            User = get_user_model()
+            rows = UserSkill.objects.filter(status='approved').values_list(
+                'id', 'user_id', 'skill_id', 'skill_type'
+            )
+            for row_id, user_id, skill_id, skill_type in rows.iterator():
+                self._add_row(row_id, user_id, skill_id, skill_type)
+            profiles = User.objects.values_list('id', *PROFILE_COLUMNS)
+            for user_id, *profile in profiles.iterator():
+                self._set_profile(user_id, *profile)
+            self._version = version
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def invalidate(self):
+        """Have every process, this one included, rebuild after writes nobody applied"""
+        transaction.on_commit(lambda: cache.set(VERSION_KEY, time.time_ns(), timeout=None))
+
+    def _apply(self, change):
+        """Run ``change`` on this index once the current transaction commits, then publish it"""
+        def apply():
+            with self._lock:
+                if self._version is not None:
+                    change()
+                try:
+                    version = cache.incr(VERSION_KEY)
+                except ValueError:
+                    # The stamp was evicted: start a new one that nobody matches
+                    cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+                    return
+                # Keep the index only if this write is the one thing it missed
+                if self._version is not None and self._version == version - 1:
+                    self._version = version
+        transaction.on_commit(apply)
+
+    def sync_user_skill(self, row_id, user_id, skill_id, skill_type, status):
+        """Apply a created or updated ``UserSkill`` row to the index"""
+        self._apply(lambda: self._sync_row(row_id, user_id, skill_id, skill_type, status))
+
+    def remove_user_skill(self, row_id):
+        self._apply(lambda: self._remove_row(row_id))
+
+    def sync_user_skills(self, queryset):
+        """Re-read rows touched by a bulk ``update()``, which sends no signals"""
+        def change():
+            rows = queryset.values_list('id', 'user_id', 'skill_id', 'skill_type', 'status')
+            for row in rows.iterator():
+                self._sync_row(*row)
+        self._apply(change)
+
+    def sync_user(self, user):
+        profile = (
+            user.pk, user.rating, user.availability, user.experience_level, user.is_active, user.is_banned,
+        )
+        self._apply(lambda: self._set_profile(*profile))
+
+    def sync_users(self, queryset):
+        """Re-read the profiles of users changed by a bulk ``update()``"""
+        def change():
+            profiles = queryset.values_list('id', *PROFILE_COLUMNS)
+            for profile in profiles.iterator():
+                self._set_profile(*profile)
+        self._apply(change)
+
+    def remove_user(self, user_id):
+        self._apply(lambda: self._profiles.pop(user_id, None))
+
+    def _sync_row(self, row_id, user_id, skill_id, skill_type, status):
+        self._remove_row(row_id)
+        if status == 'approved':
+            self._add_row(row_id, user_id, skill_id, skill_type)
+
+    def _add_row(self, row_id, user_id, skill_id, skill_type):
+        self._rows[row_id] = (user_id, skill_id, skill_type)
+        if skill_type == 'offered':
+            self._offered_by[skill_id].add(user_id)
+            self._user_offered[user_id].add(skill_id)
+        else:
+            self._wanted_by[skill_id].add(user_id)
+            self._user_wanted[user_id].add(skill_id)
+
+    def _remove_row(self, row_id):
+        entry = self._rows.pop(row_id, None)
+        if entry is None:
+            return
+        user_id, skill_id, skill_type = entry
+        if skill_type == 'offered':
+            self._offered_by[skill_id].discard(user_id)
+            self._user_offered[user_id].discard(skill_id)
+        else:
+            self._wanted_by[skill_id].discard(user_id)
+            self._user_wanted[user_id].discard(skill_id)
+
+    def _set_profile(self, user_id, rating, availability, experience_level, is_active, is_banned):
+        # Everything but the availability term is independent of the viewer,
+        # so the boost is folded in here rather than on every query
+        boost = 1 + RATING_WEIGHT * float(rating or 0) / 5 + EXPERIENCE_WEIGHTS.get(experience_level, 0.0)
+        self._profiles[user_id] = (boost, availability, is_active and not is_banned)
+
+    # Querying
+
+    def offered_by(self, skill_id):
+        self.ensure_built()
+        return frozenset(self._offered_by.get(skill_id, ()))
+
+    def wanted_by(self, skill_id):
+        self.ensure_built()
+        return frozenset(self._wanted_by.get(skill_id, ()))
+
+    def top_matches(self, user_id, limit=10):
+        """
+        Rank users who offer a skill ``user_id`` wants.
+
+        Returns ``(score, candidate_id, teaches, learns)`` tuples, best first,
+        where ``teaches`` are skill ids the candidate can teach and ``learns``
+        are skill ids the candidate wants from ``user_id``.
+        """
+        self.ensure_built()
+        with self._lock:
+            wanted = self._user_wanted.get(user_id, set())
+            offered = self._user_offered.get(user_id, set())
+            teach_counts = Counter()
+            for skill_id in wanted:
+                teach_counts.update(self._offered_by.get(skill_id, ()))
+            learn_counts = Counter()
+            for skill_id in offered:
+                learn_counts.update(self._wanted_by.get(skill_id, ()))
+            own_availability = self._profiles.get(user_id, (0, '', False))[1]
+
+            profiles = self._profiles
+            scored = []
+            for candidate, teach_count in teach_counts.items():
+                profile = profiles.get(candidate)
+                if profile is None or not profile[2] or candidate == user_id:
+                    continue
+                boost, availability, _ = profile
+                if availability and (
+                    availability == own_availability or 'flexible' in (availability, own_availability)
+                ):
+                    boost += AVAILABILITY_WEIGHT
+                learn_count = learn_counts.get(candidate, 0)
+                score = teach_count + learn_count
+                if learn_count:
+                    score *= RECIPROCAL_BONUS
+                scored.append((round(score * boost, 4), -candidate))
+            best = heapq.nlargest(limit, scored)
+
+            return [
+                (
+                    score, -negated_id,
+                    sorted(wanted & self._user_offered[-negated_id]),
+                    sorted(offered & self._user_wanted[-negated_id]),
+                )
+                for score, negated_id in best
+            ]
+
+
+match_index = MatchIndex()
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0002_userskill_rejection_reason_userskill_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userskill',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='userskill_moderation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userskill',
+            index=models.Index(fields=['-created_at', '-id'], name='userskill_created_keyset_idx'),
+        ),
+    ]
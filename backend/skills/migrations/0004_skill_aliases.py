@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:55
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# A frozen copy of skills.canonical.normalize_skill_name as of this migration,
+# so later changes to that module can't alter what this migration writes
+SEPARATORS = re.compile(r'[\s\-_/,;:|&]+')
+DROPPED = re.compile(r'[^\w\s\+\#\.]')
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_skill_name(name):
+    name = unicodedata.normalize('NFKC', name).casefold()
+    name = DROPPED.sub('', SEPARATORS.sub(' ', name))
+    return WHITESPACE.sub(' ', name).strip().rstrip('.').strip()
+
+
+def fill_normalized_names(apps, schema_editor):
+    Skill = apps.get_model('skills', 'Skill')
+    skills = list(Skill.objects.only('id', 'name'))
+    for skill in skills:
+        skill.normalized_name = normalize_skill_name(skill.name)
+    Skill.objects.bulk_update(skills, ['normalized_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='normalized_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='skills.skill')),
+            ],
+            options={
+                'verbose_name_plural': 'skill aliases',
+                'ordering': ['alias'],
+            },
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+    ]
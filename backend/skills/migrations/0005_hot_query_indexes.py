@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('skills', '0004_skill_aliases'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userskill',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='userskill',
+            index=models.Index(fields=['user', 'skill_type', 'status'], name='userskill_owner_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from .canonical import normalize_skill_name
 
 class Skill(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -13,21 +14,48 @@ class Skill(models.Model):
         ('other', 'Other'),
     ])
     description = models.TextField(blank=True)
+    # Lookup key from normalize_skill_name, kept in sync on save
+    normalized_name = models.CharField(max_length=100, db_index=True, editable=False, default='')
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_skill_name(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_name'}
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['name']
 
+class SkillAlias(models.Model):
+    """Another spelling of a skill, stored normalized (e.g. "reactjs" -> React)"""
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+    def save(self, *args, **kwargs):
+        self.alias = normalize_skill_name(self.alias)
+        super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ['alias']
+        verbose_name_plural = 'skill aliases'
+
 class UserSkill(models.Model):
     SKILL_TYPE_CHOICES = [
         ('offered', 'Offered'),
         ('wanted', 'Wanted'),
     ]
     
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Leading column of unique_together and userskill_owner_idx, so no index of its own
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
     skill_type = models.CharField(max_length=10, choices=SKILL_TYPE_CHOICES)
     proficiency_level = models.CharField(max_length=20, choices=[
@@ -49,6 +77,11 @@ class UserSkill(models.Model):
 
     class Meta:
         unique_together = ['user', 'skill', 'skill_type']
+        indexes = [
+            models.Index(fields=['status', '-created_at', '-id'], name='userskill_moderation_idx'),
+            models.Index(fields=['-created_at', '-id'], name='userskill_created_keyset_idx'),
+            models.Index(fields=['user', 'skill_type', 'status'], name='userskill_owner_idx'),
+        ]
         
     def __str__(self):
         return f"{self.user.full_name} - {self.skill.name} ({self.skill_type})"
@@ -0,0 +1,6 @@
+"""Projection of ``SkillSerializer`` for catalogue pages read from the database"""
+from skillswap.projections import Projection
+
+from .serializers import SkillSerializer
+
+skill_projection = Projection(SkillSerializer)
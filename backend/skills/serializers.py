@@ -1,4 +1,6 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from .canonical import find_skill, normalize_skill_name, resolve_skill
 from .models import Skill, UserSkill
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -20,13 +22,33 @@ class UserSkillCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserSkill
         fields = ['skill_name', 'skill_type', 'proficiency_level']
+
+    def validate_skill_name(self, value):
+        if not normalize_skill_name(value):
+            raise serializers.ValidationError('Enter a skill name.')
+        return value
     
+    def validate(self, attrs):
+        # Different spellings resolve to one canonical skill, so check the
+        # (user, skill, skill_type) constraint after resolving the name
+        skill = find_skill(attrs['skill_name'])
+        if skill is not None and UserSkill.objects.filter(
+            user=self.context['request'].user, skill=skill, skill_type=attrs['skill_type'],
+        ).exists():
+            raise serializers.ValidationError(
+                {'skill_name': f'You already have {skill.name} in your {attrs["skill_type"]} skills.'}
+            )
+        attrs['skill'] = skill
+        return attrs
+
     def create(self, validated_data):
         skill_name = validated_data.pop('skill_name')
-        skill, created = Skill.objects.get_or_create(
-            name=skill_name,
-            defaults={'category': 'other'}
-        )
-        validated_data['skill'] = skill
+        if validated_data['skill'] is None:
+            validated_data['skill'] = resolve_skill(skill_name)
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            # Another request added the same skill since validate()
+            raise serializers.ValidationError({'skill_name': 'You already have this skill.'})
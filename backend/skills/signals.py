@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver, Signal
+
+from .catalogue import skill_catalogue
+from .matching import PROFILE_FIELDS, match_index
+from .models import Skill, SkillAlias, UserSkill
+
+# Sent with ``queryset`` after a bulk ``update()`` of UserSkill rows, which
+# bypasses post_save
+user_skills_updated = Signal()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def invalidate_catalogue(sender, **kwargs):
+    # After commit, so no worker rebuilds its snapshot from a rolled-back row
+    transaction.on_commit(skill_catalogue.invalidate)
+
+
+@receiver(post_save, sender=UserSkill)
+def index_user_skill(sender, instance, **kwargs):
+    match_index.sync_user_skill(
+        instance.pk, instance.user_id, instance.skill_id, instance.skill_type, instance.status
+    )
+
+
+@receiver(post_delete, sender=UserSkill)
+def unindex_user_skill(sender, instance, **kwargs):
+    match_index.remove_user_skill(instance.pk)
+
+
+@receiver(user_skills_updated)
+def reindex_user_skills(sender, queryset, **kwargs):
+    match_index.sync_user_skills(queryset)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def index_user_profile(sender, instance, update_fields=None, **kwargs):
+    # Logins save last_login alone; skip saves that leave the index unchanged
+    if update_fields is not None and not PROFILE_FIELDS.intersection(update_fields):
+        return
+    match_index.sync_user(instance)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def unindex_user_profile(sender, instance, **kwargs):
+    match_index.remove_user(instance.pk)
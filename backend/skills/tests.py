@@ -0,0 +1,192 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.models import User
+from skillswap.testing import CraftedCursorMixin
+
+from .matching import MatchIndex, match_index
+from .models import Skill, SkillAlias, UserSkill
+
+
+class SkillListCursorTests(CraftedCursorMixin, TestCase):
+    CURSOR_LISTS = ['/api/skills/']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='reader@example.com', username='reader', password='password123')
+        for index in range(3):
+            Skill.objects.create(name=f'Skill {index}', category='other')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+
+class UserSkillCreateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='learner@example.com', username='learner', password='password123',
+        )
+        cls.react = Skill.objects.create(name='React', category='programming')
+        SkillAlias.objects.create(alias='reactjs', skill=cls.react)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def add(self, skill_name, skill_type='offered'):
+        return self.client.post('/api/skills/user-skills/', {
+            'skill_name': skill_name, 'skill_type': skill_type, 'proficiency_level': 'beginner',
+        })
+
+    def test_spellings_of_a_skill_the_user_has_are_rejected(self):
+        self.assertEqual(self.add('React').status_code, 201)
+        for spelling in ['react ', 'REACT', 'ReactJS']:
+            with self.subTest(spelling=spelling):
+                response = self.add(spelling)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('skill_name', response.json())
+        self.assertEqual(UserSkill.objects.filter(user=self.user).count(), 1)
+
+    def test_same_skill_can_be_offered_and_wanted(self):
+        self.assertEqual(self.add('react', 'offered').status_code, 201)
+        self.assertEqual(self.add('ReactJS', 'wanted').status_code, 201)
+        self.assertEqual(set(UserSkill.objects.filter(user=self.user).values_list('skill', flat=True)), {self.react.pk})
+
+    def test_new_spelling_creates_a_skill(self):
+        self.assertEqual(self.add('Rust').status_code, 201)
+        self.assertTrue(Skill.objects.filter(normalized_name='rust').exists())
+
+
+class UserSkillAdminActionTests(TestCase):
+    CHANGELIST = '/admin/skills/userskill/?status__exact=pending'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email='root@example.com', username='root', password='password123')
+        cls.user = User.objects.create_user(email='learner@example.com', username='learner', password='password123')
+        cls.skills = [Skill.objects.create(name=name, category='other') for name in ('Go', 'Elm')]
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.user_skills = [
+            UserSkill.objects.create(user=self.user, skill=skill, skill_type='offered', status='pending')
+            for skill in self.skills
+        ]
+        self.user_skills[1].rejection_reason = 'Too vague.'
+        self.user_skills[1].save()
+
+    def run_action(self, action):
+        response = self.client.post(self.CHANGELIST, {
+            'action': action, '_selected_action': [user_skill.pk for user_skill in self.user_skills],
+        })
+        self.assertEqual(response.status_code, 302)
+
+    def test_reject_from_filtered_changelist_defaults_the_reason(self):
+        self.run_action('reject_skills')
+        self.assertEqual(
+            list(UserSkill.objects.order_by('id').values_list('status', 'rejection_reason')),
+            [('rejected', 'Rejected by admin.'), ('rejected', 'Too vague.')],
+        )
+
+
+class SkillMatchTests(TestCase):
+    """The matches endpoint follows UserSkill changes made through every write path"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email='root@example.com', username='root', password='password123')
+        cls.go, cls.elm = Skill.objects.create(name='Go', category='other'), Skill.objects.create(name='Elm', category='other')
+        cls.learner = User.objects.create_user(email='learner@example.com', username='learner', password='password123')
+        cls.mentor = User.objects.create_user(email='mentor@example.com', username='mentor', password='password123')
+        cls.tutor = User.objects.create_user(email='tutor@example.com', username='tutor', password='password123')
+        UserSkill.objects.create(user=cls.learner, skill=cls.go, skill_type='wanted', status='approved')
+        UserSkill.objects.create(user=cls.learner, skill=cls.elm, skill_type='offered', status='approved')
+        UserSkill.objects.create(user=cls.mentor, skill=cls.elm, skill_type='wanted', status='approved')
+        UserSkill.objects.create(user=cls.tutor, skill=cls.go, skill_type='offered', status='approved')
+
+    def setUp(self):
+        # The index is process-wide and TestCase never commits, so start
+        # every test from a fresh build
+        cache.clear()
+        match_index.reset()
+        self.mentor_go = UserSkill.objects.create(
+            user=self.mentor, skill=self.go, skill_type='offered', status='pending',
+        )
+        self.client.force_login(self.learner)
+        self.assertEqual(self.matches(), [(self.tutor.pk, ['Go'], [])])
+
+    def matches(self):
+        response = self.client.get('/api/skills/matches/')
+        self.assertEqual(response.status_code, 200)
+        return [(match['user']['id'], match['can_teach'], match['wants_to_learn']) for match in response.json()]
+
+    def assert_mentor_matched(self, matched):
+        tutor = (self.tutor.pk, ['Go'], [])
+        expected = [(self.mentor.pk, ['Go'], ['Elm']), tutor] if matched else [tutor]
+        self.assertEqual(self.matches(), expected)
+
+    def as_admin(self, method, path, data):
+        self.client.force_login(self.admin)
+        try:
+            return getattr(self.client, method)(path, data, content_type='application/json')
+        finally:
+            self.client.force_login(self.learner)
+
+    def test_reciprocal_match_ranks_first(self):
+        self.mentor_go.status = 'approved'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mentor_go.save()
+        response = self.client.get('/api/skills/matches/').json()
+        self.assertEqual([match['user']['id'] for match in response], [self.mentor.pk, self.tutor.pk])
+        self.assertGreater(response[0]['score'], 2 * response[1]['score'])
+
+    def test_orm_save_and_delete(self):
+        self.mentor_go.status = 'approved'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mentor_go.save()
+        self.assert_mentor_matched(True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mentor_go.delete()
+        self.assert_mentor_matched(False)
+
+    def test_admin_actions_from_a_status_filtered_changelist(self):
+        for action, changelist, matched in [
+            ('approve_skills', '/admin/skills/userskill/?status__exact=pending', True),
+            ('reject_skills', '/admin/skills/userskill/?status__exact=approved', False),
+        ]:
+            with self.subTest(action=action):
+                self.client.force_login(self.admin)
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post(changelist, {'action': action, '_selected_action': [self.mentor_go.pk]})
+                self.assertEqual(response.status_code, 302)
+                self.client.force_login(self.learner)
+                self.assert_mentor_matched(matched)
+
+    def test_admin_api_bulk_moderation(self):
+        for path, matched in [
+            ('/api/auth/admin/user-skills/bulk-approve/', True),
+            ('/api/auth/admin/user-skills/bulk-reject/', False),
+        ]:
+            with self.subTest(path=path):
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.as_admin('post', path, {'ids': [self.mentor_go.pk]})
+                self.assertEqual(response.status_code, 200)
+                self.assert_mentor_matched(matched)
+
+    def test_admin_api_bulk_ban(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSkill.objects.filter(pk=self.mentor_go.pk).update(status='approved')
+            match_index.invalidate()
+        self.assert_mentor_matched(True)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.as_admin('post', '/api/auth/admin/users/bulk-ban/', {'ids': [self.mentor.pk]})
+        self.assertEqual(response.status_code, 200)
+        self.assert_mentor_matched(False)
+
+    def test_other_process_rebuilds_after_a_write(self):
+        other = MatchIndex()
+        self.assertEqual([match[1] for match in other.top_matches(self.learner.pk)], [self.tutor.pk])
+        self.mentor_go.status = 'approved'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mentor_go.save()
+        self.assertEqual([match[1] for match in other.top_matches(self.learner.pk)], [self.mentor.pk, self.tutor.pk])
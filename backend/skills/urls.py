@@ -3,6 +3,8 @@ from . import views
 
 urlpatterns = [
     path('', views.SkillListView.as_view(), name='skill_list'),
+    path('matches/', views.skill_matches, name='skill_matches'),
+    path('autocomplete/', views.skill_autocomplete, name='skill_autocomplete'),
     path('user-skills/', views.UserSkillListView.as_view(), name='user_skills'),
     path('user-skills/<int:pk>/delete/', views.delete_user_skill, name='delete_user_skill'),
     path('user-skills/<str:skill_type>/', views.user_skills_by_type, name='user_skills_by_type'),
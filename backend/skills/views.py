@@ -1,20 +1,88 @@
+import hashlib
+import logging
+
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.contrib.auth import get_user_model
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from accounts.serializers import UserListSerializer
+from skillswap.projections import ProjectedListMixin
+from skillswap.query_budget import query_budget
+from skillswap.request_logging import log_payload
+from .catalogue import skill_catalogue
+from .matching import match_index
 from .models import Skill, UserSkill
+from .projections import skill_projection
 from .serializers import SkillSerializer, UserSkillSerializer, UserSkillCreateSerializer
 
-class SkillListView(generics.ListAPIView):
+logger = logging.getLogger(__name__)
+
+MAX_MATCHES = 50
+MAX_AUTOCOMPLETE = 20
+
+class SkillListView(ProjectedListMixin, generics.ListAPIView):
+    """
+    The skill catalogue, served from the in-process snapshot.
+
+    Responses carry a strong ETag so clients can revalidate with
+    If-None-Match and get a 304. ``?compact=1`` returns the whole catalogue
+    unpaginated as ``{category: [[id, name], ...]}``.
+    """
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
+    projection = skill_projection
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ('name', 'id')
+    query_budget = 6
+
+    def get_queryset(self):
+        # Cursor pages seek in the database; page numbers slice the snapshot
+        if self.wants_cursor():
+            return super().get_queryset()
+        return self.catalogue.skills
+
+    def wants_cursor(self):
+        return self.paginator.cursor_query_param in self.request.query_params
+
+    def list(self, request, *args, **kwargs):
+        self.catalogue = skill_catalogue.snapshot()
+        if self.wants_cursor():
+            return super().list(request, *args, **kwargs)
+
+        etag = catalogue_etag(self.catalogue, request.build_absolute_uri())
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        elif request.query_params.get('compact') in ('1', 'true'):
+            response = Response({'categories': self.catalogue.grouped})
+        else:
+            page = self.paginate_queryset(self.get_queryset())
+            response = self.get_paginated_response(page) if page is not None else Response(self.catalogue.skills)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+def catalogue_etag(catalogue, url):
+    # Pages and the compact form are different representations, so each URL
+    # gets its own validator derived from the catalogue digest
+    return '"%s"' % hashlib.sha256(f'{catalogue.digest}:{url}'.encode()).hexdigest()[:32]
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    # If-None-Match uses the weak comparison
+    return '*' in etags or any(candidate.removeprefix('W/') == etag for candidate in etags)
 
 class UserSkillListView(generics.ListCreateAPIView):
     serializer_class = UserSkillSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'GET': 5, 'POST': 18}
     
     def get_queryset(self):
-        qs = UserSkill.objects.filter(user=self.request.user)
+        qs = UserSkill.objects.filter(user=self.request.user).select_related('skill')
         if not getattr(self.request.user, 'is_admin', False):
             qs = qs.filter(status='approved')
         return qs
@@ -26,12 +94,11 @@ class UserSkillListView(generics.ListCreateAPIView):
     
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        print(f"UserSkillListView - User: {request.user.full_name}")
-        print(f"UserSkillListView - Skills found: {len(serializer.data)}")
-        print(f"UserSkillListView - Data: {serializer.data}")
-        return Response(serializer.data)
+        data = self.get_serializer(queryset, many=True).data
+        log_payload(logger, 'User skills listed', lambda: data, count=len(data))
+        return Response(data)
 
+@query_budget(14)
 @api_view(['DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def delete_user_skill(request, pk):
@@ -42,14 +109,59 @@ def delete_user_skill(request, pk):
     except UserSkill.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def user_skills_by_type(request, skill_type):
     if skill_type not in ['offered', 'wanted']:
         return Response({'error': 'Invalid skill type'}, status=status.HTTP_400_BAD_REQUEST)
     
-    skills = UserSkill.objects.filter(user=request.user, skill_type=skill_type)
+    skills = UserSkill.objects.filter(user=request.user, skill_type=skill_type).select_related('skill')
     if not getattr(request.user, 'is_admin', False):
         skills = skills.filter(status='approved')
     serializer = UserSkillSerializer(skills, many=True)
     return Response(serializer.data)
+
+@query_budget(10)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def skill_matches(request):
+    """Users who offer skills the current user wants, best reciprocal matches first"""
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), MAX_MATCHES)
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+
+    matches = match_index.top_matches(request.user.id, limit)
+    users = get_user_model().objects.filter(
+        id__in=[candidate for _, candidate, _, _ in matches],
+        is_active=True,
+        is_banned=False,
+    )
+    profiles = {u['id']: u for u in UserListSerializer(users, many=True).data}
+    skill_ids = {skill_id for _, _, taught, learned in matches for skill_id in taught + learned}
+    skill_names = dict(Skill.objects.filter(id__in=skill_ids).values_list('id', 'name'))
+
+    results = [
+        {
+            'user': profiles[candidate],
+            'score': score,
+            'can_teach': sorted(skill_names[skill_id] for skill_id in taught),
+            'wants_to_learn': sorted(skill_names[skill_id] for skill_id in learned),
+        }
+        for score, candidate, taught, learned in matches
+        if candidate in profiles
+    ]
+    return Response(results)
+
+@query_budget(3)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def skill_autocomplete(request):
+    """Catalogue skills matching ``q`` by prefix, alias or trigram similarity"""
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), MAX_AUTOCOMPLETE)
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    query = request.query_params.get('q', '')
+    return Response(skill_catalogue.snapshot().autocomplete.search(query, limit))
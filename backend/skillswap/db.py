@@ -0,0 +1,25 @@
+"""
+Per-connection database tuning.
+
+Django opens SQLite with the library defaults: a rollback journal, where a
+writer blocks every reader, and full fsyncs on each commit. The
+``connection_created`` receiver below applies ``settings.SQLITE_PRAGMAS`` so
+concurrent workers share the file without ``database is locked`` errors.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor, getattr(settings, 'SQLITE_PRAGMAS', {}))
+
+
+connection_created.connect(configure_sqlite, dispatch_uid='skillswap.db.configure_sqlite')
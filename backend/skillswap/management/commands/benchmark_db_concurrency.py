@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from skillswap.db import apply_sqlite_pragmas
+
+SESSION_ROWS = 1_000
+# Python's sqlite3 default, which Django used before SQLITE_BUSY_TIMEOUT
+DEFAULT_TIMEOUT = 5.0
+
+
+def worker(path, tuned, timeout, duration, write_ratio, seed, results):
+    """One 'server process': read a session, then update it on a share of requests"""
+    import random
+    rng = random.Random(seed)
+    db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    if tuned:
+        apply_sqlite_pragmas(db, settings.SQLITE_PRAGMAS)
+    latencies, locked = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        key = f'session-{rng.randrange(SESSION_ROWS)}'
+        start = time.perf_counter()
+        try:
+            db.execute('SELECT session_data FROM django_session WHERE session_key = ?', [key]).fetchone()
+            if rng.random() < write_ratio:
+                db.execute(
+                    'UPDATE django_session SET session_data = ?, expire_date = ? WHERE session_key = ?',
+                    ['x' * 200, time.time() + 86400, key],
+                )
+        except sqlite3.OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+            locked += 1
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    db.close()
+    results.put((latencies, locked))
+
+
+class Command(BaseCommand):
+    help = 'Measure SQLite lock contention between worker processes with default and tuned connection settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile')
+        parser.add_argument('--write-ratio', type=float, default=1.0,
+                            help='Share of requests that also write (1.0 = a session save on every request)')
+        parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                            help='Busy timeout in seconds for the default profile')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'profile':<9} {'requests/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'locked':>7}"
+        )
+        for label, tuned in (('default', False), ('tuned', True)):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'bench.sqlite3')
+                self.build_database(path)
+                timeout = settings.SQLITE_PRAGMAS['busy_timeout'] / 1000 if tuned else options['timeout']
+                latencies, locked = self.run(path, tuned, timeout, options)
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+            self.stdout.write(
+                f'{label:<9} {len(latencies) / options["duration"]:>10.0f} '
+                f'{statistics.median(latencies) if latencies else 0:>8.2f} {p99:>8.2f} '
+                f'{latencies[-1] if latencies else 0:>8.1f} {locked:>7}'
+            )
+
+    @staticmethod
+    def build_database(path):
+        db = sqlite3.connect(path)
+        db.execute(
+            'CREATE TABLE django_session (session_key TEXT PRIMARY KEY, session_data TEXT, expire_date REAL)'
+        )
+        db.executemany(
+            'INSERT INTO django_session VALUES (?, ?, ?)',
+            [(f'session-{i}', 'x' * 200, time.time()) for i in range(SESSION_ROWS)],
+        )
+        db.commit()
+        db.close()
+
+    @staticmethod
+    def run(path, tuned, timeout, options):
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(
+                path, tuned, timeout, options['duration'], options['write_ratio'], seed, results,
+            ))
+            for seed in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        latencies, locked = [], 0
+        for _ in processes:
+            worker_latencies, worker_locked = results.get()
+            latencies += worker_latencies
+            locked += worker_locked
+        for process in processes:
+            process.join()
+        return latencies, locked
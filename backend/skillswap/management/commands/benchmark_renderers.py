@@ -0,0 +1,137 @@
+import datetime
+import io
+import statistics
+import time
+import uuid
+import zoneinfo
+from decimal import Decimal
+from urllib.parse import parse_qs, urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.admin_api import admin_list_swaps
+from accounts.models import User
+from skillswap.parsers import FastJSONParser
+from skillswap.renderers import FastJSONRenderer, orjson
+from swaps.models import SwapRequest
+from swaps.projections import swap_request_projection
+
+UTC_NOW = datetime.datetime(2024, 5, 17, 9, 30, 12, 345678, tzinfo=datetime.timezone.utc)
+
+# Values whose JSON the two renderers must agree on byte for byte
+FIXTURES = [
+    ('decimals', lambda: {'rating': Decimal('4.50'), 'zero': Decimal('0'), 'big': Decimal('12345.678')}),
+    ('datetimes', lambda: [
+        UTC_NOW, UTC_NOW.replace(microsecond=0), UTC_NOW.replace(tzinfo=None),
+        UTC_NOW.astimezone(datetime.timezone(datetime.timedelta(hours=5, minutes=30))),
+        UTC_NOW.astimezone(zoneinfo.ZoneInfo('UTC')), UTC_NOW.astimezone(zoneinfo.ZoneInfo('America/New_York')),
+        UTC_NOW.date(), UTC_NOW.time().replace(tzinfo=None),
+    ]),
+    ('lazy strings', lambda: {'message': gettext_lazy('This field is required.'), 'items': [gettext_lazy('Invalid')]}),
+    ('unicode', lambda: {'name': 'Zoë Šimić', 'bio': '日本語 ✓ 🎸', 'separators': 'a b c', 'escapes': '"\\\n\t\x00'}),
+    ('numbers', lambda: [0, -1, 2 ** 63 - 1, 2 ** 64, 1.5, 0.1, -0.0, 123456789.123, True, False, None]),
+    ('keys', lambda: {1: 'int key', 'nested': {2: [None, {}], 'empty': []}}),
+    ('other types', lambda: {
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'tuple': (1, 'two'),
+        'generator': (n * n for n in range(3)), 'bytes': b'raw', 'delta': datetime.timedelta(hours=1, seconds=3),
+    }),
+]
+
+
+def render(renderer, data):
+    return renderer.render(data, 'application/json', {})
+
+
+def parse(parser, content):
+    return parser.parse(io.BytesIO(content), 'application/json', {})
+
+
+class Command(BaseCommand):
+    help = (
+        'Check that the orjson renderer matches DRF\'s JSONRenderer byte for byte, then time both '
+        'renderers and parsers on large admin swap list and nested swap request payloads'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[500, 5_000, 50_000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed; FastJSONRenderer is using the stdlib encoder.')
+        if not SwapRequest.objects.exists():
+            raise CommandError('No swap requests; seed the database first with generate_data.')
+        self.repeat = options['repeat']
+        self.stdlib_renderer, self.fast_renderer = JSONRenderer(), FastJSONRenderer()
+        self.stdlib_parser, self.fast_parser = JSONParser(), FastJSONParser()
+
+        failures = self.fixtures()
+        admin_rows = self.admin_swap_rows(max(options['rows']))
+        self.stdout.write(
+            f"\n{'payload':<22} {'rows':>6} {'MB':>7} {'render ms':>10} {'fast ms':>8} {'speedup':>8} "
+            f"{'parse ms':>9} {'fast ms':>8} {'speedup':>8} {'same':>5}"
+        )
+        for rows in options['rows']:
+            payload = {'next': None, 'results': admin_rows[:rows]}
+            failures += self.payload('admin_list_swaps', payload, len(payload['results']))
+        for rows in options['rows']:
+            swaps = SwapRequest.objects.order_by('-created_at', '-id')[:rows]
+            payload = swap_request_projection.build(swaps.values(*swap_request_projection.columns))
+            failures += self.payload('swap requests (nested)', payload, len(payload))
+        if failures:
+            raise CommandError(f'Rendered output differs for: {", ".join(failures)}')
+
+    def fixtures(self):
+        failures = []
+        self.stdout.write(f"{'fixture':<22} {'same':>5}")
+        for label, make in FIXTURES:
+            expected, actual = render(self.stdlib_renderer, make()), render(self.fast_renderer, make())
+            same = expected == actual and parse(self.stdlib_parser, expected) == parse(self.fast_parser, actual)
+            self.stdout.write(f'{label:<22} {str(same):>5}')
+            if not same:
+                self.stdout.write(f'  json:   {expected[:300]!r}\n  orjson: {actual[:300]!r}')
+                failures.append(label)
+        return failures
+
+    @staticmethod
+    def admin_swap_rows(count):
+        """``count`` rows of ``admin_list_swaps``, read page by page as a client would, unrendered"""
+        factory, admin = APIRequestFactory(), User(email='benchmark@example.com', is_admin=True)
+        rows, params = [], {'page_size': 500}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            while len(rows) < count:
+                request = factory.get('/api/auth/admin/swaps/', params)
+                force_authenticate(request, admin)
+                page = admin_list_swaps(request).data
+                rows += page['results']
+                if not page['next']:
+                    break
+                params['cursor'] = parse_qs(urlsplit(page['next']).query)['cursor'][0]
+        return rows[:count]
+
+    def measure(self, run):
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = run()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples), result
+
+    def payload(self, label, data, rows):
+        render_ms, expected = self.measure(lambda: render(self.stdlib_renderer, data))
+        fast_render_ms, actual = self.measure(lambda: render(self.fast_renderer, data))
+        parse_ms, parsed = self.measure(lambda: parse(self.stdlib_parser, expected))
+        fast_parse_ms, fast_parsed = self.measure(lambda: parse(self.fast_parser, expected))
+        same = expected == actual and parsed == fast_parsed
+        self.stdout.write(
+            f'{label:<22} {rows:>6} {len(expected) / 1e6:>7.2f} {render_ms:>10.1f} {fast_render_ms:>8.1f} '
+            f'{render_ms / max(fast_render_ms, 1e-9):>7.1f}x {parse_ms:>9.1f} {fast_parse_ms:>8.1f} '
+            f'{parse_ms / max(fast_parse_ms, 1e-9):>7.1f}x {str(same):>5}'
+        )
+        return [] if same else [f'{label} ({rows} rows)']
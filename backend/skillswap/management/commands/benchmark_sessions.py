@@ -0,0 +1,81 @@
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+
+from accounts.models import User
+
+PATHS = ['/api/auth/check/', '/api/auth/profile/', '/api/skills/', '/api/swaps/requests/']
+SLIDING = 'skillswap.middleware.SlidingSessionMiddleware'
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Count session writes and request latency for the session configurations, before and after'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1_000)
+        parser.add_argument('--engines', nargs='+', default=['db', 'cached_db', 'signed_cookies', 'file'],
+                            choices=list(settings.SESSION_ENGINES))
+
+    def handle(self, *args, **options):
+        every_request = [m for m in settings.MIDDLEWARE if m != SLIDING]
+        profiles = [('save every request (db)', 'db', True, every_request)]
+        profiles += [(f'write on change ({engine})', engine, False, settings.MIDDLEWARE) for engine in options['engines']]
+
+        self.stdout.write(
+            f"{'profile':<34} {'writes':>7} {'session SQL':>11} {'p50 ms':>7} {'p99 ms':>7}"
+        )
+        with tempfile.TemporaryDirectory() as session_dir:
+            for label, engine, save_every, middleware in profiles:
+                with override_settings(
+                    SESSION_ENGINE=settings.SESSION_ENGINES[engine],
+                    SESSION_SAVE_EVERY_REQUEST=save_every,
+                    SESSION_FILE_PATH=session_dir,
+                    MIDDLEWARE=middleware,
+                    ALLOWED_HOSTS=['testserver'],
+                ):
+                    writes, session_sql, latencies = self.run(options['requests'])
+                latencies.sort()
+                self.stdout.write(
+                    f'{label:<34} {writes:>7} {session_sql:>11} {statistics.median(latencies):>7.2f} '
+                    f'{latencies[int(len(latencies) * 0.99)]:>7.2f}'
+                )
+
+    def run(self, requests):
+        """Log a throwaway user in and replay read-only API traffic, all rolled back afterwards"""
+        session_sql = []
+
+        def count_session_writes(execute, sql, params, many, context):
+            if 'django_session' in sql and not sql.lstrip().upper().startswith('SELECT'):
+                session_sql.append(sql)
+            return execute(sql, params, many, context)
+
+        writes, latencies = 0, []
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email='session-bench@example.com', username='session-bench',
+                    first_name='Session', last_name='Bench', password='bench-password',
+                )
+                client = Client()
+                client.force_login(user)
+                with connection.execute_wrapper(count_session_writes):
+                    for number in range(requests):
+                        start = time.perf_counter()
+                        response = client.get(PATHS[number % len(PATHS)])
+                        latencies.append((time.perf_counter() - start) * 1000)
+                        # Every session save re-sends the session cookie
+                        writes += settings.SESSION_COOKIE_NAME in response.cookies
+                client.logout()
+                raise Rollback
+        except Rollback:
+            pass
+        return writes, len(session_sql), latencies
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+from django.test import Client, override_settings
+
+from accounts.models import User
+from skillswap.projection_check import admin_list_paths, compare_pages, first_difference, list_paths
+
+
+class Command(BaseCommand):
+    help = (
+        'Golden-output check for projected list views: request every list with FAST_SERIALIZATION '
+        'off and on, following next links, and fail if any response differs'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=3, help='Users to request the lists as')
+        parser.add_argument('--pages', type=int, default=3, help='next links followed per list')
+
+    def handle(self, *args, **options):
+        users = self.pick_users(options['users'])
+        if not users:
+            raise CommandError('No active users; seed the database first.')
+        admin = self.pick_admin()
+
+        compared, failures = 0, []
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for user in users + ([admin] if admin else []):
+                client = Client()
+                client.force_login(user)
+                for path in admin_list_paths() if user is admin else list_paths():
+                    for page, expected, actual in compare_pages(client, path, options['pages']):
+                        compared += 1
+                        if expected != actual:
+                            failures.append((user, page, expected, actual))
+
+        for user, path, expected, actual in failures:
+            self.stdout.write(self.style.ERROR(f'DIFFERS  {path} as {user.email}'))
+            location, expected, actual = first_difference(expected, actual)
+            self.stdout.write(f'  at {location}: serializer {expected!r}, projection {actual!r}')
+        if failures:
+            raise CommandError(f'{len(failures)} of {compared} responses differ from the serializers')
+        also = ' and an admin' if admin else ''
+        self.stdout.write(self.style.SUCCESS(f'{compared} responses identical for {len(users)} users{also}'))
+
+    @staticmethod
+    def pick_users(count):
+        """The users with the most swap requests, so lists have several pages"""
+        return list(
+            User.objects.filter(is_active=True, is_banned=False)
+            .annotate(requests=Count('received_requests'))
+            .order_by('-requests', 'id')[:count]
+        )
+
+    @staticmethod
+    def pick_admin():
+        """An active admin for the admin lists, if there is one"""
+        return User.objects.filter(
+            Q(is_admin=True) | Q(is_staff=True) | Q(is_superuser=True), is_active=True,
+        ).order_by('id').first()
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from skillswap.query_plans import FULL_SCAN_PATTERNS, expand, explain, full_scans, hot_queries, sorts
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot API queries and fail if any of them falls back to a full table scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every query plan')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f'Query plan checks support SQLite and PostgreSQL, not {vendor}')
+
+        failures = []
+        for label, queryset in expand(hot_queries()):
+            plan = explain(queryset)
+            scans = full_scans(plan)
+            if options['verbose_plans']:
+                self.stdout.write(f'-- {label}\n{plan}\n')
+            if scans:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f'FULL SCAN  {label}: {", ".join(scans)}'))
+            elif sorts(plan):
+                self.stdout.write(self.style.WARNING(f'SORT       {label}'))
+            else:
+                self.stdout.write(f'ok         {label}')
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot query(ies) use a full table scan')
+        self.stdout.write(self.style.SUCCESS('All hot queries use an index'))
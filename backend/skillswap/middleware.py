@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+
+REFRESHED_KEY = '_refreshed_at'
+
+
+class SlidingSessionMiddleware:
+    """
+    Keep active sessions alive without saving them on every request.
+
+    ``SessionMiddleware`` only writes a session (and re-sends its cookie with
+    a fresh expiry) when it was modified. This marks a non-empty session as
+    modified once ``SESSION_REFRESH_INTERVAL`` seconds have passed since its
+    last save, so an active user never hits the expiry but read-only
+    requests in between cost no session write. Must sit below
+    ``SessionMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', settings.SESSION_COOKIE_AGE // 10)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        session = getattr(request, 'session', None)
+        if session is None or not session.accessed or not session.keys():
+            return response
+        now = int(time.time())
+        if session.modified or now - session.get(REFRESHED_KEY, 0) >= self.interval:
+            session[REFRESHED_KEY] = now
+        return response
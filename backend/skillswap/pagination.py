@@ -0,0 +1,133 @@
+"""
+Pagination shared by the API list views.
+
+Page numbers stay the default. Passing ``?cursor=`` switches a list to
+keyset pagination, which seeks straight to the next page with a
+``WHERE (created_at, id) < (...)`` filter instead of counting every row
+and skipping ``OFFSET`` rows, so each page costs the same however deep
+the client has scrolled.
+"""
+import base64
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.backends.base.operations import BaseDatabaseOperations
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    # Views can override this with their own unique (field, tie-breaker) pair
+    keyset_ordering = ('-created_at', '-id')
+    # Use keyset pages even without a cursor in the request
+    always_keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        ordering = getattr(view, 'keyset_ordering', self.keyset_ordering)
+        wants_keyset = self.always_keyset or self.cursor_query_param in request.query_params
+        if not wants_keyset or not self.is_keyset_ordered(queryset, ordering):
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        self.keyset = ordering
+        queryset = queryset.order_by(*ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.seek_filter(queryset.model, ordering, cursor))
+
+        page = list(queryset[:page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        self.last = page[-1] if page else None
+        return page
+
+    def get_paginated_response(self, data):
+        if self.keyset is None:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_cursor_link(),
+            'results': data,
+        })
+
+    def get_next_cursor_link(self):
+        if not self.has_next:
+            return None
+        position = [self.encode_position(self.position_value(field.lstrip('-'))) for field in self.keyset]
+        cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def seek_filter(self, model, ordering, cursor):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            (key, key_value), (tiebreak, tiebreak_value) = [
+                self.decode_position(model, field, value) for field, value in zip(ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        key_lookup = 'lt' if ordering[0].startswith('-') else 'gt'
+        tiebreak_lookup = 'lt' if ordering[1].startswith('-') else 'gt'
+        # The redundant inclusive bound gives the planner an index range to
+        # start from instead of filtering an OR row by row
+        return Q(**{f'{key}__{key_lookup}e': key_value}) & (
+            Q(**{f'{key}__{key_lookup}': key_value}) |
+            Q(**{f'{tiebreak}__{tiebreak_lookup}': tiebreak_value})
+        )
+
+    def position_value(self, name):
+        # Pages hold model instances, or values() dicts for projected lists
+        if isinstance(self.last, dict):
+            return self.last[name]
+        return getattr(self.last, name)
+
+    @staticmethod
+    def encode_position(value):
+        # Full microsecond precision, or rows sharing a millisecond get skipped
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def decode_position(model, field, value):
+        name = field.lstrip('-')
+        model_field = model._meta.get_field(name)
+        value = model_field.to_python(value)
+        # Lookups can't compare with None, and an out-of-range integer would
+        # only fail once the query runs
+        if value is None:
+            raise ValidationError('Missing cursor position.')
+        if isinstance(model_field, models.IntegerField):
+            # The standard ranges; SQLite reports none but can't bind past 64 bits
+            low, high = BaseDatabaseOperations.integer_field_ranges.get(
+                model_field.get_internal_type(), (-2 ** 63, 2 ** 63 - 1)
+            )
+            if not low <= value <= high:
+                raise ValidationError('Cursor position out of range.')
+        return name, value
+
+    @staticmethod
+    def is_keyset_ordered(queryset, ordering):
+        """Only lists already sorted on the keyset's leading field can switch modes"""
+        current = queryset.query.order_by or queryset.model._meta.ordering
+        return bool(current) and current[0] == ordering[0]
+
+
+class AdminKeysetPagination(KeysetPagination):
+    """Admin lists are always keyset-paged so a huge backlog never loads at once"""
+
+    always_keyset = True
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
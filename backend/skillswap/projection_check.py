@@ -0,0 +1,72 @@
+"""
+Golden-output comparison of projected lists against their serializers.
+
+Each list is requested with ``FAST_SERIALIZATION`` off and then on,
+following next links, and the two JSON bodies must be equal. The
+``check_projections`` command runs this on live data and the test suite
+runs it on fixtures. The admin lists build rows from ``values()`` either
+way and are compared so that they stay that way.
+"""
+import json
+
+from django.test import override_settings
+
+SEARCH_TERMS = ['python', 'design', 'guitar', 'a']
+STATUSES = ['pending', 'accepted', 'rejected']
+
+
+def list_paths():
+    """First pages of every projected list, in page-number and cursor form"""
+    paths = ['/api/auth/users/', '/api/auth/users/?page=2', '/api/auth/users/?cursor=']
+    paths += [f'/api/auth/users/?search={term}' for term in SEARCH_TERMS]
+    for base in ('/api/swaps/requests/', '/api/swaps/requests/received/'):
+        paths += [base, f'{base}?page=2', f'{base}?cursor=']
+        paths += [f'{base}?status={status}' for status in STATUSES]
+    paths += ['/api/skills/', '/api/skills/?page=2', '/api/skills/?cursor=', '/api/skills/?cursor=&page_size=100']
+    return paths
+
+
+def admin_list_paths():
+    """First pages of the admin lists, requested as an admin"""
+    paths = ['/api/auth/admin/users/', '/api/auth/admin/users/?banned=false']
+    paths += ['/api/auth/admin/user-skills/', '/api/auth/admin/user-skills/?status=pending']
+    paths += ['/api/auth/admin/swaps/'] + [f'/api/auth/admin/swaps/?status={status}' for status in STATUSES]
+    return paths
+
+
+def first_difference(expected, actual, location='$'):
+    """``(location, expected, actual)`` of the first difference between two JSON values"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in [*expected, *(key for key in actual if key not in expected)]:
+            if expected.get(key, KeyError) != actual.get(key, KeyError):
+                return first_difference(expected.get(key), actual.get(key), f'{location}.{key}')
+    elif isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)) and len(expected) == len(actual):
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            if left != right:
+                return first_difference(left, right, f'{location}[{index}]')
+    return location, expected, actual
+
+
+def fetch(client, path, fast):
+    with override_settings(FAST_SERIALIZATION=fast):
+        response = client.get(path)
+    return response.status_code, json.loads(response.content) if response.content else None
+
+
+def next_link(response):
+    status, body = response
+    if status != 200 or not isinstance(body, dict) or not body.get('next'):
+        return None
+    return body['next'].removeprefix('http://testserver')
+
+
+def compare_pages(client, path, pages):
+    """Yield ``(path, serializer response, projection response)`` for ``path`` and up to ``pages`` next links"""
+    for _ in range(pages + 1):
+        expected, actual = fetch(client, path, False), fetch(client, path, True)
+        yield path, expected, actual
+        if expected != actual:
+            return
+        path = next_link(expected)
+        if path is None:
+            return
@@ -0,0 +1,296 @@
+"""
+Read-only list responses built from ``.values()`` rows.
+
+DRF serializes a list by calling ``to_representation`` on every field of
+every model instance. A ``Projection`` does that work once, when it is
+compiled from a serializer class: each readable field becomes a column to
+select and, where the raw column value isn't already the output, a mapper
+reproducing what the field would return. The whole page is then built by
+one generated list comprehension over the rows.
+
+* Nested serializers on foreign keys are read from joined columns
+  (``from_user__email``), not from related instances, and each related
+  object is built once per page.
+* Fields without a column (properties, method fields) need a ``Computed``
+  entry, optionally backed by a loader that fetches a map for the whole
+  page in one query.
+
+Output must stay identical to the serializer's; ``projection_check``
+compares the two, in the tests and on live data with ``check_projections``. Views opt in with ``ProjectedListMixin``,
+and ``FAST_SERIALIZATION=0`` sends every list back through the serializers.
+"""
+from functools import cached_property
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Fields whose output is the column value as the database returns it, when
+# the model field stores that type
+IDENTITY_FIELDS = {
+    serializers.CharField: (models.CharField, models.TextField),
+    serializers.IntegerField: (models.IntegerField, models.AutoField),
+    serializers.BooleanField: (models.BooleanField,),
+    serializers.ReadOnlyField: (models.Field,),
+}
+
+
+class Computed:
+    """
+    An output field derived from other columns: ``function(*values)``.
+
+    With a ``loader``, ``loader(keys)`` is called once per page with the set
+    of values of the single column and returns a map, and ``function``
+    receives the row's entry from that map instead of the column value.
+    Loaders shared between fields (or nested projections) run once.
+    """
+
+    def __init__(self, function, *columns, loader=None):
+        if loader is not None and len(columns) != 1:
+            raise ImproperlyConfigured('A loader-backed Computed field reads exactly one key column')
+        self.function = function
+        self.columns = columns
+        self.loader = loader
+
+
+class RequestBound:
+    """A mapper that depends on the request, created once per page by ``factory(request)``"""
+
+    def __init__(self, factory):
+        self.factory = factory
+
+
+def iso_datetime(value):
+    """DRF's ISO 8601 output for an aware UTC datetime"""
+    value = value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def decimal_string(value):
+    # Database decimals already carry the column's scale, so DRF's quantize
+    # is a no-op and only the fixed-point formatting remains
+    return format(value, 'f')
+
+
+def file_url(model_field, use_url):
+    storage = model_field.storage
+
+    def factory(request):
+        if not use_url:
+            return lambda name: name or None
+        if request is None:
+            return lambda name: storage.url(name) if name else None
+        absolute = request.build_absolute_uri
+        return lambda name: absolute(storage.url(name)) if name else None
+    return RequestBound(factory)
+
+
+def utc_output():
+    return settings.USE_TZ and settings.TIME_ZONE == 'UTC'
+
+
+def field_mapper(field, model_field):
+    """The mapper reproducing ``field.to_representation`` on a raw column value, or None for identity"""
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # values() returns the key itself
+        return None if field.pk_field is None else field.pk_field.to_representation
+    if isinstance(field, serializers.FileField):
+        return file_url(model_field, getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL))
+    if type(field) is serializers.DateTimeField and isinstance(model_field, models.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        # Rows come back in UTC; no request activates another timezone
+        if output_format and output_format.lower() == ISO_8601 and utc_output():
+            return iso_datetime
+    if type(field) is serializers.DecimalField and isinstance(model_field, models.DecimalField):
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        if coerce_to_string and not field.localize and field.decimal_places == model_field.decimal_places:
+            return decimal_string
+    if type(field) is serializers.ChoiceField and all(isinstance(key, str) for key in field.choices):
+        if isinstance(model_field, (models.CharField, models.TextField)):
+            return None
+    for field_class, model_fields in IDENTITY_FIELDS.items():
+        inherited = type(field).to_representation is field_class.to_representation
+        if isinstance(field, field_class) and inherited and isinstance(model_field, model_fields):
+            return None
+    return field.to_representation
+
+
+def resolve_column(model, source):
+    """The ``values()`` column and model field behind a dotted serializer source"""
+    parts = source.split('.')
+    for depth, part in enumerate(parts):
+        try:
+            model_field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None, None
+        if depth < len(parts) - 1:
+            if not model_field.many_to_one and not model_field.one_to_one:
+                return None, None
+            model = model_field.related_model
+    if not model_field.concrete or model_field.many_to_many:
+        return None, None
+    return '__'.join(parts), model_field
+
+
+class Compiler:
+    """Collects the columns, constants and loaders of one projection tree"""
+
+    def __init__(self):
+        self.columns = {}
+        self.constants = []
+        self.loaders = {}
+        self.memos = 0
+
+    def column(self, name):
+        self.columns[name] = None
+        return f'row[{name!r}]'
+
+    def constant(self, value):
+        self.constants.append(value)
+        return f'm[{len(self.constants) - 1}]'
+
+    def memo(self):
+        """A per-page dict and a variable name for one nested field's objects by key"""
+        self.memos += 1
+        return f'n{self.memos - 1}', f'k{self.memos - 1}'
+
+    def loader(self, loader, column):
+        index, columns = self.loaders.setdefault(loader, (len(self.loaders), []))
+        columns.append(column)
+        return f'b[{index}]'
+
+
+class Projection:
+    def __init__(self, serializer_class, computed=None, nested=None):
+        """
+        ``computed`` maps field names to ``Computed`` entries and ``nested``
+        maps nested serializer fields to their own ``Projection``; nested
+        fields without one get a plain projection of their serializer.
+        """
+        self.serializer_class = serializer_class
+        self.computed = computed or {}
+        self.nested = nested or {}
+
+    @cached_property
+    def compiled(self):
+        # Compiled on first use, once models and settings are loaded
+        compiler = Compiler()
+        expression = self.expression(compiler, '')
+        memos = ''.join(f'    n{index} = {{}}\n' for index in range(compiler.memos))
+        source = f'def build(rows, m, b):\n{memos}    return [{expression} for row in rows]\n'
+        namespace = {}
+        exec(compile(source, f'<projection {self.serializer_class.__name__}>', 'exec'), namespace)
+        loaders = [(loader, columns) for loader, (_, columns) in compiler.loaders.items()]
+        return namespace['build'], list(compiler.columns), compiler.constants, loaders
+
+    @property
+    def columns(self):
+        """The columns to pass to ``values()``"""
+        return self.compiled[1]
+
+    def expression(self, compiler, prefix):
+        """Source of a dict display building one output object from ``row``"""
+        model = self.serializer_class.Meta.model
+        items = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if name in self.computed:
+                value = self.computed_expression(compiler, prefix, self.computed[name])
+            elif isinstance(field, serializers.BaseSerializer):
+                value = self.nested_expression(compiler, prefix, name, field, model)
+            else:
+                value = self.field_expression(compiler, prefix, name, field, model)
+            items.append(f'{name!r}: {value}')
+        return '{' + ', '.join(items) + '}'
+
+    def computed_expression(self, compiler, prefix, entry):
+        function = compiler.constant(entry.function)
+        if entry.loader is not None:
+            key = compiler.column(prefix + entry.columns[0])
+            return f'{function}({compiler.loader(entry.loader, prefix + entry.columns[0])}[{key}])'
+        return f"{function}({', '.join(compiler.column(prefix + column) for column in entry.columns)})"
+
+    def nested_expression(self, compiler, prefix, name, field, model):
+        column, model_field = resolve_column(model, field.source)
+        if model_field is None or getattr(field, 'many', False) or not model_field.is_relation:
+            raise ImproperlyConfigured(
+                f'{self.serializer_class.__name__}.{name} is not a nested serializer on a foreign key'
+            )
+        projection = self.nested.get(name) or Projection(type(field))
+        if projection.serializer_class is not type(field):
+            raise ImproperlyConfigured(f'The projection for {name} must use {type(field).__name__}')
+        nested_prefix = f'{prefix}{column}__'
+        key = compiler.column(f'{nested_prefix}{model_field.target_field.attname}')
+        memo, variable = compiler.memo()
+        # Each related object is built once per page; rows that repeat it
+        # (a user's own requests all name them) share that dict
+        expression = (
+            f'({memo}[{variable}] if ({variable} := {key}) in {memo} '
+            f'else {memo}.setdefault({variable}, {projection.expression(compiler, nested_prefix)}))'
+        )
+        if model_field.null:
+            return f'(None if {key} is None else {expression})'
+        return expression
+
+    def field_expression(self, compiler, prefix, name, field, model):
+        column, model_field = resolve_column(model, field.source)
+        if model_field is None:
+            raise ImproperlyConfigured(
+                f'{self.serializer_class.__name__}.{name} has no column; give it a Computed entry'
+            )
+        value = compiler.column(prefix + column)
+        mapper = field_mapper(field, model_field)
+        if mapper is None:
+            return value
+        # Serializers skip to_representation for None
+        return f'(None if (v := {value}) is None else {compiler.constant(mapper)}(v))'
+
+    def build(self, rows, request=None):
+        """Output objects for ``rows`` (``values()`` dicts with at least ``columns``)"""
+        build, _, constants, loaders = self.compiled
+        rows = rows if isinstance(rows, list) else list(rows)
+        constants = [
+            constant.factory(request) if isinstance(constant, RequestBound) else constant
+            for constant in constants
+        ]
+        maps = [
+            loader({row[column] for row in rows for column in columns} - {None}) if rows else {}
+            for loader, columns in loaders
+        ]
+        return build(rows, constants, maps)
+
+
+def fast_serialization():
+    return getattr(settings, 'FAST_SERIALIZATION', True)
+
+
+class ProjectedListMixin:
+    """
+    List views with a ``projection`` page through ``values()`` rows and
+    build the response from them instead of serializing model instances.
+    """
+
+    projection = None
+
+    def list(self, request, *args, **kwargs):
+        if self.projection is None or not fast_serialization():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*self.projected_columns(queryset))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.projection.build(page, request))
+        return Response(self.projection.build(rows, request))
+
+    def projected_columns(self, queryset):
+        # Keyset pages read their position from the last row, and extra()
+        # selects the query orders by have to stay selected
+        ordering = getattr(self, 'keyset_ordering', getattr(self.paginator, 'keyset_ordering', ()))
+        extra = getattr(getattr(queryset, 'query', None), 'extra', {})
+        return list(dict.fromkeys([
+            *self.projection.columns, *(field.lstrip('-') for field in ordering), *extra,
+        ]))
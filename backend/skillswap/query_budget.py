@@ -0,0 +1,176 @@
+"""
+Per-request query budgets and N+1 detection.
+
+Views declare how many queries a request may take, either with the
+``query_budget`` decorator (function views) or a ``query_budget``
+attribute (class-based views). Budgets count every query the view
+phase of the request runs, session and user lookups included, and must
+not grow with page size. Queries middleware runs on the way out (the
+session save after a sliding refresh) are reported separately and don't
+count. Streaming responses are measured before their body is iterated,
+so views returning one don't declare a budget.
+
+``QueryBudgetMiddleware`` counts every query of a sampled request and
+groups them by shape, so a query repeated once per row shows up as one
+fingerprint with a high count. Each
+repeated shape is attributed to the app code that issued it and, when it
+came from a serializer, to the serializer field being rendered.
+
+Over-budget requests log a warning on ``skillswap.queries``. With
+``QUERY_BUDGET['RAISE']`` (meant for dev and test runs) safe requests
+raise ``QueryBudgetExceeded`` instead; a POST or DELETE has already
+committed its writes by then, so it only logs.
+"""
+import logging
+import random
+import re
+import sys
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('skillswap.queries')
+
+DEFAULTS = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 1.0,
+    'RAISE': False,
+    # Repeats of one query shape in a request that count as an N+1 loop
+    'REPEAT_THRESHOLD': 5,
+}
+
+IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+WHITESPACE = re.compile(r'\s+')
+PROJECT_DIR = str(settings.BASE_DIR)
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(limit):
+    """
+    Declare the most queries a function view may run per request, as a
+    number or a ``{method: number}`` dict. Goes above ``@api_view``.
+    """
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+def budget_settings():
+    return {**DEFAULTS, **getattr(settings, 'QUERY_BUDGET', {})}
+
+
+def view_budget(match, method):
+    if match is None:
+        return None
+    func = match.func
+    budget = getattr(func, 'query_budget', None)
+    if budget is None:
+        budget = getattr(getattr(func, 'view_class', None), 'query_budget', None)
+    if isinstance(budget, dict):
+        budget = budget.get(method)
+    return budget
+
+
+def fingerprint(sql):
+    """The query's shape: placeholders stay, IN lists of any length collapse"""
+    return WHITESPACE.sub(' ', IN_LIST.sub('IN (...)', sql)).strip()
+
+
+def query_origin():
+    """
+    ``(serializer field, app code location, from middleware)`` of the query
+    being executed; the last is true for queries run by a middleware's
+    ``process_response``, after the view has returned
+    """
+    field = location = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == 'process_response':
+            return field, location, True
+        if field is None and code.co_name == 'to_representation' and 'field' in frame.f_locals:
+            serializer, current = frame.f_locals.get('self'), frame.f_locals['field']
+            field = f'{type(serializer).__name__}.{getattr(current, "field_name", current)}'
+        if location is None and code.co_filename.startswith(PROJECT_DIR) and \
+                'site-packages' not in code.co_filename and code.co_filename != __file__:
+            location = f'{code.co_filename[len(PROJECT_DIR) + 1:]}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return field, location, False
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.middleware_count = 0
+        self.shapes = Counter()
+        self.origins = defaultdict(Counter)
+
+    def __call__(self, execute, sql, params, many, context):
+        field, location, from_middleware = query_origin()
+        if from_middleware:
+            self.middleware_count += 1
+        else:
+            self.count += 1
+        shape = fingerprint(sql)
+        self.shapes[shape] += 1
+        self.origins[shape][field, location] += 1
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        return [
+            {
+                'query': shape,
+                'count': count,
+                'field': self.origins[shape].most_common(1)[0][0][0],
+                'location': self.origins[shape].most_common(1)[0][0][1],
+            }
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = budget_settings()
+
+    def __call__(self, request):
+        config = self.config
+        if not config['ENABLED'] or random.random() >= config['SAMPLE_RATE']:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        self.check(request, response, recorder, config)
+        return response
+
+    def check(self, request, response, recorder, config):
+        match = request.resolver_match
+        view = match.view_name if match else request.path
+        # A streaming body runs its queries after this point, uncounted
+        budget = None if response.streaming else view_budget(match, request.method)
+        repeated = recorder.repeated(config['REPEAT_THRESHOLD'])
+        for shape in repeated:
+            logger.warning(
+                'Possible N+1: %s ran the same query %d times', view, shape['count'],
+                extra={'view': view, **shape},
+            )
+        if budget is not None and recorder.count > budget:
+            message = f'{view} ran {recorder.count} queries, over its budget of {budget}'
+            if config['RAISE'] and request.method in SAFE_METHODS:
+                details = ''.join(f"\n  {s['count']}x {s['field'] or s['location']}: {s['query']}" for s in repeated)
+                raise QueryBudgetExceeded(message + details)
+            logger.warning(message, extra={
+                'view': view, 'db_queries': recorder.count, 'middleware_queries': recorder.middleware_count,
+                'budget': budget,
+            })
@@ -0,0 +1,94 @@
+"""
+EXPLAIN checks for the queries the API serves most.
+
+``hot_queries`` builds each list's queryset the way its view does, and
+``full_scans`` reads the plan for a table scanned without an index. The
+test suite asserts that none of them scans; ``check_query_plans`` prints
+the same plans for a real database.
+"""
+import re
+
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.admin_api import filter_user_skills, filter_users
+from accounts.models import User, PlatformMessage, ExportJob
+from accounts.views import UserListView
+from skills.models import UserSkill
+from skills.views import UserSkillListView
+from swaps.models import SwapRequest
+from swaps.views import SwapRequestListCreateView, ReceivedRequestsView
+
+from .querysets import MergedQuerySet
+
+# SQLite: "SCAN accounts_user" is a full scan, "SCAN ... USING INDEX" is not.
+# PostgreSQL plans are read with seq scans disabled, so any left are forced.
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)(?! USING)(?:\s|$)'),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+}
+SORT_PATTERNS = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR ORDER BY'),
+    'postgresql': re.compile(r'^\s*(?:->\s*)?Sort\b', re.MULTILINE),
+}
+
+
+def view_queryset(view_class, user, params=None):
+    """Run a list view's own ``get_queryset`` for ``user`` without a request cycle"""
+    request = Request(APIRequestFactory().get('/', params or {}))
+    request.user = user
+    view = view_class()
+    view.setup(request)
+    view.request = request
+    view.format_kwarg = None
+    return view.get_queryset()
+
+
+def hot_queries():
+    """``(label, queryset)`` for the filters and orderings the API serves most"""
+    member = User(pk=1, is_admin=False)
+    pending = {'status': 'pending'}
+    return [
+        ('user skills (own, approved)', view_queryset(UserSkillListView, member)),
+        ('user skills by type', UserSkill.objects.filter(user=member, skill_type='offered', status='approved')),
+        ('swap requests (sent or received)', view_queryset(SwapRequestListCreateView, member)),
+        ('swap requests (sent or received, by status)', view_queryset(SwapRequestListCreateView, member, pending)),
+        ('received requests', view_queryset(ReceivedRequestsView, member)),
+        ('received requests (by status)', view_queryset(ReceivedRequestsView, member, pending)),
+        ('user list', view_queryset(UserListView, member)),
+        ('admin moderation queue', filter_user_skills(pending).order_by('-created_at', '-id')),
+        ('admin users', filter_users({}).order_by('-created_at', '-id')),
+        ('admin swaps (by status)', SwapRequest.objects.filter(status='pending').order_by('-created_at', '-id')),
+        ('admin messages', PlatformMessage.objects.order_by('-created_at')),
+        ('export job queue', ExportJob.objects.filter(status='queued').order_by('created_at')),
+    ]
+
+
+def expand(queries):
+    """Check each branch of a merged listing on its own"""
+    for label, queryset in queries:
+        if isinstance(queryset, MergedQuerySet):
+            for number, branch in enumerate(queryset.branches, 1):
+                yield f'{label} [branch {number}]', branch
+        else:
+            yield label, queryset
+
+
+def explain(queryset):
+    if connection.vendor != 'postgresql':
+        return queryset.explain()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+
+def full_scans(plan):
+    """Tables ``plan`` reads without an index"""
+    return FULL_SCAN_PATTERNS[connection.vendor].findall(plan)
+
+
+def sorts(plan):
+    """Whether ``plan`` sorts rows instead of reading them in index order"""
+    return bool(SORT_PATTERNS[connection.vendor].search(plan))
@@ -0,0 +1,82 @@
+"""
+Index-friendly replacement for ``filter(Q(a=x) | Q(b=x))`` listings.
+
+An OR across two columns can't walk one ordered index, so the database
+reads every match and sorts them. ``MergedQuerySet`` keeps the branches
+separate: each one reads just the ``(ordering..., pk)`` keys it needs from
+its own composite index, the keys are merged like ``UNION ALL ... ORDER
+BY``, and only the rows on the page are then loaded in one query.
+
+It implements the slice of the QuerySet API that Django's ``Paginator``
+and ``KeysetPagination`` use: ``count``, slicing, ``filter``, ``order_by``,
+plus ``values`` so projected lists get their pages as dicts.
+"""
+import heapq
+
+from django.db.models.query import ModelIterable
+
+
+class MergedQuerySet:
+    ordered = True
+
+    def __init__(self, rows, branches, ordering=None):
+        """
+        ``rows`` is the queryset pages are loaded from (with its
+        ``select_related`` etc.). ``branches`` must be disjoint.
+        """
+        self.rows = rows
+        self.model = rows.model
+        ordering = tuple(ordering or rows.query.order_by or self.model._meta.ordering)
+        if len({field.startswith('-') for field in ordering}) > 1:
+            raise ValueError('MergedQuerySet needs every ordering field sorted in the same direction')
+        if ordering[-1].lstrip('-') not in ('pk', 'id'):
+            # Unique tie-breaker so the merge is deterministic
+            ordering += ('-id' if ordering[0].startswith('-') else 'id',)
+        self.ordering = ordering
+        self.branches = [branch.order_by(*ordering) for branch in branches]
+
+    @property
+    def query(self):
+        # Exposes the shared ordering to code that inspects query.order_by
+        return self.branches[0].query
+
+    def _clone(self, branches, ordering=None, rows=None):
+        return MergedQuerySet(rows if rows is not None else self.rows, branches, ordering or self.ordering)
+
+    def filter(self, *args, **kwargs):
+        return self._clone([branch.filter(*args, **kwargs) for branch in self.branches])
+
+    def order_by(self, *ordering):
+        return self._clone(self.branches, ordering)
+
+    def values(self, *fields):
+        pk = self.model._meta.pk.attname
+        return self._clone(self.branches, rows=self.rows.values(*dict.fromkeys([pk, *fields])))
+
+    def count(self):
+        return sum(branch.count() for branch in self.branches)
+
+    def keys(self, stop):
+        """The first ``stop`` ``(ordering values..., pk)`` keys across all branches"""
+        fields = [field.lstrip('-') for field in self.ordering]
+        descending = self.ordering[0].startswith('-')
+        runs = [branch.values_list(*fields, 'pk')[:stop] for branch in self.branches]
+        merged = heapq.merge(*runs, key=lambda key: key[:-1], reverse=descending)
+        return [key for _, key in zip(range(stop), merged)]
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.step is not None:
+            raise TypeError('MergedQuerySet only supports [start:stop] slicing')
+        start, stop = index.start or 0, index.stop
+        if stop is None:
+            raise TypeError('MergedQuerySet slices need an upper bound')
+        ids = [key[-1] for key in self.keys(stop)[start:]]
+        if issubclass(self.rows._iterable_class, ModelIterable):
+            by_id = self.rows.in_bulk(ids)
+        else:
+            pk = self.model._meta.pk.attname
+            by_id = {row[pk]: row for row in self.rows.filter(pk__in=ids)}
+        return [by_id[pk] for pk in ids if pk in by_id]
+
+    def __iter__(self):
+        raise TypeError('MergedQuerySet must be sliced; iterating it would load every row')
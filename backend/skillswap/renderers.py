@@ -0,0 +1,44 @@
+"""
+JSON rendering through orjson when it is installed.
+
+``FastJSONRenderer`` writes the same bytes as DRF's ``JSONRenderer`` with
+the default compact, non-ASCII-escaping settings. Types orjson doesn't know
+(``Decimal``, lazy translation strings, querysets...) go through DRF's own
+encoder, and anything orjson refuses, such as integers wider than 64
+bits, is rendered by the stdlib path so it succeeds or fails exactly as
+before. Indented output (the browsable API) and non-default
+``UNICODE_JSON``/``COMPACT_JSON`` settings always take the stdlib path.
+
+Two differences remain. Very large and very small floats are spelled
+differently (``1e16`` for ``1e+16``, ``0.00001`` for ``1e-05``) but parse
+to the same numbers. NaN and the infinities render as ``null`` instead of
+raising. The API's numbers come from serializer fields that emit neither.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # "Z" for UTC like DRF's encoder, int keys as strings like json.dumps,
+    # and dataclasses left to the encoder, which rejects them as DRF does
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like JSONRenderer does, to keep the output a JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
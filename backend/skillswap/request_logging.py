@@ -0,0 +1,130 @@
+"""
+Structured request logging.
+
+``RequestLogMiddleware`` tags every request with an id and writes one
+summary record per request to the ``skillswap.requests`` logger: method,
+path, view, status, user, query count, database time and total latency.
+``JsonFormatter`` renders records, including any ``extra=`` fields, as one
+JSON object per line, and ``RequestContextFilter`` stamps the current
+request id onto records logged anywhere during the request.
+
+Nothing is measured unless the summary logger is enabled at INFO, and
+payload dumps go through ``log_payload``, which is sampled by
+``LOG_PAYLOAD_SAMPLE_RATE`` (0, i.e. off, by default).
+"""
+import contextvars
+import json
+import logging
+import random
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+
+request_logger = logging.getLogger('skillswap.requests')
+
+request_id_var = contextvars.ContextVar('request_id', default=None)
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in RESERVED_ATTRS)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = request_id_var.get()
+        return True
+
+
+def log_payload(logger, message, payload, **extra):
+    """
+    Log ``payload()`` at DEBUG for a sampled share of calls.
+
+    ``payload`` is a callable so the dump is only built when it is logged.
+    """
+    rate = getattr(settings, 'LOG_PAYLOAD_SAMPLE_RATE', 0)
+    if rate and logger.isEnabledFor(logging.DEBUG) and random.random() < rate:
+        logger.debug(message, extra={**extra, 'payload': payload()})
+
+
+class QueryStats:
+    """``execute_wrapper`` hook that counts queries and their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+def loaded_user_id(request):
+    """The user id if authentication already ran; never triggers the lookup itself"""
+    user = getattr(request, 'user', None)
+    if isinstance(user, SimpleLazyObject):
+        user = None if user._wrapped is empty else user._wrapped
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+class RequestLogMiddleware:
+    header = 'HTTP_X_REQUEST_ID'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.id = request.META.get(self.header) or uuid.uuid4().hex
+        token = request_id_var.set(request.id)
+        try:
+            if not request_logger.isEnabledFor(logging.INFO):
+                response = self.get_response(request)
+            else:
+                response = self.measure(request)
+        finally:
+            request_id_var.reset(token)
+        response['X-Request-ID'] = request.id
+        return response
+
+    def measure(self, request):
+        stats = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        match = request.resolver_match
+        request_logger.info('request', extra={
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'user_id': loaded_user_id(request),
+            'db_queries': stats.count,
+            'db_time_ms': round(stats.seconds * 1000, 2),
+            'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+        })
+        return response
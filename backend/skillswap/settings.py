@@ -4,6 +4,7 @@ Django settings for skillswap project.
 
 from pathlib import Path
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -29,12 +30,17 @@ INSTALLED_APPS = [
     'accounts',
     'skills',
     'swaps',
+    # Project-wide management commands and tests
+    'skillswap',
 ]
 
 MIDDLEWARE = [
+    'skillswap.request_logging.RequestLogMiddleware',
+    'skillswap.query_budget.QueryBudgetMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'skillswap.middleware.SlidingSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -63,13 +69,69 @@ TEMPLATES = [
 WSGI_APPLICATION = 'skillswap.wsgi.application'
 
 # Database
-DATABASES = {
+# DB_ENGINE selects the profile: "sqlite" (default) for development and
+# single-host serving, "postgresql" for production.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'skillswap'),
+            'USER': os.environ.get('DB_USER', 'skillswap'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Keep connections open between requests, checking them before reuse
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            # Exports stream through QuerySet.iterator(), which uses server-side
+            # cursors; set this when behind a transaction-pooling PgBouncer
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', '') == '1',
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', '5')),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Seconds to wait for the write lock before "database is locked"
+                'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', '20')),
+            },
+        }
+    }
+
+# Applied to every new SQLite connection (see skillswap.db). WAL lets
+# readers run alongside the single writer; NORMAL sync is durable across
+# application crashes and only risks the last commits on power loss.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', '20')) * 1000,
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_KB', '20000')),
+    'temp_store': 'memory',
+}
+
+# Cache
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) when running
+# several worker processes so they see the same profile versions.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'skillswap'),
+        'OPTIONS': {'MAX_ENTRIES': 10000} if 'CACHE_BACKEND' not in os.environ else {},
     }
 }
 
+# Cache alias holding serialized user profiles (see accounts.profile_cache)
+PROFILE_CACHE_ALIAS = 'default'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -99,6 +161,8 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Admin exports and other files that must not be reachable under MEDIA_URL
+PRIVATE_MEDIA_ROOT = BASE_DIR / 'private'
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -111,7 +175,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # orjson when installed, DRF's stdlib JSON otherwise (skillswap.renderers)
+    'DEFAULT_RENDERER_CLASSES': [
+        'skillswap.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'skillswap.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'skillswap.pagination.KeysetPagination',
     'PAGE_SIZE': 10
 }
 
@@ -147,9 +221,80 @@ SESSION_COOKIE_SECURE = False  # Allow HTTP in development
 SESSION_COOKIE_DOMAIN = None  # Use default domain
 SESSION_COOKIE_PATH = '/'  # Use root path
 
-# Additional session settings for better debugging
-SESSION_SAVE_EVERY_REQUEST = True  # Save session on every request
+# Sessions are written only when they change; SlidingSessionMiddleware
+# re-saves an active session once per refresh interval to extend its expiry
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_INTERVAL = int(os.environ.get('SESSION_REFRESH_INTERVAL', '3600'))
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False  # Keep session until cookie expires
 
+# SESSION_BACKEND picks the store. "cache" and "cached_db" need a cache shared
+# by every worker (see CACHES): with the per-process local-memory default,
+# a logout in one worker would not reach the others. "file" is the stand-in
+# for several workers on one host without a shared cache.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'file': 'django.contrib.sessions.backends.file',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('SESSION_BACKEND', 'db')]
+if 'SESSION_FILE_PATH' in os.environ:
+    SESSION_FILE_PATH = os.environ['SESSION_FILE_PATH']
+
+# Logging
+# One JSON line per request on skillswap.requests (LOG_REQUESTS=0 or a level
+# above INFO turns the summary, and its measuring, off). App loggers follow
+# LOG_LEVEL; payload dumps at DEBUG are sampled by LOG_PAYLOAD_SAMPLE_RATE.
+# Under "manage.py test" both default to warnings only, so test output stays
+# readable; set LOG_REQUESTS=1 or LOG_LEVEL to see them there.
+TESTING = sys.argv[1:2] == ['test']
+LOG_REQUESTS = os.environ.get('LOG_REQUESTS', '0' if TESTING else '1') == '1'
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'WARNING' if TESTING else 'INFO')
+LOG_PAYLOAD_SAMPLE_RATE = float(os.environ.get('LOG_PAYLOAD_SAMPLE_RATE', '0'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_context': {'()': 'skillswap.request_logging.RequestContextFilter'},
+    },
+    'formatters': {
+        'json': {'()': 'skillswap.request_logging.JsonFormatter'},
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+            'filters': ['request_context'],
+        },
+    },
+    'loggers': {
+        'skillswap.requests': {
+            'handlers': ['console'],
+            'level': 'INFO' if LOG_REQUESTS else 'WARNING',
+            'propagate': False,
+        },
+        **{
+            name: {'handlers': ['console'], 'level': LOG_LEVEL, 'propagate': False}
+            for name in ('accounts', 'skills', 'swaps', 'skillswap')
+        },
+    },
+}
+
+# Query budgets (see skillswap.query_budget): every request in development,
+# a sample in production. QUERY_BUDGET_RAISE=1 turns overruns on GET/HEAD/OPTIONS
+# requests into errors.
+QUERY_BUDGET = {
+    'ENABLED': os.environ.get('QUERY_BUDGET_ENABLED', '1') == '1',
+    'SAMPLE_RATE': 1.0 if DEBUG else float(os.environ.get('QUERY_BUDGET_SAMPLE_RATE', '0.01')),
+    'RAISE': os.environ.get('QUERY_BUDGET_RAISE', '') == '1',
+    'REPEAT_THRESHOLD': 5,
+}
+
+# List views with a projection (skillswap.projections) build responses from
+# values() rows; FAST_SERIALIZATION=0 serializes model instances instead
+FAST_SERIALIZATION = os.environ.get('FAST_SERIALIZATION', '1') == '1'
+
 # Custom user model
 AUTH_USER_MODEL = 'accounts.User'
@@ -0,0 +1,9 @@
+"""Storage for files that are only ever served through permission-checked views."""
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+
+def private_storage():
+    # Outside MEDIA_ROOT, so no media URL (static() under DEBUG, a web
+    # server or a CDN in production) can reach these files
+    return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT)
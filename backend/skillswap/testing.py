@@ -0,0 +1,35 @@
+"""Helpers shared by the app test modules."""
+import base64
+import json
+
+
+def cursor(*position):
+    """A keyset cursor for ``position``, encoded the way the paginator does"""
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+CRAFTED_CURSORS = {
+    'null position': cursor(None, None),
+    'null key': cursor(None, 1),
+    'null tie-breaker': cursor('2024-01-01T00:00:00+00:00', None),
+    'wrong types': cursor({'a': 1}, [2]),
+    'out of range id': cursor('2024-01-01T00:00:00+00:00', 2 ** 70),
+    'too short': cursor('2024-01-01T00:00:00+00:00'),
+    'not a list': base64.urlsafe_b64encode(b'42').decode(),
+    'not json': base64.urlsafe_b64encode(b'{oops').decode(),
+    'not base64': '%%%',
+}
+
+
+class CraftedCursorMixin:
+    """For a logged-in ``TestCase``: every list in ``CURSOR_LISTS`` answers a crafted cursor with 404"""
+
+    CURSOR_LISTS = []
+
+    def test_crafted_cursors_are_not_found(self):
+        for path in self.CURSOR_LISTS:
+            for label, value in CRAFTED_CURSORS.items():
+                with self.subTest(path=path, cursor=label):
+                    response = self.client.get(path, {'cursor': value})
+                    self.assertEqual(response.status_code, 404)
+                    self.assertEqual(response.json(), {'detail': 'Invalid cursor'})
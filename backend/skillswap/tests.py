@@ -0,0 +1,147 @@
+import datetime
+import io
+import uuid
+import zoneinfo
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User
+from skills.models import Skill, UserSkill
+from swaps.models import SwapRequest
+
+from . import parsers, renderers
+from .parsers import FastJSONParser
+from .projection_check import admin_list_paths, compare_pages, first_difference, list_paths
+from .query_plans import FULL_SCAN_PATTERNS, expand, explain, full_scans, hot_queries
+from .renderers import FastJSONRenderer
+
+UTC_NOW = datetime.datetime(2024, 5, 17, 9, 30, 12, 345678, tzinfo=datetime.timezone.utc)
+
+# Values whose JSON both renderers must agree on byte for byte
+FIXTURES = {
+    'decimals': lambda: {'rating': Decimal('4.50'), 'zero': Decimal('0'), 'big': Decimal('12345.678')},
+    'aware datetimes': lambda: [
+        UTC_NOW, UTC_NOW.replace(microsecond=0),
+        UTC_NOW.astimezone(datetime.timezone(datetime.timedelta(hours=5, minutes=30))),
+        UTC_NOW.astimezone(zoneinfo.ZoneInfo('UTC')), UTC_NOW.astimezone(zoneinfo.ZoneInfo('America/New_York')),
+    ],
+    'naive dates and times': lambda: [UTC_NOW.replace(tzinfo=None), UTC_NOW.date(), UTC_NOW.time().replace(tzinfo=None)],
+    'lazy strings': lambda: {'message': gettext_lazy('This field is required.'), 'items': [gettext_lazy('Invalid')]},
+    'unicode': lambda: {'name': 'Zoë Šimić', 'bio': '日本語 ✓ 🎸', 'separators': 'a b c', 'escapes': '"\\\n\t\x00'},
+    'numbers': lambda: [0, -1, 2 ** 63 - 1, 1.5, 0.1, -0.0, 123456789.123, True, False, None],
+    'wider than 64 bits': lambda: {'id': 2 ** 64},
+    'keys': lambda: {1: 'int key', 'nested': {2: [None, {}], 'empty': []}},
+    'other types': lambda: {
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'tuple': (1, 'two'),
+        'generator': (n * n for n in range(3)), 'bytes': b'raw', 'delta': datetime.timedelta(hours=1, seconds=3),
+    },
+}
+
+
+def render(renderer, data):
+    return renderer.render(data, 'application/json', {})
+
+
+def parse(parser, content):
+    return parser.parse(io.BytesIO(content), 'application/json', {})
+
+
+class FastJSONTests(SimpleTestCase):
+    def assert_same_as_drf(self):
+        for label, fixture in FIXTURES.items():
+            with self.subTest(fixture=label):
+                expected = render(JSONRenderer(), fixture())
+                self.assertEqual(render(FastJSONRenderer(), fixture()), expected)
+                self.assertEqual(parse(FastJSONParser(), expected), parse(JSONParser(), expected))
+
+    @skipIf(renderers.orjson is None, 'orjson is not installed')
+    def test_orjson_output_matches_drf(self):
+        with mock.patch.object(renderers.orjson, 'dumps', wraps=renderers.orjson.dumps) as dumps:
+            self.assert_same_as_drf()
+        self.assertTrue(dumps.called)
+
+    def test_stdlib_fallback_matches_drf(self):
+        with mock.patch.object(renderers, 'orjson', None), mock.patch.object(parsers, 'orjson', None):
+            self.assert_same_as_drf()
+
+    def test_indented_output_uses_drf(self):
+        data = {'rating': Decimal('4.50'), 'at': UTC_NOW}
+        context = {'indent': 2}
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json', context),
+            JSONRenderer().render(data, 'application/json', context),
+        )
+
+    def test_invalid_json_is_a_parse_error(self):
+        for label, orjson in [('installed', renderers.orjson), ('missing', None)]:
+            with self.subTest(orjson=label), mock.patch.object(parsers, 'orjson', orjson):
+                for content in [b'{oops', b'[NaN]']:
+                    with self.assertRaises(ParseError):
+                        parse(FastJSONParser(), content)
+
+
+class ProjectionGoldenTests(TestCase):
+    """Every projected list gives the same JSON with FAST_SERIALIZATION off and on"""
+
+    @classmethod
+    def setUpTestData(cls):
+        skills = [
+            Skill.objects.create(name=name, category=category)
+            for name, category in [('Python', 'programming'), ('Design', 'design'), ('Guitar', 'music')]
+        ]
+        skills += [Skill.objects.create(name=f'Skill {index:02}', category='other') for index in range(20)]
+        cls.member = User.objects.create_user(
+            email='member@example.com', username='member', password='password123',
+            first_name='Ada', last_name='Member', bio='Python and design', location='Paris',
+        )
+        cls.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='password123', is_admin=True,
+        )
+        statuses = ['pending', 'accepted', 'rejected', 'completed']
+        for index in range(24):
+            partner = User.objects.create_user(
+                email=f'partner{index}@example.com', username=f'partner{index}', password='password123',
+                first_name=f'Partner{index}', last_name='Guitar' if index % 3 else '', location='Lyon',
+                is_banned=index == 5,
+            )
+            for skill_type, skill in [('offered', skills[index % 3]), ('wanted', skills[3 + index % 20])]:
+                UserSkill.objects.create(
+                    user=partner, skill=skill, skill_type=skill_type, status=statuses[index % 3],
+                    proficiency_level='intermediate',
+                )
+            sender, receiver = (partner, cls.member) if index % 2 else (cls.member, partner)
+            SwapRequest.objects.create(
+                from_user=sender, to_user=receiver, skill_offered=skills[index % 3], skill_wanted=skills[3],
+                message=f'Swap {index}', duration='1hour', preferred_time='flexible', status=statuses[index % 4],
+            )
+
+    def setUp(self):
+        # The catalogue snapshot is rebuilt when its cache version moves, and
+        # the on_commit bump never runs inside a TestCase
+        cache.clear()
+
+    def test_projections_match_serializers(self):
+        for user, paths in [(self.member, list_paths()), (self.admin, admin_list_paths())]:
+            self.client.force_login(user)
+            for path in paths:
+                for page, expected, actual in compare_pages(self.client, path, pages=3):
+                    with self.subTest(path=page, user=user.username):
+                        self.assertEqual(expected[0], 200)
+                        self.assertEqual(expected, actual, first_difference(expected, actual))
+
+
+@skipIf(connection.vendor not in FULL_SCAN_PATTERNS, 'query plans are only read for SQLite and PostgreSQL')
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_an_index(self):
+        for label, queryset in expand(hot_queries()):
+            with self.subTest(query=label):
+                plan = explain(queryset)
+                self.assertEqual(full_scans(plan), [], f'full table scan in:\n{plan}')
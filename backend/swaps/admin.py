@@ -1,7 +1,7 @@
 from django.contrib import admin
+from skillswap.exports import stream_csv
+from .exports import SWAP_HEADER, SESSION_HEADER, RATING_HEADER, swap_rows, session_rows, rating_rows
 from .models import SwapRequest, SwapSession, SwapRating
-import csv
-from django.http import HttpResponse
 
 @admin.register(SwapRequest)
 class SwapRequestAdmin(admin.ModelAdmin):
@@ -11,49 +11,35 @@ class SwapRequestAdmin(admin.ModelAdmin):
     actions = ['export_swaps_csv']
 
     def export_swaps_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename=swaps.csv'
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'From User', 'To User', 'Skill Offered', 'Skill Wanted', 'Status', 'Duration', 'Preferred Time', 'Created At'])
-        for swap in queryset:
-            writer.writerow([
-                swap.id, swap.from_user.full_name, swap.to_user.full_name, swap.skill_offered.name, swap.skill_wanted.name, swap.status, swap.duration, swap.preferred_time, swap.created_at
-            ])
-        return response
+        return stream_csv('swaps.csv', SWAP_HEADER, swap_rows(queryset))
     export_swaps_csv.short_description = "Export selected swaps as CSV"
 
 @admin.register(SwapSession)
 class SwapSessionAdmin(admin.ModelAdmin):
     list_display = ('swap_request', 'scheduled_date', 'completed', 'created_at')
+    # SwapRequest.__str__ reads both users and both skills
+    list_select_related = (
+        'swap_request__from_user', 'swap_request__to_user',
+        'swap_request__skill_offered', 'swap_request__skill_wanted',
+    )
     list_filter = ('completed', 'created_at')
     actions = ['export_sessions_csv']
 
     def export_sessions_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename=sessions.csv'
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Swap Request', 'Scheduled Date', 'Completed', 'Notes', 'Created At'])
-        for session in queryset:
-            writer.writerow([
-                session.id, str(session.swap_request), session.scheduled_date, session.completed, session.notes, session.created_at
-            ])
-        return response
+        return stream_csv('sessions.csv', SESSION_HEADER, session_rows(queryset))
     export_sessions_csv.short_description = "Export selected sessions as CSV"
 
 @admin.register(SwapRating)
 class SwapRatingAdmin(admin.ModelAdmin):
     list_display = ('swap_session', 'from_user', 'rating', 'created_at')
+    list_select_related = (
+        'from_user',
+        'swap_session__swap_request__from_user', 'swap_session__swap_request__to_user',
+        'swap_session__swap_request__skill_offered', 'swap_session__swap_request__skill_wanted',
+    )
     list_filter = ('rating', 'created_at')
     actions = ['export_ratings_csv']
 
     def export_ratings_csv(self, request, queryset):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename=ratings.csv'
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Swap Session', 'From User', 'Rating', 'Comment', 'Created At'])
-        for rating in queryset:
-            writer.writerow([
-                rating.id, str(rating.swap_session), rating.from_user.full_name, rating.rating, rating.comment, rating.created_at
-            ])
-        return response
+        return stream_csv('ratings.csv', RATING_HEADER, rating_rows(queryset))
     export_ratings_csv.short_description = "Export selected ratings as CSV"
@@ -0,0 +1,49 @@
+from skillswap.exports import EXPORT_CHUNK_SIZE, full_name
+
+SWAP_HEADER = [
+    'ID', 'From User', 'To User', 'Skill Offered', 'Skill Wanted', 'Status', 'Duration', 'Preferred Time', 'Created At'
+]
+SESSION_HEADER = ['ID', 'Swap Request', 'Scheduled Date', 'Completed', 'Notes', 'Created At']
+RATING_HEADER = ['ID', 'Swap Session', 'From User', 'Rating', 'Comment', 'Created At']
+
+# Columns needed to rebuild SwapRequest.__str__, relative to a SwapRequest
+SWAP_LABEL_FIELDS = (
+    'from_user__first_name', 'from_user__last_name', 'to_user__first_name', 'to_user__last_name',
+    'skill_offered__name', 'skill_wanted__name',
+)
+
+
+def swap_label(from_first, from_last, to_first, to_last, skill_offered, skill_wanted):
+    """Same text as ``str(swap_request)``, without loading the related rows"""
+    return (
+        f"{full_name(from_first, from_last)} -> {full_name(to_first, to_last)}: "
+        f"{skill_offered} for {skill_wanted}"
+    )
+
+
+def swap_rows(queryset):
+    rows = queryset.values_list(
+        'id', *SWAP_LABEL_FIELDS, 'status', 'duration', 'preferred_time', 'created_at'
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for swap_id, from_first, from_last, to_first, to_last, *rest in rows:
+        yield [swap_id, full_name(from_first, from_last), full_name(to_first, to_last), *rest]
+
+
+def session_rows(queryset):
+    rows = queryset.values_list(
+        'id', *(f'swap_request__{field}' for field in SWAP_LABEL_FIELDS),
+        'scheduled_date', 'completed', 'notes', 'created_at',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for row in rows:
+        yield [row[0], swap_label(*row[1:7]), *row[7:]]
+
+
+def rating_rows(queryset):
+    rows = queryset.values_list(
+        'id', *(f'swap_session__swap_request__{field}' for field in SWAP_LABEL_FIELDS),
+        'from_user__first_name', 'from_user__last_name', 'rating', 'comment', 'created_at',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for row in rows:
+        yield [
+            row[0], f"Session for {swap_label(*row[1:7])}", full_name(row[7], row[8]), *row[9:]
+        ]
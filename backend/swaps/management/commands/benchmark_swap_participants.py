@@ -0,0 +1,131 @@
+import heapq
+import random
+import sqlite3
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+PAGE_SIZE = 10
+STATUSES = ['pending', 'accepted', 'rejected', 'completed', 'cancelled']
+
+INDEXES = [
+    'CREATE INDEX swap_from_created ON swaps_swaprequest (from_user_id, created_at DESC, id DESC)',
+    'CREATE INDEX swap_to_created ON swaps_swaprequest (to_user_id, created_at DESC, id DESC)',
+    'CREATE INDEX swap_from_status ON swaps_swaprequest (from_user_id, status, created_at DESC, id DESC)',
+    'CREATE INDEX swap_to_status ON swaps_swaprequest (to_user_id, status, created_at DESC, id DESC)',
+]
+SEEK = '(created_at <= ? AND (created_at < ? OR id < ?))'
+COLUMNS = 'id, from_user_id, to_user_id, status, message, created_at'
+
+
+class Command(BaseCommand):
+    help = "Compare the OR participant query with merged per-column index reads at several table sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--users', type=int, default=1_000)
+        parser.add_argument(
+            '--heavy-share', type=float, default=0.01,
+            help='Fraction of all swaps involving the measured user, so their history grows with the table',
+        )
+        parser.add_argument('--repeat', type=int, default=7)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'swaps':>10} {'user swaps':>10} {'case':<22} {'OR ms':>8} {'merged ms':>10} {'same rows':>9}"
+        )
+        for size in options['sizes']:
+            rng = random.Random(options['seed'])
+            db, user_swaps = self.build_database(size, options['users'], options['heavy_share'], rng)
+            cursor = db.execute(
+                'SELECT created_at, id FROM swaps_swaprequest WHERE from_user_id = 1 OR to_user_id = 1 '
+                'ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?', [user_swaps // 2]
+            ).fetchone()
+            cases = [
+                ('first page', None, None),
+                ('first page, status', 'pending', None),
+                ('mid-history cursor', None, cursor),
+                ('mid-history, status', 'pending', cursor),
+            ]
+            for label, status, position in cases:
+                or_ms, or_rows = self.time(lambda: self.or_page(db, 1, status, position), options['repeat'])
+                merged_ms, merged_rows = self.time(
+                    lambda: self.merged_page(db, 1, status, position), options['repeat']
+                )
+                same = [row[0] for row in or_rows] == [row[0] for row in merged_rows]
+                self.stdout.write(
+                    f'{size:>10} {user_swaps:>10} {label:<22} {or_ms:>8.2f} {merged_ms:>10.2f} {str(same):>9}'
+                )
+            db.close()
+
+    def build_database(self, size, users, heavy_share, rng):
+        db = sqlite3.connect(':memory:')
+        db.execute(
+            'CREATE TABLE swaps_swaprequest (id INTEGER PRIMARY KEY, from_user_id INTEGER, to_user_id INTEGER, '
+            'status TEXT, message TEXT, created_at REAL)'
+        )
+        for sql in INDEXES:
+            db.execute(sql)
+        user_swaps = 0
+        batch = []
+        for swap_id in range(1, size + 1):
+            from_user, to_user = rng.sample(range(2, users + 2), 2)
+            if rng.random() < heavy_share:
+                user_swaps += 1
+                if rng.random() < 0.5:
+                    from_user = 1
+                else:
+                    to_user = 1
+            batch.append((swap_id, from_user, to_user, rng.choice(STATUSES), 'Hi!', swap_id // 3))
+            if len(batch) == 10_000 or swap_id == size:
+                db.executemany('INSERT INTO swaps_swaprequest VALUES (?, ?, ?, ?, ?, ?)', batch)
+                batch = []
+        db.commit()
+        db.execute('ANALYZE')
+        return db, user_swaps
+
+    @staticmethod
+    def where(column_sql, status, position):
+        clauses, params = [column_sql], []
+        if status:
+            clauses.append('status = ?')
+            params.append(status)
+        if position:
+            clauses.append(SEEK)
+            params += [position[0], position[0], position[1]]
+        return ' AND '.join(clauses), params
+
+    def or_page(self, db, user_id, status, position):
+        where, params = self.where('(from_user_id = ? OR to_user_id = ?)', status, position)
+        return db.execute(
+            f'SELECT {COLUMNS} FROM swaps_swaprequest WHERE {where} ORDER BY created_at DESC, id DESC LIMIT ?',
+            [user_id, user_id, *params, PAGE_SIZE + 1],
+        ).fetchall()
+
+    def merged_page(self, db, user_id, status, position):
+        # Mirrors MergedQuerySet: keys from each index, merged, then one row fetch
+        runs = []
+        for column_sql, extra in (('from_user_id = ?', []), ('to_user_id = ? AND from_user_id != ?', [user_id])):
+            where, params = self.where(column_sql, status, position)
+            runs.append(db.execute(
+                f'SELECT created_at, id FROM swaps_swaprequest WHERE {where} '
+                'ORDER BY created_at DESC, id DESC LIMIT ?',
+                [user_id, *extra, *params, PAGE_SIZE + 1],
+            ).fetchall())
+        ids = [key[1] for _, key in zip(range(PAGE_SIZE + 1), heapq.merge(*runs, reverse=True))]
+        rows = db.execute(
+            f'SELECT {COLUMNS} FROM swaps_swaprequest WHERE id IN ({", ".join("?" * len(ids))})', ids
+        ).fetchall()
+        by_id = {row[0]: row for row in rows}
+        return [by_id[swap_id] for swap_id in ids]
+
+    @staticmethod
+    def time(run, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples), result
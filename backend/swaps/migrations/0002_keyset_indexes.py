@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('swaps', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['from_user', '-created_at', '-id'], name='swap_from_created_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['to_user', '-created_at', '-id'], name='swap_to_created_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('swaps', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='swap_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['-created_at', '-id'], name='swap_created_keyset_idx'),
+        ),
+    ]
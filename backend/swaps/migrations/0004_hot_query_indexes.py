@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('swaps', '0003_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='swaprequest',
+            name='from_user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sent_requests', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='swaprequest',
+            name='to_user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='received_requests', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['from_user', 'status', '-created_at', '-id'], name='swap_from_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='swaprequest',
+            index=models.Index(fields=['to_user', 'status', '-created_at', '-id'], name='swap_to_status_idx'),
+        ),
+    ]
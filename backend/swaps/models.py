@@ -32,12 +32,14 @@ class SwapRequest(models.Model):
     from_user = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE, 
-        related_name='sent_requests'
+        related_name='sent_requests',
+        db_index=False,  # leading column of the composite indexes in Meta
     )
     to_user = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE, 
-        related_name='received_requests'
+        related_name='received_requests',
+        db_index=False,  # leading column of the composite indexes in Meta
     )
     skill_offered = models.ForeignKey(
         Skill, 
@@ -58,6 +60,14 @@ class SwapRequest(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['from_user', '-created_at', '-id'], name='swap_from_created_keyset_idx'),
+            models.Index(fields=['to_user', '-created_at', '-id'], name='swap_to_created_keyset_idx'),
+            models.Index(fields=['from_user', 'status', '-created_at', '-id'], name='swap_from_status_idx'),
+            models.Index(fields=['to_user', 'status', '-created_at', '-id'], name='swap_to_status_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='swap_status_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='swap_created_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"{self.from_user.full_name} -> {self.to_user.full_name}: {self.skill_offered.name} for {self.skill_wanted.name}"
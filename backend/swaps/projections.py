@@ -0,0 +1,10 @@
+"""Projection of ``SwapRequestSerializer``: participants and skills come from joined columns"""
+from accounts.projections import user_profile_projection
+from skillswap.projections import Projection
+
+from .serializers import SwapRequestSerializer
+
+swap_request_projection = Projection(
+    SwapRequestSerializer,
+    nested={'from_user': user_profile_projection, 'to_user': user_profile_projection},
+)
@@ -2,6 +2,17 @@ from rest_framework import serializers
 from .models import SwapRequest, SwapSession, SwapRating
 from accounts.serializers import UserProfileSerializer
 from skills.serializers import SkillSerializer
+from skills.loaders import prefetch_user_skills
+from accounts.profile_cache import attach_cached_profiles
+
+class SwapRequestListSerializer(serializers.ListSerializer):
+    """Fetches every participant's cached profile at once, loading skills for the misses in one query"""
+
+    def to_representation(self, data):
+        swaps = list(data.all() if hasattr(data, 'all') else data)
+        participants = [u for swap in swaps for u in (swap.from_user, swap.to_user)]
+        prefetch_user_skills(attach_cached_profiles(participants, self.context.get('request')))
+        return super().to_representation(swaps)
 
 class SwapRequestSerializer(serializers.ModelSerializer):
     from_user = UserProfileSerializer(read_only=True)
@@ -15,6 +26,7 @@ class SwapRequestSerializer(serializers.ModelSerializer):
             'id', 'from_user', 'to_user', 'skill_offered', 'skill_wanted',
             'message', 'duration', 'preferred_time', 'status', 'created_at', 'updated_at'
         ]
+        list_serializer_class = SwapRequestListSerializer
 
 class SwapRequestCreateSerializer(serializers.ModelSerializer):
     skill_offered_id = serializers.IntegerField()
@@ -0,0 +1,100 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from accounts.stats import recompute_user_stats
+from skills.models import Skill, UserSkill
+from skillswap.testing import CraftedCursorMixin
+
+from .models import SwapRequest
+
+
+class SwapListCursorTests(CraftedCursorMixin, TestCase):
+    CURSOR_LISTS = ['/api/swaps/requests/', '/api/swaps/requests/received/']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='reader@example.com', username='reader', password='password123')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+
+class CompletedSwapCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.sender = User.objects.create_user(email='sender@example.com', username='sender', password='password123')
+        cls.receiver = User.objects.create_user(email='receiver@example.com', username='receiver', password='password123')
+        cls.skill = Skill.objects.create(name='Chess', category='other')
+
+    def setUp(self):
+        self.client.force_login(self.receiver)
+        self.swap = SwapRequest.objects.create(
+            from_user=self.sender, to_user=self.receiver, skill_offered=self.skill, skill_wanted=self.skill,
+            message='Hi', duration='1hour', preferred_time='flexible',
+        )
+
+    def set_status(self, new_status):
+        response = self.client.patch(
+            f'/api/swaps/requests/{self.swap.pk}/status/', {'status': new_status}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def completed_swaps(self):
+        return list(User.objects.filter(pk__in=[self.sender.pk, self.receiver.pk]).order_by('pk')
+                    .values_list('completed_swaps', flat=True))
+
+    def test_counts_follow_transitions_in_and_out_of_accepted(self):
+        for new_status, expected in [('accepted', 1), ('accepted', 1), ('rejected', 0), ('rejected', 0), ('accepted', 1)]:
+            with self.subTest(status=new_status):
+                self.set_status(new_status)
+                self.assertEqual(self.completed_swaps(), [expected, expected])
+        recompute_user_stats()
+        self.assertEqual(self.completed_swaps(), [1, 1])
+
+
+class SwapListQueryCountTests(TestCase):
+    # Path -> whether it is requested as a staff user
+    LISTS = {'/api/swaps/requests/': False, '/api/swaps/requests/received/': False, '/api/auth/admin/swaps/': True}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@example.com', username='owner', password='password123')
+        cls.staff = User.objects.create_user(
+            email='staff@example.com', username='staff', password='password123', is_staff=True,
+        )
+        cls.skills = [Skill.objects.create(name=f'Skill {index}', category='other') for index in range(4)]
+        cls.partners = 0
+
+    def login(self, user):
+        self.client.force_login(user)
+        # The first request after login also saves the session
+        self.client.get('/api/swaps/requests/')
+
+    def add_swaps(self, count):
+        """``count`` swaps sent to the user, each by a new partner with skills of their own"""
+        for _ in range(count):
+            self.partners += 1
+            partner = User.objects.create_user(
+                email=f'partner{self.partners}@example.com', username=f'partner{self.partners}', password='password123',
+            )
+            for skill_type, skill in [('offered', self.skills[0]), ('wanted', self.skills[1])]:
+                UserSkill.objects.create(user=partner, skill=skill, skill_type=skill_type, status='approved')
+            SwapRequest.objects.create(
+                from_user=partner, to_user=self.user, skill_offered=self.skills[2], skill_wanted=self.skills[3],
+                message='Hi', duration='1hour', preferred_time='flexible',
+            )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        for fast in (True, False):
+            for path, as_staff in self.LISTS.items():
+                with self.subTest(fast=fast, path=path), override_settings(FAST_SERIALIZATION=fast):
+                    self.login(self.staff if as_staff else self.user)
+                    SwapRequest.objects.all().delete()
+                    self.add_swaps(1)
+                    with CaptureQueriesContext(connection) as baseline:
+                        self.assertEqual(len(self.client.get(path).json()['results']), 1)
+                    self.add_swaps(9)
+                    with self.assertNumQueries(len(baseline)):
+                        self.assertEqual(len(self.client.get(path).json()['results']), 10)
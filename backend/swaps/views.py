@@ -1,12 +1,19 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Q
+from django.utils import timezone
+from accounts.stats import COMPLETED_STATUSES, record_completed_swap
+from skillswap.projections import ProjectedListMixin
+from skillswap.query_budget import query_budget
+from skillswap.querysets import MergedQuerySet
 from .models import SwapRequest
+from .projections import swap_request_projection
 from .serializers import SwapRequestSerializer, SwapRequestCreateSerializer
 
-class SwapRequestListCreateView(generics.ListCreateAPIView):
+class SwapRequestListCreateView(ProjectedListMixin, generics.ListCreateAPIView):
+    projection = swap_request_projection
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'GET': 10, 'POST': 9}
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -17,56 +24,72 @@ class SwapRequestListCreateView(generics.ListCreateAPIView):
         user = self.request.user
         status_filter = self.request.query_params.get('status', None)
         
-        # Get requests sent by or received by the user
-        queryset = SwapRequest.objects.filter(
-            Q(from_user=user) | Q(to_user=user)
-        )
-        
+        # Requests sent by or received by the user, as two branches that
+        # each read their own (user, [status,] created_at) index
+        sent = SwapRequest.objects.filter(from_user=user)
+        received = SwapRequest.objects.filter(to_user=user).exclude(from_user=user)
         if status_filter:
-            queryset = queryset.filter(status=status_filter)
-            
-        return queryset
+            sent = sent.filter(status=status_filter)
+            received = received.filter(status=status_filter)
+
+        rows = SwapRequest.objects.select_related('from_user', 'to_user', 'skill_offered', 'skill_wanted')
+        return MergedQuerySet(rows, [sent, received], ordering=('-created_at', '-id'))
 
-class ReceivedRequestsView(generics.ListAPIView):
+class ReceivedRequestsView(ProjectedListMixin, generics.ListAPIView):
     serializer_class = SwapRequestSerializer
+    projection = swap_request_projection
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 6
     
     def get_queryset(self):
         user = self.request.user
         status_filter = self.request.query_params.get('status', None)
         
-        queryset = SwapRequest.objects.filter(to_user=user)
+        queryset = SwapRequest.objects.filter(to_user=user).select_related(
+            'from_user', 'to_user', 'skill_offered', 'skill_wanted'
+        )
         
         if status_filter:
             queryset = queryset.filter(status=status_filter)
             
         return queryset
 
+@query_budget(12)
 @api_view(['PATCH'])
 @permission_classes([permissions.IsAuthenticated])
 def update_request_status(request, pk):
+    new_status = request.data.get('status')
+    if new_status not in ['accepted', 'rejected']:
+        if not SwapRequest.objects.filter(pk=pk, to_user=request.user).exists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {'error': 'Invalid status'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Conditional UPDATEs on the previous status: of two concurrent requests
+    # only one moves the swap into (or out of) the completed statuses, so the
+    # participants' completed_swaps changes exactly once per crossing
+    counted = new_status in COMPLETED_STATUSES
+    requests = SwapRequest.objects.filter(pk=pk, to_user=request.user).exclude(status=new_status)
+    if counted:
+        crossing = requests.exclude(status__in=COMPLETED_STATUSES)
+    else:
+        crossing = requests.filter(status__in=COMPLETED_STATUSES)
+    crossed = crossing.update(status=new_status, updated_at=timezone.now())
+    if not crossed:
+        requests.update(status=new_status, updated_at=timezone.now())
     try:
-        swap_request = SwapRequest.objects.get(pk=pk, to_user=request.user)
-        new_status = request.data.get('status')
-        
-        if new_status not in ['accepted', 'rejected']:
-            return Response(
-                {'error': 'Invalid status'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        swap_request.status = new_status
-        swap_request.save()
-        
-        # Update user statistics if accepted
-        if new_status == 'accepted':
-            swap_request.from_user.completed_swaps += 1
-            swap_request.to_user.completed_swaps += 1
-            swap_request.from_user.save()
-            swap_request.to_user.save()
-        
-        serializer = SwapRequestSerializer(swap_request)
-        return Response(serializer.data)
-        
+        swap_request = SwapRequest.objects.select_related(
+            'from_user', 'to_user', 'skill_offered', 'skill_wanted'
+        ).get(pk=pk, to_user=request.user)
     except SwapRequest.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
+
+    if crossed:
+        record_completed_swap(swap_request, sign=1 if counted else -1)
+        swap_request.from_user.refresh_from_db(fields=['completed_swaps'])
+        swap_request.to_user.refresh_from_db(fields=['completed_swaps'])
+
+    serializer = SwapRequestSerializer(swap_request)
+    return Response(serializer.data)
@@ -7,7 +7,7 @@ export default function UserCard({ user }) {
     <div className="bg-white rounded-lg shadow-sm p-6 hover:shadow-md transition-shadow">
       <div className="flex items-start gap-4">
         <img
-          src={getAvatarUrl(user.avatar) || "/placeholder.svg"}
+          src={getAvatarUrl(user.avatar_thumb || user.avatar) || "/placeholder.svg"}
           alt={user.full_name}
           className="w-16 h-16 rounded-full object-cover"
         />
@@ -41,17 +41,20 @@ export default function AdminDashboard() {
   const [skills, setSkills] = useState([]);
   const [skillsLoading, setSkillsLoading] = useState(false);
   const [skillsError, setSkillsError] = useState(null);
-  const [skillStatusFilter, setSkillStatusFilter] = useState('');
+  const [skillStatusFilter, setSkillStatusFilter] = useState('pending');
+  const [skillsNext, setSkillsNext] = useState(null);
 
   // User Management
   const [users, setUsers] = useState([]);
   const [usersLoading, setUsersLoading] = useState(false);
   const [usersError, setUsersError] = useState(null);
+  const [usersNext, setUsersNext] = useState(null);
 
   // Swap Monitoring
   const [swaps, setSwaps] = useState([]);
   const [swapsLoading, setSwapsLoading] = useState(false);
   const [swapsError, setSwapsError] = useState(null);
+  const [swapsNext, setSwapsNext] = useState(null);
 
   // Platform Messages
   const [messages, setMessages] = useState([]);
@@ -67,22 +70,24 @@ export default function AdminDashboard() {
   useEffect(() => {
     if (activeTab === 'skills' && isAdminAuthenticated) {
       setSkillsLoading(true);
-      api.get(`${API_BASE}/user-skills/`).then(res => {
-        setSkills(res.data);
+      api.get(`${API_BASE}/user-skills/`, { params: { status: skillStatusFilter || undefined } }).then(res => {
+        setSkills(res.data.results);
+        setSkillsNext(res.data.next);
         setSkillsLoading(false);
       }).catch(e => {
         setSkillsError('Failed to load skills');
         setSkillsLoading(false);
       });
     }
-  }, [activeTab, isAdminAuthenticated]);
+  }, [activeTab, isAdminAuthenticated, skillStatusFilter]);
 
   // Fetch Users
   useEffect(() => {
     if (activeTab === 'users' && isAdminAuthenticated) {
       setUsersLoading(true);
       api.get(`${API_BASE}/users/`).then(res => {
-        setUsers(res.data);
+        setUsers(res.data.results);
+        setUsersNext(res.data.next);
         setUsersLoading(false);
       }).catch(e => {
         setUsersError('Failed to load users');
@@ -96,7 +101,8 @@ export default function AdminDashboard() {
     if (activeTab === 'swaps' && isAdminAuthenticated) {
       setSwapsLoading(true);
       api.get(`${API_BASE}/swaps/`).then(res => {
-        setSwaps(res.data);
+        setSwaps(res.data.results);
+        setSwapsNext(res.data.next);
         setSwapsLoading(false);
       }).catch(e => {
         setSwapsError('Failed to load swaps');
@@ -119,6 +125,14 @@ export default function AdminDashboard() {
     }
   }, [activeTab, isAdminAuthenticated]);
 
+  // Admin lists are paged by cursor; "Load more" follows the next link
+  const loadMore = (next, setItems, setNext) => {
+    api.get(next).then(res => {
+      setItems(items => [...items, ...res.data.results]);
+      setNext(res.data.next);
+    });
+  };
+
   // Skill Moderation Actions
   const handleApproveSkill = (id) => {
     api.post(`${API_BASE}/user-skills/${id}/approve/`).then(() => {
@@ -199,9 +213,6 @@ export default function AdminDashboard() {
     window.location.href = '/login';
   };
 
-  // Filtered skills
-  const filteredSkills = skillStatusFilter ? skills.filter(s => s.status === skillStatusFilter) : skills;
-
   return (
     <div className="min-h-screen bg-gray-50 pb-20">
       <header className="bg-white shadow-sm px-4 py-4 flex items-center gap-4">
@@ -247,9 +258,9 @@ export default function AdminDashboard() {
                     </tr>
                   </thead>
                   <tbody>
-                    {filteredSkills.map(skill => (
+                    {skills.map(skill => (
                       <tr key={skill.id} className="border-b">
-                        <td>{skill.user}</td>
+                        <td>{skill.user_email}</td>
                         <td>{skill.skill_name}</td>
                         <td>{skill.skill_type}</td>
                         <td>{skill.status}</td>
@@ -263,6 +274,9 @@ export default function AdminDashboard() {
                   </tbody>
                 </table>
               )}
+              {skillsNext && (
+                <button className="mt-4 px-4 py-2 bg-gray-100 text-gray-700 rounded hover:bg-gray-200" onClick={() => loadMore(skillsNext, setSkills, setSkillsNext)}>Load more</button>
+              )}
             </div>
           </section>
         )}
@@ -303,6 +317,9 @@ export default function AdminDashboard() {
                   </tbody>
                 </table>
               )}
+              {usersNext && (
+                <button className="mt-4 px-4 py-2 bg-gray-100 text-gray-700 rounded hover:bg-gray-200" onClick={() => loadMore(usersNext, setUsers, setUsersNext)}>Load more</button>
+              )}
             </div>
           </section>
         )}
@@ -341,6 +358,9 @@ export default function AdminDashboard() {
                   </tbody>
                 </table>
               )}
+              {swapsNext && (
+                <button className="mt-4 px-4 py-2 bg-gray-100 text-gray-700 rounded hover:bg-gray-200" onClick={() => loadMore(swapsNext, setSwaps, setSwapsNext)}>Load more</button>
+              )}
             </div>
           </section>
         )}
@@ -32,7 +32,7 @@ export default function ProfilePage() {
         <div className="bg-white rounded-lg shadow-sm p-6 mb-6">
           <div className="flex items-start gap-4">
             <img
-              src={getAvatarUrl(user.avatar) || "/placeholder.svg"}
+              src={getAvatarUrl(user.avatar_small || user.avatar) || "/placeholder.svg"}
               alt={user.full_name}
               className="w-24 h-24 rounded-full object-cover"
             />
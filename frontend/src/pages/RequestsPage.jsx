@@ -132,7 +132,7 @@ export default function SwapRequestsPage() {
               <div key={request.id} className="bg-white rounded-lg shadow-sm p-6">
                 <div className="flex items-start gap-4">
                   <img
-                    src={getAvatarUrl(request.from_user.avatar) || "/placeholder.svg"} // Use getAvatarUrl
+                    src={getAvatarUrl(request.from_user.avatar_thumb || request.from_user.avatar) || "/placeholder.svg"} // Use getAvatarUrl
                     alt={request.from_user.full_name}
                     className="w-12 h-12 rounded-full object-cover"
                   />
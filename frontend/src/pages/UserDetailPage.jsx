@@ -58,7 +58,7 @@ export default function UserDetailPage() {
         <div className="bg-white rounded-lg shadow-sm p-6 mb-6">
           <div className="flex items-start gap-4">
             <img
-              src={getAvatarUrl(user.avatar) || "/placeholder.svg"}
+              src={getAvatarUrl(user.avatar_small || user.avatar) || "/placeholder.svg"}
               alt={user.full_name}
               className="w-20 h-20 rounded-full object-cover"
             />
@@ -8,6 +8,8 @@ export interface User {
   bio: string
   location: string
   avatar?: string
+  avatar_thumb?: string
+  avatar_small?: string
   availability: string
   experience_level: string
   response_time: string